@@ -17,11 +17,8 @@ import sys
 import subprocess
 from typing import Any
 
-from zenith.core.trading_engine import TradingEngine
-from zenith.analysis.research.experiment import run_experiment
-from zenith.common.config.config_loader import load_config
-from zenith.data.loader import HistoricalDataLoader
-from zenith.core.vector_backtest import run_volatility_vectorized, run_ma_crossover_vectorized, run_trend_filtered_vectorized
+# 各子命令的重依赖（pandas/交易所 SDK 等）在对应处理函数内按需导入，
+# 使 `report`/`test` 等轻量命令不必加载整个引擎
 
 
 @dataclass
@@ -55,6 +52,48 @@ class CliArgs:
     
     # Worker args
     redis_url: str = "redis://localhost:6379/0"
+    worker_concurrency: int = 1
+
+
+_DEFAULT_CONFIG = "../../data/config/config.yml"
+_CONFIG_HELP = "配置文件路径 (默认: config/config.yml)"
+
+# 子命令表：(名称, 帮助, 是否接受子命令级 --config, [(参数名..., add_argument kwargs), ...])
+_SUBCOMMANDS: list[tuple[str, str, bool, list[tuple[tuple[str, ...], dict[str, Any]]]]] = [
+    ("runner", "实盘/纸面/干跑主循环", True, [
+        (("--max-ticks",), {"type": int, "default": None, "help": "跑多少个 tick 后退出"}),
+    ]),
+    ("backtest", "实验性回测 (生成完整报告)", True, []),
+    ("sweep", "参数搜索实验", True, [
+        (("--top-n",), {"type": int, "default": 5, "help": "保留前 N 组参数"}),
+    ]),
+    ("walkforward", "Walk-Forward 验证", True, [
+        (("--n-segments",), {"type": int, "default": 3}),
+        (("--train-ratio",), {"type": float, "default": 0.7}),
+        (("--min-trades",), {"type": int, "default": 10}),
+        (("--output-dir",), {"type": str, "default": "results/walkforward_engine"}),
+    ]),
+    ("test", "运行测试 (pytest)", True, [
+        (("--include-live",), {"action": "store_true", "help": "包含实盘测试"}),
+    ]),
+    ("report", "生成的 HTML 报告", False, [
+        (("report_dir",), {"type": str}),
+    ]),
+    ("download", "下载历史数据", False, [
+        (("--symbol",), {"default": "SOLUSDT"}),
+        (("--year",), {"type": int, "default": 2024}),
+    ]),
+    ("verify", "系统完整性/对齐校验", False, [
+        (("--target",), {"choices": ["parity", "all"], "default": "parity", "dest": "verify_target"}),
+    ]),
+    ("vector", "快速向量化回测 (Rust)", True, [
+        (("--strategy",), {"default": "volatility", "dest": "vector_strategy"}),
+    ]),
+    ("worker", "启动 RaaS Worker (Redis Consumer)", False, [
+        (("--redis-url",), {"default": "redis://localhost:6379/0"}),
+        (("--concurrency",), {"type": int, "default": 1, "dest": "worker_concurrency", "help": "并发回测数 (>1 时使用进程池)"}),
+    ]),
+]
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -66,70 +105,17 @@ def build_parser() -> argparse.ArgumentParser:
         配置好的参数解析器。
     """
     parser = argparse.ArgumentParser(prog="zenithalgo", description="ZenithAlgo 统一入口")
-    def _add_config_arg(p: argparse.ArgumentParser, *, default: Any) -> None:
-        p.add_argument(
-            "--config",
-            default=default,
-            help="配置文件路径 (默认: config/config.yml)",
-        )
-
     # 允许 `python main.py --config ... backtest`（全局）与 `python main.py backtest --config ...`（子命令）
-    _add_config_arg(parser, default="../../data/config/config.yml")
+    parser.add_argument("--config", default=_DEFAULT_CONFIG, help=_CONFIG_HELP)
 
     sub = parser.add_subparsers(dest="task")
-
-    # --- Common Args Helper ---
-    def _add_common(p):
-        _add_config_arg(p, default="../../data/config/config.yml")
-
-    # 1. Runner
-    p_runner = sub.add_parser("runner", help="实盘/纸面/干跑主循环")
-    _add_config_arg(p_runner, default=argparse.SUPPRESS)
-    p_runner.add_argument("--max-ticks", type=int, default=None, help="跑多少个 tick 后退出")
-
-    # 2. Backtest (Experiment)
-    p_backtest = sub.add_parser("backtest", help="实验性回测 (生成完整报告)")
-    _add_config_arg(p_backtest, default=argparse.SUPPRESS)
-
-    # 3. Sweep
-    p_sweep = sub.add_parser("sweep", help="参数搜索实验")
-    _add_config_arg(p_sweep, default=argparse.SUPPRESS)
-    p_sweep.add_argument("--top-n", type=int, default=5, help="保留前 N 组参数")
-
-    # 4. Walkforward
-    p_wf = sub.add_parser("walkforward", help="Walk-Forward 验证")
-    _add_config_arg(p_wf, default=argparse.SUPPRESS)
-    p_wf.add_argument("--n-segments", type=int, default=3)
-    p_wf.add_argument("--train-ratio", type=float, default=0.7)
-    p_wf.add_argument("--min-trades", type=int, default=10)
-    p_wf.add_argument("--output-dir", type=str, default="results/walkforward_engine")
-
-    # 5. Test
-    p_test = sub.add_parser("test", help="运行测试 (pytest)")
-    _add_config_arg(p_test, default=argparse.SUPPRESS)
-    p_test.add_argument("--include-live", action="store_true", help="包含实盘测试")
-
-    # 6. Report
-    p_report = sub.add_parser("report", help="生成的 HTML 报告")
-    p_report.add_argument("report_dir", type=str)
-    
-    # 7. Download (New)
-    p_dl = sub.add_parser("download", help="下载历史数据")
-    p_dl.add_argument("--symbol", default="SOLUSDT")
-    p_dl.add_argument("--year", type=int, default=2024)
-    
-    # 8. Verify (New)
-    p_ver = sub.add_parser("verify", help="系统完整性/对齐校验")
-    p_ver.add_argument("--target", choices=["parity", "all"], default="parity", dest="verify_target")
-    
-    # 9. Vector (New)
-    p_vec = sub.add_parser("vector", help="快速向量化回测 (Rust)")
-    _add_config_arg(p_vec, default=argparse.SUPPRESS)
-    p_vec.add_argument("--strategy", default="volatility", dest="vector_strategy")
-    
-    # 10. Worker (RaaS)
-    p_worker = sub.add_parser("worker", help="启动 RaaS Worker (Redis Consumer)")
-    p_worker.add_argument("--redis-url", default="redis://localhost:6379/0")
+    for name, help_text, with_config, arguments in _SUBCOMMANDS:
+        p = sub.add_parser(name, help=help_text)
+        if with_config:
+            # SUPPRESS：子命令未给出时不覆盖全局 --config
+            p.add_argument("--config", default=argparse.SUPPRESS, help=_CONFIG_HELP)
+        for flags, kwargs in arguments:
+            p.add_argument(*flags, **kwargs)
 
     return parser
 
@@ -150,7 +136,7 @@ def parse_args(argv: list[str] | None = None) -> CliArgs:
     parser = build_parser()
     ns = parser.parse_args(argv)
     task = ns.task or "runner"
-    config = getattr(ns, "config", "../../data/config/config.yml")
+    config = getattr(ns, "config", _DEFAULT_CONFIG)
     return CliArgs(
         config=str(config),
         task=task,
@@ -167,9 +153,151 @@ def parse_args(argv: list[str] | None = None) -> CliArgs:
         verify_target=getattr(ns, "verify_target", "parity"),
         vector_strategy=getattr(ns, "vector_strategy", "volatility"),
         redis_url=getattr(ns, "redis_url", "redis://localhost:6379/0"),
+        worker_concurrency=int(getattr(ns, "worker_concurrency", 1)),
+    )
+
+
+# --- 子命令处理函数：每个 task 一个，签名统一为 (args) -> Any ---
+
+def _run_runner(args: CliArgs) -> Any:
+    """核心交易循环 (实盘/模拟盘/回测 dry-run)。"""
+    from zenith.core.trading_engine import TradingEngine
+
+    return TradingEngine(cfg_path=args.config, max_ticks=args.max_ticks).run().summary
+
+
+def _run_backtest(args: CliArgs) -> Any:
+    """历史数据回测。"""
+    from zenith.analysis.research.experiment import run_experiment
+
+    return run_experiment(args.config, task="backtest")
+
+
+def _run_sweep(args: CliArgs) -> Any:
+    """超参数搜索。"""
+    from zenith.analysis.research.experiment import run_experiment
+
+    return run_experiment(args.config, task="sweep", top_n=args.top_n)
+
+
+def _run_walkforward(args: CliArgs) -> Any:
+    """滚动窗口验证。"""
+    from zenith.analysis.research.experiment import run_experiment
+
+    return run_experiment(
+        args.config,
+        task="walkforward",
+        n_segments=args.n_segments,
+        train_ratio=args.train_ratio,
+        min_trades=args.min_trades,
     )
 
 
+def _run_test(args: CliArgs) -> Any:
+    """运行单元测试。"""
+    import pytest
+
+    pytest_args = ["-q"]
+    if not args.include_live_tests:
+        pytest_args += ["-m", "not live"]
+    return pytest.main(pytest_args)
+
+
+def _run_report(args: CliArgs) -> None:
+    """生成报告。"""
+    from zenith.analysis.reporting import ReportGenerator
+    if not args.report_dir:
+        raise ValueError("Must specify directory for report")
+    gen = ReportGenerator(args.report_dir)
+    path = gen.generate()
+    print(f"Report generated: {path}")
+
+
+def _run_download(args: CliArgs) -> None:
+    from zenith.data.loader import HistoricalDataLoader
+
+    print(f"--- Downloading Data: {args.symbol} ({args.year}) ---")
+    start_date = f"{args.year}-01-01"
+    end_date = f"{args.year}-12-31"
+    loader = HistoricalDataLoader()
+    loader.load_klines_for_backtest(
+        symbol=args.symbol or "SOLUSDT",
+        interval="1h",
+        start=datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc),
+        end=datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc),
+        auto_download=True,
+        force_download=True
+    )
+    print("Download Complete.")
+
+
+def _run_verify(args: CliArgs) -> None:
+    target = args.verify_target
+    print(f"--- Running Verification: {target} ---")
+    if target == 'parity' or target == 'all':
+        print("\n[Parity Check: Volatility Strategy]")
+        try:
+            import os
+            env = os.environ.copy()
+            env['PYTHONPATH'] = os.path.join(os.path.dirname(__file__), '.')
+            cmd = [sys.executable, "tests/test_parity_volatility.py"]
+            subprocess.check_call(cmd, env=env)
+            print(">> Parity Check PASSED")
+        except subprocess.CalledProcessError:
+            print(">> Parity Check FAILED")
+            if target != 'all': sys.exit(1)
+
+
+def _run_vector(args: CliArgs) -> None:
+    from zenith.common.config.config_loader import load_config
+    from zenith.core.vector_backtest import (
+        run_ma_crossover_vectorized,
+        run_trend_filtered_vectorized,
+        run_volatility_vectorized,
+    )
+
+    print(f"--- Running VECTOR: {args.vector_strategy} ---")
+    cfg = load_config(args.config)
+    strat_name = args.vector_strategy
+    res = None
+    if strat_name == "volatility":
+        res = run_volatility_vectorized(cfg)
+    elif strat_name == "trend_filtered":
+        res = run_trend_filtered_vectorized(cfg)
+    elif strat_name == "ma_crossover" or strat_name == "simple_ma":
+         res = run_ma_crossover_vectorized(cfg)
+    else:
+        print(f"Unknown vector strategy: {strat_name}")
+        sys.exit(1)
+    
+    print("\n--- Vector Result ---")
+    print(f"Trades: {len(res.trades)}")
+    print(f"Sharpe: {res.metrics.get('sharpe', 0.0):.4f}")
+    print(f"Total Return: {res.metrics.get('total_return', 0.0):.2%}")
+
+
+def _run_worker(args: CliArgs) -> None:
+    """RaaS Worker (Redis Consumer)。"""
+    from zenith.core.worker import JobConsumer
+    print(f"--- Starting Worker (Redis: {args.redis_url}, concurrency: {args.worker_concurrency}) ---")
+    JobConsumer(redis_url=args.redis_url, max_inflight=args.worker_concurrency).run_forever()
+
+
+# task -> 处理函数（模块导入时构建一次）
+_DISPATCH = {
+    "runner": _run_runner,
+    "backtest": _run_backtest,
+    "sweep": _run_sweep,
+    "walkforward": _run_walkforward,
+    "test": _run_test,
+    "report": _run_report,
+    "download": _run_download,
+    "verify": _run_verify,
+    "vector": _run_vector,
+    "worker": _run_worker,
+}
+
+
 def main(argv: list[str] | None = None) -> Any:
     """程序主入口。
 
@@ -186,115 +314,10 @@ def main(argv: list[str] | None = None) -> Any:
     args = parse_args(argv)
 
     # 根据 task 参数分发到不同的执行逻辑
-    # 1. runner: 核心交易循环 (实盘/模拟盘/回测 dry-run)
-    if args.task == "runner":
-        # 初始化交易引擎并运行
-        return TradingEngine(cfg_path=args.config, max_ticks=args.max_ticks).run().summary
-    
-    # 2. backtest: 历史数据回测
-    if args.task == "backtest":
-        return run_experiment(args.config, task="backtest")
-    
-    # 3. sweep: 超参数搜索
-    if args.task == "sweep":
-        return run_experiment(args.config, task="sweep", top_n=args.top_n)
-    
-    # 4. walkforward: 滚动窗口验证
-    if args.task == "walkforward":
-        return run_experiment(
-            args.config,
-            task="walkforward",
-            n_segments=args.n_segments,
-            train_ratio=args.train_ratio,
-            min_trades=args.min_trades,
-        )
-    
-    # 5. test: 运行单元测试
-    if args.task == "test":
-        import pytest
-
-        pytest_args = ["-q"]
-        if not args.include_live_tests:
-            pytest_args += ["-m", "not live"]
-        return pytest.main(pytest_args)
-
-    # 6. report: 生成报告
-    if args.task == "report":
-        from zenith.analysis.reporting import ReportGenerator
-        if not args.report_dir:
-            raise ValueError("Must specify directory for report")
-        gen = ReportGenerator(args.report_dir)
-        path = gen.generate()
-        print(f"Report generated: {path}")
-        return
-
-    # 7. Download
-    if args.task == "download":
-        print(f"--- Downloading Data: {args.symbol} ({args.year}) ---")
-        start_date = f"{args.year}-01-01"
-        end_date = f"{args.year}-12-31"
-        loader = HistoricalDataLoader()
-        loader.load_klines_for_backtest(
-            symbol=args.symbol or "SOLUSDT",
-            interval="1h",
-            start=datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc),
-            end=datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc),
-            auto_download=True,
-            force_download=True
-        )
-        print("Download Complete.")
-        return
-
-    # 8. Verify
-    if args.task == "verify":
-        target = args.verify_target
-        print(f"--- Running Verification: {target} ---")
-        if target == 'parity' or target == 'all':
-            print("\n[Parity Check: Volatility Strategy]")
-            try:
-                import os
-                env = os.environ.copy()
-                env['PYTHONPATH'] = os.path.join(os.path.dirname(__file__), '.')
-                cmd = [sys.executable, "tests/test_parity_volatility.py"]
-                subprocess.check_call(cmd, env=env)
-                print(">> Parity Check PASSED")
-            except subprocess.CalledProcessError:
-                print(">> Parity Check FAILED")
-                if target != 'all': sys.exit(1)
-        return
-
-    # 9. Vector
-    if args.task == "vector":
-        print(f"--- Running VECTOR: {args.vector_strategy} ---")
-        cfg = load_config(args.config)
-        strat_name = args.vector_strategy
-        res = None
-        if strat_name == "volatility":
-            res = run_volatility_vectorized(cfg)
-        elif strat_name == "trend_filtered":
-            res = run_trend_filtered_vectorized(cfg)
-        elif strat_name == "ma_crossover" or strat_name == "simple_ma":
-             res = run_ma_crossover_vectorized(cfg)
-        else:
-            print(f"Unknown vector strategy: {strat_name}")
-            sys.exit(1)
-        
-        print("\n--- Vector Result ---")
-        print(f"Trades: {len(res.trades)}")
-        print(f"Sharpe: {res.metrics.get('sharpe', 0.0):.4f}")
-        print(f"Total Return: {res.metrics.get('total_return', 0.0):.2%}")
-        return
-
-    # 10. Worker
-    if args.task == "worker":
-        from zenith.core.worker import JobConsumer
-        print(f"--- Starting Worker (Redis: {args.redis_url}) ---")
-        JobConsumer(redis_url=args.redis_url).run_forever()
-        return
-
-    raise ValueError(f"Unknown task: {args.task}")
-
-    raise ValueError(f"Unknown task: {args.task}")
+    handler = _DISPATCH.get(args.task)
+    if handler is None:
+        raise ValueError(f"Unknown task: {args.task}")
+    return handler(args)
 
 
 if __name__ == "__main__":
@@ -56,3 +56,20 @@ def test_backtest_broker_slippage_direction_correct():
     assert abs(res_buy["slippage_price"] - 101.0) < 1e-9
     res_sell = broker.execute(OrderSignal(symbol="BTCUSDT", side="sell", qty=1.0, reason="t"), tick_price=100.0, ts=ts)
     assert abs(res_sell["slippage_price"] - 99.0) < 1e-9
+
+
+def test_backtest_broker_execute_many_matches_sequential_execute():
+    ts = datetime.now(timezone.utc)
+    sigs = [
+        OrderSignal(symbol="BTCUSDT", side="buy", qty=2.0, reason="t"),
+        OrderSignal(symbol="ETHUSDT", side="buy", qty=3.0, reason="t"),
+        OrderSignal(symbol="BTCUSDT", side="sell", qty=1.0, reason="t"),
+    ]
+    seq = BacktestBroker(initial_equity=1000.0, taker_fee=0.001, slippage_bp=5.0)
+    expected = [seq.execute(s, tick_price=100.0, ts=ts) for s in sigs]
+
+    batch = BacktestBroker(initial_equity=1000.0, taker_fee=0.001, slippage_bp=5.0)
+    assert batch.execute_many(sigs, tick_price=100.0, ts=ts) == expected
+    assert batch.cash == seq.cash
+    assert batch.unrealized_pnl == seq.unrealized_pnl
+    assert batch.equity_curve == seq.equity_curve
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pandas as pd
+
+from zenith.database.backtest_db import BacktestDatabase
+
+
+class _FakeCursor:
+    def __init__(self, copies: list):
+        self.copies = copies
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def copy_expert(self, sql: str, buf) -> None:
+        self.copies.append((sql, buf.read()))
+
+
+class _FakeRawConn:
+    def __init__(self):
+        self.copies: list[tuple[str, str]] = []
+
+    def cursor(self):
+        return _FakeCursor(self.copies)
+
+
+class _FakeSession:
+    def __init__(self, raw_conn: _FakeRawConn):
+        self.raw_conn = raw_conn
+        self.committed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, *args, **kwargs):
+        class _Result:
+            def fetchone(self):
+                return (7,)
+
+        return _Result()
+
+    def connection(self):
+        return type("_Conn", (), {"connection": self.raw_conn})()
+
+    def commit(self):
+        self.committed = True
+
+
+def test_save_backtest_copies_equity_and_trades():
+    raw_conn = _FakeRawConn()
+    session = _FakeSession(raw_conn)
+    db = BacktestDatabase.__new__(BacktestDatabase)  # 不建连接池
+    db.get_session = lambda: session
+
+    equity = pd.DataFrame(
+        {
+            "ts": ["2024-01-01T00:00:00", "2024-01-01T00:00:00", "2024-01-01T01:00:00"],
+            "equity": [100.0, 101.0, 102.5],
+        }
+    )
+    trades = pd.DataFrame(
+        {
+            "ts": ["2024-01-01T00:00:00", "2024-01-01T01:00:00", "2024-01-01T02:00:00"],
+            "side": ["buy", "sell", "sell"],
+            "price": [10.0, 11.0, 9.5],
+            "qty": [1.0, 1.0, 0.5],
+            "realized_delta": [None, 5.0, -2.0],
+            "fee": [0.1, 0.2, 0.3],
+        }
+    )
+    backtest_id = db.save_backtest(
+        "run-1", "BTCUSDT", "1h", datetime(2024, 1, 1), datetime(2024, 1, 2), "simple_ma", {},
+        {"total_return": 0.1}, equity_curve=equity, trades=trades,
+    )
+
+    assert backtest_id == 7
+    assert session.committed
+    (eq_sql, eq_csv), (tr_sql, tr_csv) = raw_conn.copies
+    assert eq_sql.startswith("COPY equity_curves (backtest_id, timestamp, equity, drawdown, drawdown_pct) FROM STDIN")
+    # 重复时间戳只保留首条；缺失的回撤列写 0
+    assert eq_csv.splitlines() == [
+        "7,2024-01-01T00:00:00,100.0,0.0,0.0",
+        "7,2024-01-01T01:00:00,102.5,0.0,0.0",
+    ]
+    assert tr_sql.startswith(
+        "COPY trades (backtest_id, timestamp, symbol, side, price, qty, pnl, commission, cumulative_pnl) FROM STDIN"
+    )
+    # fee -> commission，realized_delta -> pnl；缺失 PnL 写 NULL 且不影响累计值
+    assert tr_csv.splitlines() == [
+        r"7,2024-01-01T00:00:00,BTCUSDT,buy,10.0,1.0,\N,0.1,\N",
+        "7,2024-01-01T01:00:00,BTCUSDT,sell,11.0,1.0,5.0,0.2,5.0",
+        "7,2024-01-01T02:00:00,BTCUSDT,sell,9.5,0.5,-2.0,0.3,3.0",
+    ]
+
+
+def test_coalesce_prefers_first_column_and_falls_back():
+    from zenith.database.backtest_db import _coalesce
+
+    df = pd.DataFrame({"pnl": [1.0, None, 3.0], "realized_delta": [None, 2.0, 30.0]})
+    assert _coalesce(df, "realized_delta", "pnl").tolist() == [1.0, 2.0, 30.0]
+    assert _coalesce(df, "commission", "fee", default=0.0).tolist() == [0.0, 0.0, 0.0]
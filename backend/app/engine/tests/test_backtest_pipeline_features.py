@@ -6,6 +6,7 @@ import pandas as pd
 
 from zenith.strategies.factors.registry import apply_factors, build_factors
 from zenith.common.models.models import Tick
+from zenith.core.sources.event_source import PandasFrameEventSource
 from zenith.strategies.simple_ma import SimpleMAStrategy
 
 
@@ -40,9 +41,30 @@ def test_strategy_require_features_reads_tick_features():
     ts = datetime.now(timezone.utc)
     # 第一个 tick：short == long，不应产生信号
     t1 = Tick(symbol="BTCUSDT", price=101.0, ts=ts, features={"ma_short": 100.0, "ma_long": 100.0})
-    assert strat.on_tick(t1) == []
+    assert strat.on_tick(t1) == ()
     # 第二个 tick：短均线上穿长均线
     t2 = Tick(symbol="BTCUSDT", price=103.0, ts=ts, features={"ma_short": 102.0, "ma_long": 101.0})
     sigs = strat.on_tick(t2)
     assert len(sigs) == 1
     assert sigs[0].side == "buy"
+
+
+def test_frame_event_source_emits_features_per_row():
+    ts0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    df = pd.DataFrame(
+        {
+            "ts": [ts0, ts0 + timedelta(hours=1)],
+            "symbol": ["BTCUSDT", "BTCUSDT"],
+            "open": [1.0, 2.0],
+            "high": [2.0, 3.0],
+            "low": [0.5, 1.5],
+            "close": [1.5, 2.5],
+            "volume": [10, 11],
+            "ma_short": [float("nan"), 2.0],
+        }
+    )
+    ticks = list(PandasFrameEventSource(df, feature_cols=["ma_short"]).events())
+    assert [t.price for t in ticks] == [1.5, 2.5]
+    assert ticks[0].ts == ts0
+    assert "ma_short" not in ticks[0].features
+    assert ticks[1].features == {"ma_short": 2.0, "open": 2.0, "high": 3.0, "low": 1.5, "volume": 11.0}
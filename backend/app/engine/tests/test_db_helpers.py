@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from zenith.database import db_helpers
+
+
+class _FakeDB:
+    def __init__(self):
+        self.rows = None
+
+    def save_backtests_bulk(self, rows: pd.DataFrame) -> int:
+        self.rows = rows
+        return len(rows)
+
+    def close(self):
+        pass
+
+
+def test_save_sweep_results_projects_params_and_metrics(tmp_path: Path, monkeypatch):
+    csv_path = tmp_path / "20250101" / "sweep.csv"
+    csv_path.parent.mkdir()
+    pd.DataFrame(
+        {
+            "window": [20, 30],
+            "k": [0.123456789012345678, None],
+            "sharpe": [1.5, -0.2],
+            "total_trades": [12, None],
+            "score": [0.8, 0.1],
+            "passed": [True, False],
+        }
+    ).to_csv(csv_path, index=False)
+
+    db = _FakeDB()
+    monkeypatch.setattr(db_helpers, "BacktestDatabase", lambda: db)
+    saved = db_helpers.save_sweep_results_to_db(
+        str(csv_path), "BTCUSDT", "1h", datetime(2024, 1, 1), datetime(2024, 2, 1), verbose=False
+    )
+
+    assert saved == 2
+    rows = db.rows
+    assert rows["run_id"].tolist() == ["BTCUSDT_1h_20250101_0", "BTCUSDT_1h_20250101_1"]
+    # 参数列不含指标列，NaN -> null，浮点保持全精度
+    k0 = float(pd.read_csv(csv_path)["k"][0])
+    assert [json.loads(p) for p in rows["params"]] == [{"window": 20, "k": k0}, {"window": 30, "k": None}]
+    assert rows["sharpe_ratio"].tolist() == [1.5, -0.2]
+    assert rows["total_trades"].tolist() == [12, 0]
+    assert rows["passed"].tolist() == [True, False]
@@ -27,3 +27,61 @@ def test_build_factors_missing_required_param_raises_value_error():
     with pytest.raises(ValueError):
         build_factors(spec)
 
+
+
+def test_build_factors_uses_declared_params_and_caches_others():
+    import inspect
+    from dataclasses import dataclass
+
+    from zenith.strategies.factors import registry
+    from zenith.strategies.factors.ma import MAFactor
+
+    factors = build_factors([{"type": "ma", "window": 4, "unknown": 1}])
+    assert factors[0].window == 4
+    assert MAFactor not in registry._ALLOWED_KWARGS_CACHE
+
+    @dataclass
+    class _Custom:
+        window: int = 1
+
+    registry.register_factor("_custom_test", _Custom)
+    try:
+        build_factors([{"type": "_custom_test", "window": 3, "unknown": 1}])
+        assert registry._ALLOWED_KWARGS_CACHE[_Custom] == frozenset({"window"})
+    finally:
+        registry._REGISTRY.pop("_custom_test", None)
+
+    # 声明的 PARAMS 必须与构造签名一致（name/params 为保留键，不从配置传入）
+    for cls in set(registry._REGISTRY.values()):
+        sig = frozenset(inspect.signature(cls).parameters)
+        assert cls.PARAMS == sig - {"name", "params"}
+
+
+def test_strategy_params_match_init_signature():
+    import inspect
+
+    from zenith.strategies import registry
+
+    for cls in set(registry._REGISTRY.values()):
+        assert cls.PARAMS == frozenset(inspect.signature(cls).parameters)
+
+
+@pytest.mark.parametrize("use_rust", [False, True], ids=["fallback", "rust"])
+def test_apply_factors_batches_columns_and_supports_chained_inputs(monkeypatch, use_rust):
+    from zenith.strategies.factors import atr, ema, ma, rsi
+
+    if use_rust:
+        pytest.importorskip("zenithalgo_rust")
+    for mod in (atr, ema, ma, rsi):
+        monkeypatch.setattr(mod, "_HAS_RUST", use_rust)
+    spec = [
+        {"type": "ema", "period": 2, "out_col": "ema2"},
+        {"type": "ma", "window": 2, "price_col": "ema2", "out_col": "ma_of_ema"},
+        {"type": "rsi", "period": 2},
+    ]
+    df = pd.DataFrame({"close": [1.0, 2.0, 3.0, 2.0, 4.0]})
+    out = apply_factors(df, build_factors(spec))
+    assert list(out.columns) == ["close", "ema2", "ma_of_ema", "rsi_2"]
+    expected = out["ema2"].rolling(2, min_periods=2).mean()
+    pd.testing.assert_series_equal(out["ma_of_ema"], expected, check_names=False)
+    assert "ema2" not in df.columns
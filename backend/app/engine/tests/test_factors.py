@@ -5,10 +5,12 @@ from datetime import datetime, timedelta, timezone
 import numpy as np
 import pandas as pd
 
+from zenith.strategies.factors import atr as atr_mod
 from zenith.strategies.factors.atr import ATRFactor
 from zenith.strategies.factors.ma import MAFactor
 from zenith.strategies.factors.rsi import RSIFactor
 from zenith.strategies.factors.ema import EMAFactor
+from zenith.extensions import numba_kernels
 
 
 def _df(prices: list[float]) -> pd.DataFrame:
@@ -60,6 +62,19 @@ def test_ema_factor_adds_column():
     assert out["ema3"].isna().sum() == 2
 
 
+def test_factor_compute_does_not_mutate_input():
+    df = _df([1, 2, 3, 4, 5])
+    cols = list(df.columns)
+    factor = RSIFactor(period=2, out_col="rsi2")
+    out = factor.compute(df)
+    assert list(df.columns) == cols
+    assert "rsi2" in out.columns
+    # 输出列不应与同一因子后续调用的结果共享内存
+    before = out["rsi2"].to_numpy().copy()
+    factor.compute(_df([9, 8, 7, 6, 5]))
+    np.testing.assert_array_equal(out["rsi2"].to_numpy(), before)
+
+
 def test_rsi_rust_matches_pandas():
     try:
         import zenithalgo_rust
@@ -71,7 +86,7 @@ def test_rsi_rust_matches_pandas():
     df = _df([1, 2, 3, 2, 1, 2, 3, 4, 3, 2, 3, 4, 5, 6, 7])
     series = df["close"].astype(float)
     period = 5
-    rust_vals = zenithalgo_rust.rsi(series.to_list(), period)
+    rust_vals = zenithalgo_rust.rsi(series.to_numpy(), period)
 
     delta = series.diff()
     gain = delta.clip(lower=0.0)
@@ -101,7 +116,7 @@ def test_atr_rust_matches_pandas():
     high = df["high"].astype(float)
     low = df["low"].astype(float)
     close = df["close"].astype(float)
-    rust_vals = zenithalgo_rust.atr(high.to_list(), low.to_list(), close.to_list(), period)
+    rust_vals = zenithalgo_rust.atr(high.to_numpy(), low.to_numpy(), close.to_numpy(), period)
 
     prev_close = close.shift(1)
     tr1 = high - low
@@ -115,3 +130,89 @@ def test_atr_rust_matches_pandas():
             assert np.isnan(rust_val)
         else:
             assert rust_val == panda_val
+
+
+def test_atr_kernel_matches_pandas():
+    df = _df([10, 11, 12, 11, 9, 10, 11, 12, 15, 13])
+    df.loc[6, "high"] = np.nan
+    period = 3
+    high = df["high"].astype(float)
+    low = df["low"].astype(float)
+    close = df["close"].astype(float)
+    got = numba_kernels.atr_sma(high.to_numpy(), low.to_numpy(), close.to_numpy(), period)
+
+    prev_close = close.shift(1)
+    tr1 = high - low
+    tr2 = (high - prev_close).abs()
+    tr3 = (low - prev_close).abs()
+    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    expected = tr.rolling(period, min_periods=period).mean().to_numpy()
+    np.testing.assert_allclose(got, expected, atol=1e-10, equal_nan=True)
+
+
+def test_atr_pandas_fallback_matches_concat_max(monkeypatch):
+    monkeypatch.setattr(atr_mod, "_HAS_RUST", False)
+    monkeypatch.setattr(atr_mod, "HAS_NUMBA", False)
+    df = _df([10, 11, 12, 11, 9, 10, 11, 12, 15, 13])
+    df.loc[6, "high"] = np.nan
+    period = 3
+    got = ATRFactor(period=period).compute_array(df)[f"atr_{period}"]
+
+    high, low, close = df["high"], df["low"], df["close"]
+    prev_close = close.shift(1)
+    tr = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    expected = tr.rolling(period, min_periods=period).mean().to_numpy()
+    np.testing.assert_allclose(got, expected, atol=1e-12, equal_nan=True)
+
+
+def test_ema_kernel_matches_pandas():
+    series = pd.Series([np.nan, 1, 2, 3, np.nan, np.nan, 5, 4, 6, 7, 6, 8], dtype=float)
+    period = 3
+    got = numba_kernels.ema_adjust_false(series.to_numpy(), period)
+    expected = series.ewm(span=period, adjust=False, min_periods=period).mean().to_numpy()
+    np.testing.assert_allclose(got, expected, atol=1e-10, equal_nan=True)
+
+
+def test_rsi_kernel_matches_pandas():
+    series = pd.Series([1, 2, 3, 2, 1, 2, 3, np.nan, 3, 2, 3, 4, 5, 6, 7, 7, 7, 7, 7, 7], dtype=float)
+    period = 5
+    got = numba_kernels.rsi_sma(series.to_numpy(), period)
+
+    delta = series.diff()
+    gain = delta.clip(lower=0.0)
+    loss = (-delta).clip(lower=0.0)
+    avg_gain = gain.rolling(period, min_periods=period).mean()
+    avg_loss = loss.rolling(period, min_periods=period).mean()
+    rs = avg_gain / avg_loss
+    expected = (100.0 - (100.0 / (1.0 + rs))).to_numpy()
+    np.testing.assert_allclose(got, expected, atol=1e-10, equal_nan=True)
+
+
+def test_factor_results_are_independent_across_calls():
+    for factor in (RSIFactor(period=3), EMAFactor(period=3), ATRFactor(period=3)):
+        first = factor.compute_array(_df(list(range(1, 41))))
+        snapshot = {k: v.copy() for k, v in first.items()}
+        factor.compute_array(_df([5, 4, 6, 7, 6, 8, 9, 7, 6, 5]))
+        for k, v in first.items():
+            np.testing.assert_array_equal(v, snapshot[k])
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 100.0)
+    y[5_000] = 50.0
+    idx = numba_kernels.lttb_indices(x, y, 200)
+    assert len(idx) == 200
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 5_000 in idx
+    np.testing.assert_array_equal(numba_kernels.lttb_indices(x[:10], y[:10], 200), np.arange(10))
+
+
+def test_drawdown_kernel_matches_numpy():
+    y = np.array([100.0, 110.0, 99.0, 0.0, 120.0, 60.0, np.nan, 130.0])
+    peak = np.maximum.accumulate(y)
+    expected = np.divide(peak - y, peak, out=np.zeros_like(y), where=peak != 0)
+    np.testing.assert_allclose(numba_kernels.drawdown(y), expected, equal_nan=True)
+    z = np.array([0.0, 0.0, 1.0, 0.5])
+    np.testing.assert_allclose(numba_kernels.drawdown(z), [0.0, 0.0, 0.0, 0.5])
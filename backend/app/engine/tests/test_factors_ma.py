@@ -24,7 +24,7 @@ def test_ma_rust_matches_pandas():
 
     series = pd.Series([1, 2, 3, 4, 5, 6, 7])
     window = 3
-    rust_vals = zenithalgo_rust.ma(series.astype(float).to_list(), window)
+    rust_vals = zenithalgo_rust.ma(series.to_numpy(dtype=np.float64), window)
     pandas_vals = series.rolling(window, min_periods=window).mean().to_list()
 
     assert len(rust_vals) == len(pandas_vals)
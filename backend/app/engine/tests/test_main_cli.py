@@ -13,7 +13,7 @@ def test_main_backtest_delegates_to_experiment(monkeypatch):
         calls.append({"cfg_path": cfg_path, "task": task, "kwargs": kwargs})
         return {"ok": True}
 
-    monkeypatch.setattr(app_main, "run_experiment", _fake_run_experiment)
+    monkeypatch.setattr("zenith.analysis.research.experiment.run_experiment", _fake_run_experiment)
     res = app_main.main(["--config", "config/golden_backtest.yml", "backtest"])
     assert res == {"ok": True}
     assert calls == [{"cfg_path": "config/golden_backtest.yml", "task": "backtest", "kwargs": {}}]
@@ -26,7 +26,7 @@ def test_main_backtest_accepts_config_after_subcommand(monkeypatch):
         calls.append({"cfg_path": cfg_path, "task": task, "kwargs": kwargs})
         return {"ok": True}
 
-    monkeypatch.setattr(app_main, "run_experiment", _fake_run_experiment)
+    monkeypatch.setattr("zenith.analysis.research.experiment.run_experiment", _fake_run_experiment)
     res = app_main.main(["backtest", "--config", "config/golden_backtest.yml"])
     assert res == {"ok": True}
     assert calls == [{"cfg_path": "config/golden_backtest.yml", "task": "backtest", "kwargs": {}}]
@@ -45,6 +45,6 @@ def test_main_runner_uses_trading_engine(monkeypatch):
         def run(self):
             return _Res(summary={"cfg_path": self.cfg_path, "max_ticks": self.max_ticks})
 
-    monkeypatch.setattr(app_main, "TradingEngine", _FakeEngine)
+    monkeypatch.setattr("zenith.core.trading_engine.TradingEngine", _FakeEngine)
     res = app_main.main(["--config", "config/config.yml", "runner", "--max-ticks", "12"])
     assert res == {"cfg_path": "config/config.yml", "max_ticks": 12}
@@ -1,8 +1,9 @@
 import sys
 import logging
 from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
-from zenith.common.config.config_loader import BacktestConfig, StrategyConfig
+from zenith.common.config.config_loader import BacktestConfig, StrategyConfig, build_config
 from zenith.core.vector_backtest import run_volatility_vectorized
 from zenith.core.backtest_engine import BacktestEngine
 from zenith.data.loader import HistoricalDataLoader
@@ -18,13 +19,20 @@ def run_parity_test():
     # Load Data
     loader = HistoricalDataLoader(data_dir="dataset/history")
     candles = loader.load_klines_for_backtest(symbol, interval, start, end)
-    df = pd.DataFrame([{
-        "symbol": c.symbol, "open": c.open, "high": c.high, "low": c.low, "close": c.close,
-        "volume": c.volume, "start_ts": c.start_ts, "end_ts": c.end_ts, "ts": c.end_ts
-    } for c in candles])
-    df["ts"] = pd.to_datetime(df["end_ts"], utc=True)
-    df["end_ts"] = pd.to_datetime(df["end_ts"], utc=True)
-    df = df.sort_values("end_ts").reset_index(drop=True)
+    # 逐字段直接构建列（SoA），不经过逐行 dict 再由 pandas 推断/转置
+    n = len(candles)
+    end_ts = pd.to_datetime([c.end_ts for c in candles], utc=True)
+    df = pd.DataFrame({
+        "symbol": [c.symbol for c in candles],
+        **{k: np.fromiter((getattr(c, k) for c in candles), dtype=np.float64, count=n)
+           for k in ("open", "high", "low", "close", "volume")},
+        "start_ts": [c.start_ts for c in candles],
+        "end_ts": end_ts,
+        "ts": end_ts,
+    })
+    # 加载器通常已按时间返回：end_ts 只在构建时转换一次，且已有序时跳过排序
+    if not df["end_ts"].is_monotonic_increasing:
+        df = df.sort_values("end_ts").reset_index(drop=True)
 
     print(f"Data Loaded: {len(df)} rows")
 
@@ -56,15 +64,8 @@ def run_parity_test():
     # 2. Event Run (Python)
     print("\n--- Event Engine (Python) ---")
     
-    # Creating a temp config file for BacktestEngine since it loads from file usually.
-    # Or override internal config loading? 
-    # BacktestEngine can take cfg_obj if modified properly, but standard init requires path.
-    # Let's verify BacktestEngine.__init__ signature. 
-    # It seems to take `cfg_path`.
-    
-    # We will write a temp config.
-    import yaml
-    temp_cfg_path = "config/temp_parity.yml"
+    # BacktestEngine 支持直接传入配置对象：在内存中按 load_config 同样的规则构建，
+    # 不再写临时 YAML 再读回解析。
     cfg_dict = {
         "symbol": symbol,
         "timeframe": interval,
@@ -77,8 +78,7 @@ def run_parity_test():
             "skip_plots": True
         }
     }
-    with open(temp_cfg_path, "w") as f:
-        yaml.dump(cfg_dict, f)
+    cfg_obj = build_config(cfg_dict, expand_env=False)
         
     # Subclass to capture broker
     class TestEngine(BacktestEngine):
@@ -87,7 +87,7 @@ def run_parity_test():
             self.captured_broker = self.broker
             return res
             
-    event_engine = TestEngine(cfg_path=temp_cfg_path)
+    event_engine = TestEngine(cfg_obj=cfg_obj)
     evt_res = event_engine.run()
     
     evt_trades = event_engine.captured_broker.trades if event_engine.captured_broker else []
@@ -3,7 +3,7 @@ from __future__ import annotations
 import csv
 from pathlib import Path
 
-from zenith.analysis.visualizations.plotter import _prepare_heatmap_pivot
+from zenith.analysis.visualizations.plotter import _prepare_heatmap_pivot, _sweep_pivot
 
 
 def _write_sweep_csv(path: Path) -> None:
@@ -46,3 +46,76 @@ def test_prepare_heatmap_pivot_keeps_full_grid_with_masked_filters(tmp_path: Pat
     )
     assert list(pivot.columns) == [60, 90, 120]
     assert list(pivot.index) == [0.05, 0.1, 0.2]
+
+
+def test_prepare_heatmap_pivot_drop_filters_match_mask_and_keep_input(tmp_path: Path):
+    csv_path = tmp_path / "sweep.csv"
+    _write_sweep_csv(csv_path)
+
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    before = df.copy()
+    kwargs = dict(x_param="long_window", y_param="slope_threshold", value_param="score")
+    masked = _prepare_heatmap_pivot(df, filters={"min_sharpe": 0.0, "min_trades": 10}, mask_filtered=True, **kwargs)
+    dropped = _prepare_heatmap_pivot(df, filters={"min_sharpe": 0.0, "min_trades": 10}, mask_filtered=False, **kwargs)
+
+    assert list(dropped.columns) == [90, 120]
+    pd.testing.assert_frame_equal(dropped, masked[[90, 120]])
+    pd.testing.assert_frame_equal(df, before)
+
+
+def test_prepare_heatmap_pivot_unique_grid_matches_pivot_table(tmp_path: Path):
+    csv_path = tmp_path / "sweep.csv"
+    _write_sweep_csv(csv_path)
+
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    pivot = _prepare_heatmap_pivot(
+        df,
+        x_param="long_window",
+        y_param="slope_threshold",
+        value_param="score",
+        filters={"min_sharpe": 0.0},
+        mask_filtered=True,
+    )
+    masked = df.assign(score=df["score"].where(df["sharpe"] >= 0.0))
+    expected = masked.pivot_table(index="slope_threshold", columns="long_window", values="score", aggfunc="mean")
+    pd.testing.assert_frame_equal(pivot, expected)
+
+
+def test_sweep_pivot_cache_invalidates_on_rewrite(tmp_path: Path):
+    import os
+
+    csv_path = tmp_path / "sweep.csv"
+    _write_sweep_csv(csv_path)
+    kwargs = dict(x_param="long_window", y_param="slope_threshold", value_param="score")
+    cols = ["long_window", "slope_threshold", "score"]
+
+    first = _sweep_pivot(csv_path, cols, **kwargs)
+    assert _sweep_pivot(csv_path, cols, **kwargs) is first
+
+    st = csv_path.stat()
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert _sweep_pivot(csv_path, cols, **kwargs) is not first
+
+
+def test_sweep_heatmaps_skips_sparse_slices(tmp_path: Path):
+    import pandas as pd
+
+    from zenith.analysis.visualizations.plotter import plot_sweep_heatmaps
+
+    csv_path = tmp_path / "sweep.csv"
+    rows = [(a, b, 1, float(a + b)) for a in (1, 2) for b in (3, 4)] + [(1, 3, 2, 9.0)]
+    pd.DataFrame(rows, columns=["a", "b", "s", "score"]).to_csv(csv_path, index=False)
+
+    paths = plot_sweep_heatmaps(csv_path, x_param="a", y_param="b", slice_param="s", save_dir=tmp_path / "out")
+    # s=2 只有 1 行（< 4），不出图
+    assert [Path(p).name for p in paths] == ["heatmap_score_s_1.png"]
+    assert Path(paths[0]).exists()
+
+    pivot = _sweep_pivot(
+        csv_path, ["a", "b", "score", "s"], x_param="a", y_param="b", value_param="score", slice_param="s", slice_val=2
+    )
+    assert pivot.to_numpy().tolist() == [[9.0]]
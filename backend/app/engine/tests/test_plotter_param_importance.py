@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from zenith.analysis.visualizations.plotter import _group_means, _spearman_corr
+
+
+def _ref_spearman(x: pd.Series, y: pd.Series) -> float:
+    m = x.notna() & y.notna()
+    return float(x[m].rank().corr(y[m].rank()))
+
+
+def test_spearman_corr_matches_pairwise_rank_pearson():
+    rng = np.random.default_rng(0)
+    n = 50
+    y = pd.Series(rng.normal(size=n))
+    y[3] = np.nan
+    x = pd.DataFrame(
+        {
+            "a": y.fillna(0) * 2 + rng.normal(size=n),
+            "b": rng.integers(0, 5, size=n).astype(float),  # 大量并列
+            "c": rng.normal(size=n),
+            "const": np.ones(n),
+        }
+    )
+    x.loc[[5, 7], "c"] = np.nan  # 与 y 的缺失不重合 -> 单独排名
+
+    got = _spearman_corr(x, y)
+
+    for col in ["a", "b", "c"]:
+        assert np.isclose(got[col], _ref_spearman(x[col], y))
+    assert np.isnan(got["const"])
+
+
+def test_group_means_matches_groupby_mean():
+    keys = pd.Series(["a", "b", None, "a", "c", "b", "c"])
+    values = np.array([1.0, 2.0, 5.0, 3.0, np.nan, 4.0, np.nan])
+    got = _group_means(keys, values)
+    expected = pd.Series(values).groupby(keys, dropna=True, sort=False).mean()
+    np.testing.assert_allclose(got, expected.to_numpy(), equal_nan=True)
@@ -11,3 +11,19 @@ def test_estimate_pnl_basic():
     pnl = estimate_pnl(positions, last_prices)
     # BTC: +15, ETH: +20 (空头价格下跌盈利)
     assert abs(pnl - 35.0) < 1e-9
+
+
+def test_pnl_helpers_match_loop_for_large_portfolio():
+    from zenith.common.utils.pnl import compute_unrealized_pnl, realized_delta
+
+    positions = {
+        f"S{i}": Position(symbol=f"S{i}", qty=float(i % 7 - 3), avg_price=10.0 + i) for i in range(100)
+    }
+    last_prices = {f"S{i}": 12.5 + i * 0.9 for i in range(0, 100, 2)}
+    expected = sum(
+        p.qty * (last_prices[s] - p.avg_price) for s, p in positions.items() if s in last_prices
+    )
+    assert abs(estimate_pnl(positions, last_prices) - expected) < 1e-9
+    assert abs(compute_unrealized_pnl(positions, last_prices) - expected) < 1e-9
+    # 全部平仓：已实现变动等于平仓前的浮动盈亏
+    assert abs(realized_delta(positions, {}, last_prices) - expected) < 1e-9
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from zenith.analysis import reporting
+
+
+def test_template_loads_plotlyjs_matching_installed_plotly():
+    from plotly.offline import get_plotlyjs_version
+
+    assert f"cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js" in reporting.TEMPLATE_SRC
+    assert "__PLOTLYJS_VERSION__" not in reporting.TEMPLATE_SRC
+
+
+def _write_summary(out_dir):
+    (out_dir / "summary.json").write_text(json.dumps({"metrics": {"total_return": 0.1}}), encoding="utf-8")
+
+
+def test_backtest_report_renders_charts_from_structured_sidecar(tmp_path):
+    _write_summary(tmp_path)
+    curve = np.zeros(3, dtype=[("ts", "datetime64[ns]"), ("equity", "float64")])
+    curve["ts"] = np.array(["2024-01-01", "2024-01-02", "2024-01-03"], dtype="datetime64[ns]")
+    curve["equity"] = [100.0, 101.5, 99.0]
+    np.save(tmp_path / reporting._EQUITY_SIDECAR, curve)
+
+    html = reporting.ReportGenerator(str(tmp_path)).generate().read_text(encoding="utf-8")
+    assert "<h3>Equity Curve</h3>" in html
+    assert "<h3>Drawdown</h3>" in html
+
+
+def test_backtest_report_falls_back_to_results_json_on_corrupt_sidecar(tmp_path, monkeypatch):
+    _write_summary(tmp_path)
+    (tmp_path / reporting._EQUITY_SIDECAR).write_bytes(b"not a npy file")
+    curve = [["2024-01-01T00:00:00", 100.0], ["2024-01-02T00:00:00", 101.5]]
+    (tmp_path / "results.json").write_text(json.dumps({"equity_curve": curve}), encoding="utf-8")
+    warnings = []
+    monkeypatch.setattr(reporting._LOGGER, "warning", lambda *a, **kw: warnings.append(a))
+
+    html = reporting.ReportGenerator(str(tmp_path)).generate().read_text(encoding="utf-8")
+    assert "<h3>Equity Curve</h3>" in html
+    assert len(warnings) == 1
+
+
+def test_generate_many_returns_report_paths_in_input_order(tmp_path):
+    dirs = []
+    for name in ("b", "a"):
+        d = tmp_path / name
+        d.mkdir()
+        _write_summary(d)
+        dirs.append(str(d))
+
+    paths = reporting.generate_many(dirs, max_workers=2)
+    assert paths == [tmp_path / "b" / "report.html", tmp_path / "a" / "report.html"]
+    assert all(p.is_file() for p in paths)
+
+
+def test_streamed_equity_curve_matches_json_load(tmp_path, monkeypatch):
+    pytest.importorskip("ijson")
+    path = tmp_path / "results.json"
+    curve = [["2024-01-01T00:00:00", 100.0], ["2024-01-02T00:00:00", 101.25], ["2024-01-03T00:00:00", 99.5]]
+    path.write_text(json.dumps({"metrics": {"sharpe": 1.2}, "equity_curve": curve}), encoding="utf-8")
+    monkeypatch.setattr(reporting, "_STREAM_MIN_BYTES", 0)  # 强制走 ijson 流式路径
+
+    with path.open(encoding="utf-8") as f:
+        expected = json.load(f)["equity_curve"]
+    assert reporting._load_equity_curve(path) == expected
+
+
+def test_sweep_report_renders_top_configs_and_best_run(tmp_path):
+    import re
+
+    run_dir = tmp_path / "run1"  # 约定位置：下一级子目录
+    run_dir.mkdir()
+    pd.DataFrame(
+        {
+            "window": [10, 20, 10, 20],
+            "k": [1.0, 1.0, 2.0, 2.0],
+            "sharpe": [0.5, None, 1.25, -0.3],
+            "total_return": [0.1, 0.2, 0.3, None],
+            "filter_reason": ["", "low_trades", "", ""],
+            "passed": [True, False, True, True],
+        }
+    ).to_csv(run_dir / "sweep.csv", index=False)
+
+    out = reporting.ReportGenerator(str(tmp_path)).generate()
+    assert out == tmp_path / "report.html"
+    html = out.read_text(encoding="utf-8")
+
+    # 按 sharpe 降序，NaN 排最后；缺失值（含空 filter_reason）渲染为 nan
+    body = html[html.index("<tbody>"):html.index("</tbody>")]
+    rows = [re.findall(r"<td>([^<]*)</td>", tr) for tr in re.findall(r"<tr>(.*?)</tr>", body, re.S)]
+    assert rows == [
+        ["10", "2.0000", "1.2500", "0.3000", "nan", "True"],
+        ["10", "1.0000", "0.5000", "0.1000", "nan", "True"],
+        ["20", "2.0000", "-0.3000", "nan", "nan", "True"],
+        ["20", "1.0000", "nan", "0.2000", "low_trades", "False"],
+    ]
+    cards = re.findall(r'metric-val">([^<]*)</div>\s*<div class="metric-label">([^<]*)</div>', html)
+    assert cards == [("30.00%", "Best Run Total Return"), ("1.25", "Best Run Sharpe")]
@@ -8,12 +8,14 @@ import pytest
 
 
 def _assert_series_close(rust_vals: list[float], pandas_vals: list[float], *, tol: float = 1e-10) -> None:
-    assert len(rust_vals) == len(pandas_vals)
-    for rust_val, panda_val in zip(rust_vals, pandas_vals):
-        if pd.isna(panda_val):
-            assert math.isnan(rust_val)
-        else:
-            assert abs(rust_val - panda_val) <= tol
+    # 形状、NaN 位置与绝对误差一次向量化比较（rtol=0：仅按 tol 判定）
+    np.testing.assert_allclose(
+        np.asarray(rust_vals, dtype=np.float64),
+        np.asarray(pandas_vals, dtype=np.float64),
+        rtol=0,
+        atol=tol,
+        equal_nan=True,
+    )
 
 
 def _df(prices: list[float]) -> pd.DataFrame:
@@ -30,7 +32,7 @@ def test_rust_ma_parity():
     rust = pytest.importorskip("zenithalgo_rust")
     series = pd.Series([1, 2, 3, 4, 5, 6, 7], dtype=float)
     window = 3
-    rust_vals = rust.ma(series.to_list(), window)
+    rust_vals = rust.ma(np.ascontiguousarray(series.to_numpy(dtype=np.float64)), window).tolist()
     pandas_vals = series.rolling(window, min_periods=window).mean().to_list()
     _assert_series_close(rust_vals, pandas_vals)
 
@@ -39,7 +41,7 @@ def test_rust_rsi_parity():
     rust = pytest.importorskip("zenithalgo_rust")
     series = pd.Series([1, 2, 3, 2, 1, 2, 3, 4, 3, 2, 3, 4, 5, 6, 7], dtype=float)
     period = 5
-    rust_vals = rust.rsi(series.to_list(), period)
+    rust_vals = rust.rsi(series.to_numpy(), period).tolist()
 
     delta = series.diff()
     gain = delta.clip(lower=0.0)
@@ -58,14 +60,14 @@ def test_rust_atr_parity():
     high = df["high"].astype(float)
     low = df["low"].astype(float)
     close = df["close"].astype(float)
-    rust_vals = rust.atr(high.to_list(), low.to_list(), close.to_list(), period)
-
-    prev_close = close.shift(1)
-    tr1 = high - low
-    tr2 = (high - prev_close).abs()
-    tr3 = (low - prev_close).abs()
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    pandas_vals = tr.rolling(period, min_periods=period).mean().to_list()
+    rust_vals = rust.atr(high.to_numpy(), low.to_numpy(), close.to_numpy(), period).tolist()
+
+    h, lo, c = high.to_numpy(), low.to_numpy(), close.to_numpy()
+    prev_close = np.concatenate(([np.nan], c[:-1]))
+    # fmax 跳过 NaN：首根 bar 的 TR 即 high - low
+    tr = np.fmax(h - lo, np.fmax(np.abs(h - prev_close), np.abs(lo - prev_close)))
+    cs = np.concatenate(([0.0], np.cumsum(tr)))
+    pandas_vals = [math.nan] * (period - 1) + ((cs[period:] - cs[:-period]) / period).tolist()
     _assert_series_close(rust_vals, pandas_vals)
 
 
@@ -73,6 +75,6 @@ def test_rust_ema_parity():
     rust = pytest.importorskip("zenithalgo_rust")
     series = pd.Series([1, 2, 3, 4, 5, 6, 7], dtype=float)
     period = 3
-    rust_vals = rust.ema(series.to_list(), period)
+    rust_vals = rust.ema(series.to_numpy(), period).tolist()
     pandas_vals = series.ewm(span=period, adjust=False, min_periods=period).mean().to_list()
     _assert_series_close(rust_vals, pandas_vals)
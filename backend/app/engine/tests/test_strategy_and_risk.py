@@ -1,8 +1,12 @@
 from datetime import datetime, timezone
+import statistics
+
+import pandas as pd
 
 from zenith.common.models.models import OrderSignal, Tick
 from zenith.strategies.risk.manager import RiskManager
 from zenith.strategies.simple_ma import SimpleMAStrategy
+from zenith.strategies.volatility import VolatilityBreakoutStrategy
 from zenith.common.config.config_loader import RiskConfig
 
 
@@ -22,6 +26,58 @@ def test_simple_ma_generates_signals_when_crossing():
     assert "sell" in sides
 
 
+def test_simple_ma_running_sums_track_windows():
+    strat = SimpleMAStrategy(short_window=3, long_window=5, min_ma_diff=1e9, cooldown_secs=0)
+    prices = [10.0, 11.5, 9.25, 12.0, 13.0, 8.5, 7.75, 14.0, 10.0]
+    for p in prices:
+        strat.on_tick(Tick(symbol="BTCUSDT", price=p, ts=datetime.now(timezone.utc)))
+
+    assert abs(strat._long_sum - sum(prices[-5:])) < 1e-9
+    assert abs(strat._short_sum - sum(prices[-3:])) < 1e-9
+
+
+def test_simple_ma_running_sums_resync_after_float_drift():
+    strat = SimpleMAStrategy(short_window=2, long_window=3, min_ma_diff=1e9, cooldown_secs=0)
+    # 1e16 + 1.0 在 float64 中被吞掉，滑出窗口后增量和会偏离真实值
+    prices = [1e16] + [1.0] * 6
+    for p in prices:
+        strat.on_tick(Tick(symbol="BTCUSDT", price=p, ts=datetime.now(timezone.utc)))
+
+    assert strat._long_sum == 3.0
+    assert strat._short_sum == 2.0
+
+
+def test_volatility_breakout_incremental_band_stats():
+    strat = VolatilityBreakoutStrategy(window=4, k=1e9, atr_period=2)
+    prices = [60000.0, 60010.5, 59990.25, 60020.0, 60005.0, 59980.0, 60030.0, 60001.0, 60002.0]
+    for p in prices:
+        strat.on_tick(Tick(symbol="BTCUSDT", price=p, ts=datetime.now(timezone.utc)))
+
+    n = strat.window
+    mean_shifted = strat._sum / n
+    variance = (strat._sum_sq - n * mean_shifted * mean_shifted) / (n - 1)
+    assert abs(mean_shifted + strat._shift - statistics.mean(prices[-n:])) < 1e-9
+    assert abs(variance - statistics.variance(prices[-n:])) < 1e-6
+
+
+def test_volatility_breakout_on_bars_emits_crossover_entries():
+    closes = [10.0, 10.0, 10.0, 10.0, 20.0, 21.0, 10.0, 10.0, 0.0]
+    df = pd.DataFrame(
+        {
+            "end_ts": pd.date_range("2024-01-01", periods=len(closes), freq="h", tz="UTC"),
+            "close": closes,
+        }
+    )
+    strat = VolatilityBreakoutStrategy(window=4, k=1.0)
+    assert strat.supports_vector
+
+    sig = strat.on_bars(df)
+    assert list(sig.columns) == ["ts", "side"]
+    # 仅在首次突破的那根 bar 触发，持续在轨外不重复发信号
+    assert sig["side"].tolist() == ["buy", "sell"]
+    assert sig["ts"].tolist() == [df["end_ts"][4], df["end_ts"][8]]
+
+
 def test_risk_manager_clips_and_blocks():
     risk = RiskManager(RiskConfig(max_position_pct=0.3, max_daily_loss_pct=0.05))
 
@@ -1,22 +1,35 @@
 from __future__ import annotations
 
-import csv
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+import yaml
+
 from zenith.core.walkforward_engine import WalkforwardEngine
 
 
 def _write_candles_csv(path: Path, *, symbol: str, interval: str, prices: list[float]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    ts0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
-    with path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["symbol", "open", "high", "low", "close", "volume", "start_ts", "end_ts"])
-        for i, p in enumerate(prices):
-            start = ts0 + timedelta(hours=i)
-            end = start + timedelta(hours=1)
-            w.writerow([symbol, p, p + 1, p - 1, p, 1.0, start.isoformat(), end.isoformat()])
+    ts0 = pd.Timestamp(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    p = np.asarray(prices)
+    start = ts0 + pd.to_timedelta(np.arange(len(p)), unit="h")
+    end = start + pd.Timedelta(hours=1)
+    # 整表一次写出；时间戳格式与 datetime.isoformat() 一致（UTC 固定为 +00:00）
+    iso = "%Y-%m-%dT%H:%M:%S+00:00"
+    pd.DataFrame(
+        {
+            "symbol": symbol,
+            "open": p,
+            "high": p + 1,
+            "low": p - 1,
+            "close": p,
+            "volume": 1.0,
+            "start_ts": start.strftime(iso),
+            "end_ts": end.strftime(iso),
+        }
+    ).to_csv(path, index=False)
 
 
 def test_walkforward_smoke(tmp_path):
@@ -28,43 +41,34 @@ def test_walkforward_smoke(tmp_path):
 
     # WalkforwardEngine 读取 cfg_path；这里写一个最小配置文件即可覆盖 smoke 场景
     cfg_path = tmp_path / "config.yml"
-    cfg_path.write_text(
-        "\n".join(
-            [
-                f"symbol: \"{symbol}\"",
-                f"timeframe: \"{interval}\"",
-                "mode: \"paper\"",
-                "equity_base: 1000",
-                "exchange:",
-                "  name: \"binance\"",
-                "  base_url: \"https://api.binance.com\"",
-                "risk:",
-                "  max_position_pct: 1.0",
-                "  max_daily_loss_pct: 1.0",
-                "strategy:",
-                "  type: \"simple_ma\"",
-                "  min_ma_diff: 0.0",
-                "  cooldown_secs: 0",
-                "backtest:",
-                f"  data_dir: \"{data_dir}\"",
-                f"  symbol: \"{symbol}\"",
-                f"  interval: \"{interval}\"",
-                "  start: \"2024-01-01T00:00:00Z\"",
-                "  end: \"2024-01-01T12:00:00Z\"",
-                "  initial_equity: 1000",
-                "  auto_download: false",
-                "  quiet_risk_logs: true",
-                "  flatten_on_end: false",
-                "  fees: {maker: 0.0, taker: 0.0, slippage_bp: 0.0}",
-                "  sweep:",
-                "    mode: \"grid\"",
-                "    params: {short_window: [2], long_window: [3]}",
-                "    objective: {total_return_weight: 1.0, sharpe_weight: 0.0, max_drawdown_weight: 0.0}",
-                "    min_trades: 0",
-            ]
-        ),
-        encoding="utf-8",
-    )
+    cfg = {
+        "symbol": symbol,
+        "timeframe": interval,
+        "mode": "paper",
+        "equity_base": 1000,
+        "exchange": {"name": "binance", "base_url": "https://api.binance.com"},
+        "risk": {"max_position_pct": 1.0, "max_daily_loss_pct": 1.0},
+        "strategy": {"type": "simple_ma", "min_ma_diff": 0.0, "cooldown_secs": 0},
+        "backtest": {
+            "data_dir": str(data_dir),
+            "symbol": symbol,
+            "interval": interval,
+            "start": "2024-01-01T00:00:00Z",
+            "end": "2024-01-01T12:00:00Z",
+            "initial_equity": 1000,
+            "auto_download": False,
+            "quiet_risk_logs": True,
+            "flatten_on_end": False,
+            "fees": {"maker": 0.0, "taker": 0.0, "slippage_bp": 0.0},
+            "sweep": {
+                "mode": "grid",
+                "params": {"short_window": [2], "long_window": [3]},
+                "objective": {"total_return_weight": 1.0, "sharpe_weight": 0.0, "max_drawdown_weight": 0.0},
+                "min_trades": 0,
+            },
+        },
+    }
+    cfg_path.write_text(yaml.safe_dump(cfg, sort_keys=False), encoding="utf-8")
 
     res = WalkforwardEngine(
         cfg_path=str(cfg_path),
@@ -5,14 +5,18 @@ from zenith.core.worker import JobConsumer
 
 def test_worker_initialization():
     """验证 Worker 初始化是否连接 Redis。"""
-    with patch("redis.from_url") as mock_redis:
+    with patch("redis.ConnectionPool.from_url") as mock_pool, patch("redis.Redis") as mock_redis:
         worker = JobConsumer(redis_url="redis://localhost:6379/0")
-        mock_redis.assert_called_once_with("redis://localhost:6379/0", decode_responses=True)
+        mock_pool.assert_called_once_with("redis://localhost:6379/0", max_connections=16, decode_responses=False)
+        # 消费与发布各用一个客户端，共享同一连接池
+        assert mock_redis.call_count == 2
+        for call in mock_redis.call_args_list:
+            assert call.kwargs == {"connection_pool": mock_pool.return_value}
         assert worker.queue_key == "zenith:jobs:queue"
 
 def test_worker_process_invalid_job():
     """验证处理无效 Job 时是否上报错误。"""
-    with patch("redis.from_url") as mock_redis_cls:
+    with patch("redis.ConnectionPool.from_url"), patch("redis.Redis") as mock_redis_cls:
         mock_redis_instance = MagicMock()
         mock_redis_cls.return_value = mock_redis_instance
         
@@ -32,3 +36,172 @@ def test_worker_process_invalid_job():
         msg_data = json.loads(message)
         assert msg_data["type"] == "error"
         assert msg_data["job_id"] == "job_123"
+
+
+def test_worker_progress_is_batched_and_flushed_before_result():
+    """验证进度消息合批发送，终态消息发送前先 flush。"""
+    with patch("redis.ConnectionPool.from_url"), patch("redis.Redis") as mock_redis_cls:
+        worker = JobConsumer()
+        pipe = mock_redis_cls.return_value.pipeline.return_value
+
+        worker._progress_flushed_at = float("inf")  # 排除时间触发
+        for i in range(3):
+            worker._report_progress("job_1", i / 3, {})
+        assert pipe.publish.call_count == 3
+        assert not pipe.execute.called
+
+        worker._report_success("job_1", {})
+        pipe.execute.assert_called_once()
+        mock_redis_cls.return_value.publish.assert_called_once()
+
+
+def test_worker_reliable_queue_moves_and_acks_job():
+    """验证任务经 BLMOVE 移入 processing 列表，处理后 LREM 确认。"""
+    with patch("redis.ConnectionPool.from_url"), patch("redis.Redis") as mock_redis_cls:
+        r = mock_redis_cls.return_value
+        r.lmove.return_value = None
+        r.blmove.side_effect = ['{"job_id": "j"}', KeyboardInterrupt]
+        worker = JobConsumer()
+
+        with patch.object(worker, "_process_job") as process:
+            worker.run_forever()
+
+        r.lmove.assert_called_once_with(worker.processing_key, worker.queue_key, "LEFT", "RIGHT")
+        r.blmove.assert_called_with(worker.queue_key, worker.processing_key, timeout=1, src="RIGHT", dest="LEFT")
+        process.assert_called_once_with('{"job_id": "j"}')
+        r.lrem.assert_called_once_with(worker.processing_key, 1, '{"job_id": "j"}')
+        # 退出时删除心跳，未确认的任务可被其它 worker 收回
+        r.delete.assert_called_with(worker.heartbeat_key)
+
+
+def test_worker_recovers_processing_lists_of_dead_workers():
+    """验证启动时收回自己与心跳已过期 worker 的 processing 列表，存活 worker 的不动。"""
+    with patch("redis.ConnectionPool.from_url"), patch("redis.Redis") as mock_redis_cls:
+        r = mock_redis_cls.return_value
+        r.lmove.return_value = None
+        r.scan_iter.return_value = [
+            b"zenith:jobs:processing:w1",
+            b"zenith:jobs:processing:dead",
+            b"zenith:jobs:processing:alive",
+        ]
+        r.exists.side_effect = lambda key: key == "zenith:workers:heartbeat:alive"
+        worker = JobConsumer(worker_id="w1")
+        assert worker.processing_key == "zenith:jobs:processing:w1"
+
+        worker._recover_processing()
+
+        moved = [c.args[0] for c in r.lmove.call_args_list]
+        assert moved == ["zenith:jobs:processing:w1", "zenith:jobs:processing:dead"]
+
+
+def test_worker_id_can_be_pinned_via_env(monkeypatch):
+    monkeypatch.setenv("ZENITH_WORKER_ID", "node-a")
+    with patch("redis.ConnectionPool.from_url"), patch("redis.Redis"):
+        assert JobConsumer().processing_key == "zenith:jobs:processing:node-a"
+
+
+def test_worker_reuses_engine_when_only_strategy_params_differ():
+    """验证仅策略参数不同的任务复用同一引擎，其它配置不同则新建。"""
+    with patch("redis.ConnectionPool.from_url"), patch("redis.Redis"), \
+            patch("zenith.core.worker.BacktestEngine") as engine_cls:
+        engine_cls.side_effect = lambda **kw: MagicMock()
+        worker = JobConsumer()
+        from zenith.common.config.config_loader import MainConfig
+
+        bt = {"symbol": "BTCUSDT", "interval": "1h", "start": "2024-01-01", "end": "2024-02-01"}
+        base = MainConfig.model_validate(
+            {"symbol": "BTCUSDT", "backtest": {**bt, "strategy": {"type": "simple_ma", "params": {"short_window": 5}}}}
+        )
+        other = MainConfig.model_validate(
+            {"symbol": "BTCUSDT", "backtest": {**bt, "strategy": {"type": "simple_ma", "params": {"short_window": 9}}}}
+        )
+
+        first = worker._get_engine(base)
+        second = worker._get_engine(other)
+        assert second is first
+        second.update_config.assert_called_once_with(other)
+
+        third = worker._get_engine(MainConfig.model_validate({"symbol": "ETHUSDT", "backtest": {**bt, "symbol": "ETHUSDT"}}))
+        assert third is not first
+        assert engine_cls.call_count == 2
+
+
+def test_worker_decodes_tagged_msgpack_and_json_payloads():
+    """验证带版本标记的 msgpack 负载与 JSON 负载解析结果一致。"""
+    msgpack = pytest.importorskip("msgpack")
+    from zenith.core.worker import _MSGPACK_TAG, _decode_job
+
+    job = {"job_id": "job_1", "config": {"symbol": "BTCUSDT", "equity_base": 0.1}}
+    packed = _MSGPACK_TAG + msgpack.packb(job, use_bin_type=True)
+    assert _decode_job(packed) == _decode_job(json.dumps(job).encode())
+
+
+def test_worker_pooled_mode_acks_only_completed_jobs():
+    """验证进程池模式：子进程完成的任务被确认，执行异常的任务留在 processing 列表。"""
+    from concurrent.futures import Future
+
+    class _SyncPool:
+        def __init__(self):
+            self.submitted = []
+
+        def submit(self, fn, payload):
+            self.submitted.append(payload)
+            fut = Future()
+            if payload == b"bad":
+                fut.set_exception(RuntimeError("pool broken"))
+            else:
+                fut.set_result(None)
+            return fut
+
+    with patch("redis.ConnectionPool.from_url"), patch("redis.Redis") as mock_redis_cls:
+        r = mock_redis_cls.return_value
+        r.blmove.side_effect = [b"ok", None, b"bad", KeyboardInterrupt]
+        r.pipeline.return_value.execute.return_value = [1, True]  # 首次失败
+        worker = JobConsumer(max_inflight=2)
+        pool = _SyncPool()
+
+        with pytest.raises(KeyboardInterrupt):
+            worker._run_pooled(pool)
+
+        assert pool.submitted == [b"ok", b"bad"]
+        r.lrem.assert_called_once_with(worker.processing_key, 1, b"ok")
+        r.pipeline.return_value.hincrby.assert_called_once()
+        assert not r.pipeline.return_value.lpush.called
+
+
+def test_worker_dead_letters_payload_after_repeated_failures():
+    """验证反复失败的负载移出 processing 列表进入死信列表，并上报错误。"""
+    with patch("redis.ConnectionPool.from_url"), patch("redis.Redis") as mock_redis_cls:
+        r = mock_redis_cls.return_value
+        pipe = r.pipeline.return_value
+        pipe.execute.return_value = [3, True]
+        worker = JobConsumer(max_inflight=2)
+        payload = b'{"job_id": "boom", "config": {}}'
+
+        worker._record_failure(payload)
+
+        pipe.lrem.assert_called_once_with(worker.processing_key, 1, payload)
+        pipe.lpush.assert_called_once_with(worker.dead_key, payload)
+        channel, message = r.publish.call_args.args
+        assert json.loads(message)["job_id"] == "boom"
+
+
+def test_worker_restarts_in_loop_after_pool_drains():
+    """验证崩溃后先等进程池排空再收回 processing 列表，且以循环而非递归重启。"""
+    from unittest.mock import call
+
+    with patch("redis.ConnectionPool.from_url"), patch("redis.Redis"), \
+            patch("zenith.core.worker.ProcessPoolExecutor") as pool_cls, patch("zenith.core.worker.time.sleep"):
+        worker = JobConsumer(max_inflight=2)
+        events = MagicMock()
+        pool_cls.return_value.shutdown.side_effect = lambda **kw: events.shutdown(**kw)
+        with patch.object(worker, "_recover_processing", events.recover), \
+                patch.object(worker, "_run_pooled", side_effect=[RuntimeError("broken"), KeyboardInterrupt]):
+            worker.run_forever()
+
+        assert events.mock_calls == [
+            call.recover(),
+            call.shutdown(wait=True, cancel_futures=True),
+            call.recover(),
+            call.shutdown(wait=False, cancel_futures=True),
+        ]
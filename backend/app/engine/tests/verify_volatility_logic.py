@@ -4,44 +4,85 @@ from zenith.extensions.rust_wrapper import RustSimulator
 from zenith.data.loader import HistoricalDataLoader
 from datetime import datetime, timezone
 
-def python_itr_simulation(df, window, k, atr_mult, atr_period):
-    """Pure Python Iterative Simulation (Slow but verify functionality)."""
-    
-    # 1. Indicators
-    closes = df["close"].astype(float)
-    highs = df["high"].astype(float)
-    lows = df["low"].astype(float)
-    
-    ma = closes.rolling(window).mean()
-    std = closes.rolling(window).std()
-    upper = ma + k * std
-    lower = ma - k * std
-    
-    # ATR
-    c_prev = closes.shift(1)
-    tr1 = highs - lows
-    tr2 = (highs - c_prev).abs()
-    tr3 = (lows - c_prev).abs()
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    atr = tr.rolling(atr_period).mean() # Simple MA ATR for parity with Rust which often uses SMA or RMA? 
+try:
+    from numba import njit as _njit
+except ImportError:  # pragma: no cover - numba 为可选依赖
+    _njit = None
+
+
+def _jit(fn):
+    """numba 可用时以 `njit(cache=True, nogil=True)` 编译，否则原样返回。"""
+    if _njit is None:
+        return fn
+    return _njit(cache=True, nogil=True)(fn)
+
+
+def _sma(x, w):
+    """前缀和求滚动均值，前 w-1 个为 NaN（对应 rolling(w).mean()，要求输入无 NaN）。"""
+    out = np.full(x.shape[0], np.nan)
+    if x.shape[0] >= w:
+        cs = np.concatenate(([0.0], np.cumsum(x)))
+        out[w - 1 :] = (cs[w:] - cs[:-w]) / w
+    return out
+
+
+def _sstd(x, w):
+    """前缀和/平方前缀和求滚动样本标准差（ddof=1，对应 rolling(w).std()）。
+
+    先减去首个值再累加，避免大价格下 E[X^2]-E[X]^2 的数值抵消。
+    """
+    out = np.full(x.shape[0], np.nan)
+    if x.shape[0] >= w:
+        d = x - x[0]
+        cs = np.concatenate(([0.0], np.cumsum(d)))
+        cs2 = np.concatenate(([0.0], np.cumsum(d * d)))
+        s = cs[w:] - cs[:-w]
+        s2 = cs2[w:] - cs2[:-w]
+        var = (s2 - s * s / w) / (w - 1)
+        out[w - 1 :] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+def _compute_signals(df, window, k, atr_period):
+    """用前缀和独立计算布林上轨与 ATR（SMA），返回 float64 数组。"""
+    c = df["close"].to_numpy(dtype=np.float64)
+    
+    upper = _sma(c, window) + k * _sstd(c, window)
+    
+    # ATR：TR 直接在 ndarray 上逐元素取最大（fmax 跳过 NaN，与 concat(...).max(axis=1) 一致）
+    h = df["high"].to_numpy(dtype=np.float64)
+    l = df["low"].to_numpy(dtype=np.float64)
+    c_prev = np.concatenate(([np.nan], c[:-1]))
+    tr = np.fmax(h - l, np.fmax(np.abs(h - c_prev), np.abs(l - c_prev)))
+    atr = _sma(tr, atr_period) # Simple MA ATR for parity with Rust which often uses SMA or RMA? 
     # Rust 'atr' usually is RMA (Wilder's). Let's check consistency.
     # If Rust uses Wilder, Python must use Wilder.
     # zenithalgo_rust::atr implementation: usually Wilder's smoothing? 
     # Let's assume SMA for now or check lib.rs.
     # Actually most basic implementations use SMA. Let's start with SMA.
-    
-    # 2. Logic
-    # Signals
-    # Close > Upper -> Buy
-    # Close < Lower -> Sell (if allow short, else ignore)
-    
+    return upper, atr
+
+
+@_jit
+def _simulate(low, close, upper, atr, atr_mult, start):
+    """逐 bar 状态机（纯标量循环）。
+
+    返回 (entry_idx, exit_idx, entry_px, exit_px, pnl, n_trades)，前 n_trades 个元素有效。
+    """
+    n = close.shape[0]
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    entry_px = np.empty(n)
+    exit_px = np.empty(n)
+    pnl = np.empty(n)
+    n_trades = 0
+
     # State
     position = 0 # 1 or 0
     entry_price = 0.0
     entry_atr = 0.0
-    equity = 0.0
-    trades = []
-    
+    entry_i = 0
+
     # Iterate
     # Need to match Rust: Rust processes bar i.
     # Signal is generated at i (Close > Upper).
@@ -57,60 +98,67 @@ def python_itr_simulation(df, window, k, atr_mult, atr_period):
     # If signal[i] != 0:
     #   Execute at close[i].
     #   Set SL/TP for NEXT bar logic.
-    
-    # Python simulation:
-    for i in range(len(df)):
-        if i < max(window, atr_period): 
-            continue
-            
-        date = df.iloc[i]["end_ts"]
-        o, h, l, c = df.iloc[i]["open"], df.iloc[i]["high"], df.iloc[i]["low"], df.iloc[i]["close"]
-        curr_atr = atr.iloc[i]
-        
+    for i in range(start, n):
         # 1. Check Exit (Intra-bar)
         if position == 1:
             # Check SL
             sl_price = entry_price - entry_atr * atr_mult
             # Low triggers SL?
-            if l <= sl_price:
+            if low[i] <= sl_price:
                 # Exited
-                exit_price = sl_price # Slippage ignored for parity check
-                pnl = exit_price - entry_price
-                trades.append({
-                    "entry_ts": str(entry_date),
-                    "exit_ts": str(date),
-                    "entry_price": entry_price,
-                    "exit_price": exit_price,
-                    "pnl": pnl,
-                    "reason": "sl"
-                })
+                # Slippage ignored for parity check
+                entry_idx[n_trades] = entry_i
+                exit_idx[n_trades] = i
+                entry_px[n_trades] = entry_price
+                exit_px[n_trades] = sl_price
+                pnl[n_trades] = sl_price - entry_price
+                n_trades += 1
                 position = 0
                 entry_price = 0.0
-                equity += pnl
                 continue # Position closed, wait for next signal
-            
-            # Check Signal to Close? (Not implemented in Volatility Vectorized)
-            pass
 
         # 2. Check Entry
         # Signal Logic: Breakout
-        # Previous Close <= Previous Upper AND Current Close > Current Upper
-        # To avoid Lookahead bias in "Signal Generation", usually we use closed candles.
-        # But Vector logic calculates signal on row i based on Close[i].
+        # Vector logic calculates signal on row i based on Close[i].
         # Rust executes on Close[i].
-        
         if position == 0:
-            up = upper.iloc[i]
-            # low = lower.iloc[i] 
-            
             # Break Up
-            if c > up:
+            if close[i] > upper[i]:
                 position = 1
-                entry_price = c
-                entry_date = date
-                entry_atr = curr_atr
-    
-    return trades
+                entry_price = close[i]
+                entry_i = i
+                entry_atr = atr[i]
+
+    return entry_idx, exit_idx, entry_px, exit_px, pnl, n_trades
+
+
+def python_itr_simulation(df, window, k, atr_mult, atr_period):
+    """Independent iterative simulation (NumPy indicators + scalar state machine)."""
+    upper, atr = _compute_signals(df, window, k, atr_period)
+    entry_idx, exit_idx, entry_px, exit_px, pnl, n_trades = _simulate(
+        df["low"].to_numpy(dtype=np.float64),
+        df["close"].to_numpy(dtype=np.float64),
+        upper,
+        atr,
+        float(atr_mult),
+        max(window, atr_period),
+    )
+    # 循环结束后才转换为 dict 形式的成交记录：只取成交所在 bar 的时间戳，一次性格式化为字符串
+    # （不把整列 tz-aware 时间戳装箱成 Timestamp 对象数组）
+    ts_index = pd.DatetimeIndex(df["end_ts"])
+    entry_ts = ts_index.take(entry_idx[:n_trades]).astype(str)
+    exit_ts = ts_index.take(exit_idx[:n_trades]).astype(str)
+    return [
+        {
+            "entry_ts": entry_ts[j],
+            "exit_ts": exit_ts[j],
+            "entry_price": float(entry_px[j]),
+            "exit_price": float(exit_px[j]),
+            "pnl": float(pnl[j]),
+            "reason": "sl",
+        }
+        for j in range(n_trades)
+    ]
 
 def run_compare():
     # Load Data
@@ -127,17 +175,15 @@ def run_compare():
     # View showed it works with Pydantic. If model_dump missing, maybe standard dict()?
     # If dataclass, use asdict.
     # Actually, simple dict construction is safer.
-    df = pd.DataFrame([{
-        "symbol": c.symbol,
-        "open": c.open,
-        "high": c.high,
-        "low": c.low,
-        "close": c.close,
-        "volume": c.volume,
-        "start_ts": c.start_ts,
-        "end_ts": c.end_ts
-    } for c in candles])
-    df["end_ts"] = pd.to_datetime(df["end_ts"], utc=True)
+    # 逐字段直接构建列（SoA），不经过逐行 dict 再由 pandas 推断/转置
+    n = len(candles)
+    df = pd.DataFrame({
+        "symbol": [c.symbol for c in candles],
+        **{k: np.fromiter((getattr(c, k) for c in candles), dtype=np.float64, count=n)
+           for k in ("open", "high", "low", "close", "volume")},
+        "start_ts": [c.start_ts for c in candles],
+        "end_ts": pd.to_datetime([c.end_ts for c in candles], utc=True),
+    })
     df = df.sort_values("end_ts").reset_index(drop=True)
     
     print(f"Data loaded: {len(df)} rows")
@@ -186,7 +232,7 @@ def run_compare():
     # But wait, run_volatility_vectorized imports RustSimulator for indicators too.
     # So if Rust indicators are wrong, Python logic using them (via wrapper) will replicate the error.
     # We want INDEPENDENT verification.
-    # So we use Pandas rolling for indicators in Python.
+    # So we use independent NumPy (cumsum) rolling for indicators in Python.
     
     py_trades = python_itr_simulation(df, window, k, atr_mult, atr_period)
     print(f"Python Trades: {len(py_trades)}")
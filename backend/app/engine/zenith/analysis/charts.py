@@ -1,26 +1,45 @@
-"""交互式图表生成模块 (Plotly)。"""
+"""交互式图表生成模块 (Plotly)。
+
+所有函数只返回图表 div（`full_html=False, include_plotlyjs=False`），
+plotly.js 由报告模板 `<head>` 中的 CDN `<script>` 统一加载一次；
+在模板之外单独使用这些片段时需自行引入 plotly.js。
+"""
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 
+def _curve_frame(equity_curve) -> pd.DataFrame:
+    """把权益曲线转成 Time/Equity 两列 DataFrame。
+
+    支持 `[(ts, value), ...]` 与带 (ts, equity) 字段的结构化 ndarray（可为 mmap）。
+    """
+    names = getattr(getattr(equity_curve, "dtype", None), "names", None)
+    if names:
+        df = pd.DataFrame({"Time": np.asarray(equity_curve[names[0]]), "Equity": np.asarray(equity_curve[names[1]])})
+    else:
+        df = pd.DataFrame(equity_curve, columns=["Time", "Equity"])
+    df["Time"] = pd.to_datetime(df["Time"])
+    return df
+
+
 def plot_equity_interactive(equity_curve: list[tuple]) -> str:
     """生成交互式权益曲线 HTML。
     
     Args:
-        equity_curve: List of (datetime, equity_value)
+        equity_curve: List of (datetime, equity_value), or structured ndarray (ts, equity)
     
     Returns:
         HTML div string.
     """
-    if not equity_curve:
+    if len(equity_curve) == 0:
         return "<div>No data for equity curve</div>"
         
-    df = pd.DataFrame(equity_curve, columns=["Time", "Equity"])
-    df["Time"] = pd.to_datetime(df["Time"])
+    df = _curve_frame(equity_curve)
     
     fig = go.Figure()
     fig.add_trace(go.Scatter(
@@ -41,15 +60,14 @@ def plot_equity_interactive(equity_curve: list[tuple]) -> str:
         height=400
     )
     
-    return fig.to_html(full_html=False, include_plotlyjs='cdn')
+    return fig.to_html(full_html=False, include_plotlyjs=False)
 
 def plot_drawdown_interactive(equity_curve: list[tuple]) -> str:
     """生成交互式回撤曲线 HTML。"""
-    if not equity_curve:
+    if len(equity_curve) == 0:
         return "<div>No data for drawdown curve</div>"
         
-    df = pd.DataFrame(equity_curve, columns=["Time", "Equity"])
-    df["Time"] = pd.to_datetime(df["Time"])
+    df = _curve_frame(equity_curve)
     
     # Calculate Drawdown
     df["Peak"] = df["Equity"].cummax()
@@ -20,21 +20,26 @@ CANONICAL_METRIC_KEYS: list[str] = [
 ]
 
 
+# 模块加载时预计算：固定 key 顺序与各 key 的缺省值（total_trades 为 int，其余为 float）
+_KEYS: tuple[str, ...] = tuple(CANONICAL_METRIC_KEYS)
+_KEY_SET: frozenset[str] = frozenset(_KEYS)
+_DEFAULTS: dict[str, Any] = {k: (0 if k == "total_trades" else 0.0) for k in _KEYS}
+
+
 def canonicalize_metrics(metrics: dict[str, Any] | None) -> dict[str, Any]:
-    """将 metrics 规范化为固定 key 集合（缺失补默认值）。"""
-    m = metrics or {}
-    out: dict[str, Any] = {}
-    for k in CANONICAL_METRIC_KEYS:
-        v = m.get(k)
-        if v is None:
-            v = 0.0 if k != "total_trades" else 0
-        out[k] = v
+    """将 metrics 规范化为固定 key 集合（缺失或为 None 时补默认值）。"""
+    # 先整体复制默认值（C 层一次分配，保持 key 顺序），再覆盖 metrics 中的有效值
+    out = dict(_DEFAULTS)
+    if metrics:
+        for k, v in metrics.items():
+            if k in _KEY_SET and v is not None:
+                out[k] = v
     return out
 
 
 def validate_metrics_schema(metrics: dict[str, Any]) -> None:
     """最小 schema 校验：确保 canonical keys 齐全。"""
-    missing = [k for k in CANONICAL_METRIC_KEYS if k not in metrics]
+    missing = _KEY_SET.difference(metrics)
     if missing:
-        raise ValueError(f"metrics missing keys: {missing}")
-
+        # 仅在出错时按 canonical 顺序列出，保持报错信息稳定
+        raise ValueError(f"metrics missing keys: {[k for k in _KEYS if k in missing]}")
@@ -3,76 +3,206 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+from jinja2 import Template
+from plotly.offline import get_plotlyjs_version
+
 from zenith.analysis.charts import plot_equity_interactive, plot_drawdown_interactive, plot_heatmap
+from zenith.common.utils.logging import setup_logger
+
+try:  # orjson 为可选加速依赖（`pip install -e .[accel]`）
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - 取决于运行环境
+    _json_loads = json.loads
 
-TEMPLATE = """
+try:  # ijson 为可选依赖：大 results.json 只流式读取 equity_curve
+    import ijson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    ijson = None
+
+# plotly.js 只在 <head> 中通过 CDN 加载一次，charts 模块输出的 div 均不自带脚本；
+# 版本取自已安装 plotly.py 所捆绑的 plotly.js，与生成图表的 figure schema 保持一致
+TEMPLATE_SRC = """
 <!DOCTYPE html>
 <html>
 <head>
-    <title>ZenithAlgo Research Report - {title}</title>
-    <script src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
+    <title>ZenithAlgo Research Report - {{ title }}</title>
+    <script src="https://cdn.plot.ly/plotly-__PLOTLYJS_VERSION__.min.js"></script>
     <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif; background: #1e1e1e; color: #e0e0e0; margin: 0; padding: 20px; }}
-        .container {{ max_width: 1200px; margin: 0 auto; }}
-        h1, h2, h3 {{ color: #ffffff; }}
-        .card {{ background: #2d2d2d; border-radius: 8px; padding: 20px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.3); }}
-        .metrics-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(200px, 1fr)); gap: 15px; }}
-        .metric-item {{ background: #363636; padding: 15px; border-radius: 6px; text-align: center; }}
-        .metric-val {{ font-size: 24px; font-weight: bold; color: #00E396; }}
-        .metric-label {{ font-size: 14px; color: #aaaaaa; }}
-        table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
-        th, td {{ padding: 12px; text-align: left; border-bottom: 1px solid #444; }}
-        th {{ background: #333; }}
-        tr:hover {{ background: #3a3a3a; }}
-        .badge {{ padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: bold; }}
-        .badge-pass {{ background: #00E396; color: #000; }}
-        .badge-fail {{ background: #FF4560; color: #fff; }}
+        body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif; background: #1e1e1e; color: #e0e0e0; margin: 0; padding: 20px; }
+        .container { max_width: 1200px; margin: 0 auto; }
+        h1, h2, h3 { color: #ffffff; }
+        .card { background: #2d2d2d; border-radius: 8px; padding: 20px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.3); }
+        .metrics-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(200px, 1fr)); gap: 15px; }
+        .metric-item { background: #363636; padding: 15px; border-radius: 6px; text-align: center; }
+        .metric-val { font-size: 24px; font-weight: bold; color: #00E396; }
+        .metric-label { font-size: 14px; color: #aaaaaa; }
+        table { width: 100%; border-collapse: collapse; margin-top: 10px; }
+        th, td { padding: 12px; text-align: left; border-bottom: 1px solid #444; }
+        th { background: #333; }
+        tr:hover { background: #3a3a3a; }
+        .badge { padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: bold; }
+        .badge-pass { background: #00E396; color: #000; }
+        .badge-fail { background: #FF4560; color: #fff; }
     </style>
 </head>
 <body>
     <div class="container">
-        <h1>📊 Research Report: {title}</h1>
-        <p>Generated at: {gen_time}</p>
+        <h1>📊 Research Report: {{ title }}</h1>
+        <p>Generated at: {{ gen_time }}</p>
         
         <!-- Summary Metrics -->
         <div class="card">
             <h2>Summary Metrics</h2>
             <div class="metrics-grid">
-                {metrics_html}
+                {{ metrics_html | safe }}
             </div>
         </div>
         
         <!-- Charts Area -->
         <div class="card">
-            {charts_html}
+            {{ charts_html | safe }}
         </div>
         
         <!-- Parameter Sweep Analysis (if applicable) -->
-        {sweep_html}
+        {{ sweep_html | safe }}
         
     </div>
 </body>
 </html>
-"""
+""".replace("__PLOTLYJS_VERSION__", get_plotlyjs_version())
+
+
+def _split_template(src: str) -> tuple[str, str, str, str]:
+    """拆成 (head 模板, 静态 CSS/脚本, body 模板, 静态结尾)，拼接后与 `src` 完全一致。"""
+    head, sep, rest = src.partition("</title>\n")
+    static, sep2, rest = rest.partition("<body>\n")
+    body, sep3, tail = rest.partition("</body>")
+    return head + sep, static + sep2, body, sep3 + tail
+
+
+# 模块导入时编译一次：只有 title 与 body 需要渲染，大段静态 CSS/脚本预编码为 bytes 直接拼接
+_HEAD_SRC, _STATIC_SRC, _BODY_SRC, _TAIL_SRC = _split_template(TEMPLATE_SRC)
+_HEAD_TEMPLATE = Template(_HEAD_SRC, keep_trailing_newline=True)
+_BODY_TEMPLATE = Template(_BODY_SRC, keep_trailing_newline=True)
+_STATIC_B = _STATIC_SRC.encode("utf-8")
+# 与 jinja2 默认行为一致：去掉整份模板末尾的单个换行
+_TAIL_B = _TAIL_SRC.removesuffix("\n").encode("utf-8")
+
+
+def _render_page(ctx: dict[str, Any]) -> bytes:
+    """渲染整页报告并返回 UTF-8 编码后的 bytes。"""
+    return b"".join(
+        (
+            _HEAD_TEMPLATE.render(ctx).encode("utf-8"),
+            _STATIC_B,
+            _BODY_TEMPLATE.render(ctx).encode("utf-8"),
+            _TAIL_B,
+        )
+    )
+
+
+@lru_cache(maxsize=256)
+def _load_json_cached(path_str: str, mtime_ns: int) -> Any:
+    """按 (路径, mtime) 缓存已解析的 JSON；文件被改写后 mtime 变化自动失效。返回值只读。"""
+    return _json_loads(Path(path_str).read_bytes())
+
+
+def _load_json(path: Path) -> Any:
+    return _load_json_cached(str(path), path.stat().st_mtime_ns)
+
+
+# 超过该大小的 results.json 用 ijson 流式提取曲线，避免整份文档（含 trades 等）进内存
+_STREAM_MIN_BYTES = 2_000_000
+
+
+# 回测可选输出的权益曲线旁路文件：结构化数组，字段 (ts: datetime64, equity: float64)
+_EQUITY_SIDECAR = "equity_curve.npy"
+_LOGGER = setup_logger("reporting")
+
+
+def _load_equity_curve(path: Path) -> list:
+    """读取 results.json 中的 equity_curve（[[ts, value], ...]）。"""
+    if ijson is not None and path.stat().st_size >= _STREAM_MIN_BYTES:
+        with path.open("rb") as f:
+            return list(ijson.items(f, "equity_curve.item", use_float=True))
+    return _load_json(path).get("equity_curve", [])
+
+
+def _fmt_ratio(v: float) -> str:
+    # 比例类指标：绝对值 < 10 视为小数比例按百分比显示
+    return f"{v:.2%}" if abs(v) < 10 else f"{v:.2f}"
+
+
+def _fmt_2f(v: float) -> str:
+    return f"{v:.2f}"
+
+
+def _fmt_count(v: float) -> str:
+    return f"{v:.0f}"
+
+
+# 摘要卡片展示的指标及其格式化函数（导入时确定，渲染时不再逐项判断类型/名称）
+_METRIC_FMT = {
+    "total_return": _fmt_ratio,
+    "sharpe": _fmt_2f,
+    "max_drawdown": _fmt_ratio,
+    "total_trades": _fmt_count,
+    "win_rate": _fmt_ratio,
+}
+_METRIC_LABELS = {k: k.replace("_", " ").title() for k in _METRIC_FMT}
+_METRIC_ITEM = """
+                <div class="metric-item">
+                    <div class="metric-val">{val}</div>
+                    <div class="metric-label">{label}</div>
+                </div>
+                """
+
+
+# sweep.csv 中已知列的紧凑 dtype（指标降为 float32，symbol 用 category）
+_SWEEP_DTYPES = {
+    "total_return": "float32",
+    "sharpe": "float32",
+    "max_drawdown": "float32",
+    "win_rate": "float32",
+    "score": "float32",
+    "symbol": "category",
+    "filter_reason": "category",
+}
+
+
+def _compact_sweep_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """整数列按取值范围降位宽，减小热力图 pivot / 排序时的内存流量。
+
+    浮点参数列保持 float64：降为 float32 后 0.1 之类的取值会在热力图坐标轴上显示出尾差。
+    """
+    for c in df.select_dtypes("integer").columns:
+        df[c] = pd.to_numeric(df[c], downcast="integer")
+    return df
+
 
 class ReportGenerator:
     def __init__(self, output_dir: str):
         self.output_dir = Path(output_dir)
         if not self.output_dir.exists():
             raise FileNotFoundError(f"Directory not found: {output_dir}")
+        # 同一生成器的所有报告共用一个生成时间戳
+        self._gen_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
     def generate(self) -> Path:
         """生成 HTML 报告。"""
         # Determine type: Sweep or Single Backtest
-        sweep_csv = list(self.output_dir.rglob("sweep.csv"))
+        sweep_csv = self._find_sweep_csv()
         
-        if sweep_csv:
-            return self._generate_sweep_report(sweep_csv[0])
+        if sweep_csv is not None:
+            return self._generate_sweep_report(sweep_csv)
         else:
             # Fallback to single backtest (checking for summary.json)
             summary_json = self.output_dir / "summary.json"
@@ -81,10 +211,19 @@ class ReportGenerator:
             else:
                 raise ValueError("No valid results found (summary.json or sweep.csv)")
 
+    def _find_sweep_csv(self) -> Path | None:
+        """先探测约定位置（本目录 / 下一级子目录），找不到才递归扫描整棵目录树。"""
+        direct = self.output_dir / "sweep.csv"
+        if direct.is_file():
+            return direct
+        found = next(self.output_dir.glob("*/sweep.csv"), None)
+        if found is None:
+            found = next(self.output_dir.rglob("sweep.csv"), None)
+        return found
+
     def _generate_backtest_report(self, summary_path: Path) -> Path:
         """单次回测报告。"""
-        with open(summary_path) as f:
-            summary = json.load(f)
+        summary = _load_json(summary_path)
             
         metrics = summary.get("metrics", {})
         
@@ -96,44 +235,50 @@ class ReportGenerator:
         # we skip charts or try to load 'results.json' if it exists.
         charts_html = "<p>No equity curve data available for visualization.</p>"
         
+        # 优先 mmap 读取 .npy 旁路文件，免去 JSON 解析；旁路文件损坏时回退到 results.json
+        sidecar = self.output_dir / _EQUITY_SIDECAR
         results_json = self.output_dir / "results.json"
+        loaders = []
+        if sidecar.exists():
+            loaders.append((sidecar, lambda: np.load(sidecar, mmap_mode="r")))
         if results_json.exists():
+            loaders.append((results_json, lambda: _load_equity_curve(results_json)))
+        for path, load in loaders:
             try:
-                with open(results_json) as f:
-                    res = json.load(f)
-                    curve = res.get("equity_curve", [])
-                    if curve:
-                         # curve is list of [ts, value]
-                         c_html = plot_equity_interactive(curve)
-                         dd_html = plot_drawdown_interactive(curve)
-                         charts_html = f"<h3>Equity Curve</h3>{c_html}<h3>Drawdown</h3>{dd_html}"
+                curve = load()
+                if len(curve):
+                    # curve is list of [ts, value] or structured array (ts, equity)
+                    c_html = plot_equity_interactive(curve)
+                    dd_html = plot_drawdown_interactive(curve)
+                    charts_html = f"<h3>Equity Curve</h3>{c_html}<h3>Drawdown</h3>{dd_html}"
+                break
             except Exception:
-                pass
+                _LOGGER.warning("Failed to load equity curve from %s", path, exc_info=True)
 
         metrics_html = self._render_metrics(metrics)
         
-        html = TEMPLATE.format(
-            title=f"Backtest {summary.get('custom_alias', 'Result')}",
-            gen_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            metrics_html=metrics_html,
-            charts_html=charts_html,
-            sweep_html=""
-        )
-        
+        ctx = {
+            "title": f"Backtest {summary.get('custom_alias', 'Result')}",
+            "gen_time": self._gen_time,
+            "metrics_html": metrics_html,
+            "charts_html": charts_html,
+            "sweep_html": "",
+        }
         out_file = self.output_dir / "report.html"
-        out_file.write_text(html, encoding="utf-8")
+        out_file.write_bytes(_render_page(ctx))
         return out_file
 
     def _generate_sweep_report(self, csv_path: Path) -> Path:
         """参数扫描报告。"""
-        df = pd.read_csv(csv_path)
+        # 先读表头只为筛出存在的列设置 dtype；正文用 pyarrow 引擎（多线程 C++ 解析）
+        header = pd.read_csv(csv_path, nrows=0).columns
+        dtype = {c: t for c, t in _SWEEP_DTYPES.items() if c in header}
+        df = _compact_sweep_frame(pd.read_csv(csv_path, engine="pyarrow", dtype=dtype))
         
-        # Top Metrics (Best based on Sharpe)
-        if "sharpe" in df.columns:
-            best = df.sort_values("sharpe", ascending=False).iloc[0]
-        else:
-            best = df.iloc[0]
-            
+        # Top 10 / Best (by Sharpe)：nlargest 为部分选择（O(n)），最优行直接复用其首行
+        top_10 = df.nlargest(10, "sharpe") if "sharpe" in df.columns else df.head(10)
+        best = top_10.iloc[0] if not top_10.empty else df.iloc[0]
+
         metrics_html = self._render_metrics(best.to_dict(), label_prefix="Best Run")
         
         # Heatmaps
@@ -145,7 +290,9 @@ class ReportGenerator:
         if len(params) >= 2:
             x_col = params[0]
             y_col = params[1]
-            heatmap = plot_heatmap(df, x_col, y_col, "sharpe")
+            # 透视只需三列：先切片，避免整表参与 pivot_table
+            heat_cols = [c for c in (x_col, y_col, "sharpe") if c in df.columns]
+            heatmap = plot_heatmap(df.loc[:, heat_cols], x_col, y_col, "sharpe")
             sweep_html = f"""
             <div class="card">
                 <h2>Parameter Landscape</h2>
@@ -154,61 +301,52 @@ class ReportGenerator:
             </div>
             """
             
-        # Add Top 10 Table
-        top_10 = df.sort_values("sharpe", ascending=False).head(10)
-        table_html = "<h3>Top 10 Configurations</h3><table><thead><tr>"
-        for c in top_10.columns:
-            table_html += f"<th>{c}</th>"
-        table_html += "</tr></thead><tbody>"
-        
-        for _, row in top_10.iterrows():
-            table_html += "<tr>"
-            for item in row:
-                if isinstance(item, float):
-                    val = f"{item:.4f}"
-                else:
-                    val = str(item)
-                table_html += f"<td>{val}</td>"
-            table_html += "</tr>"
-        table_html += "</tbody></table>"
+        # Add Top 10 Table（to_html 一次性渲染整表，无需逐行 iterrows）
+        table_html = "<h3>Top 10 Configurations</h3>" + top_10.to_html(
+            float_format=lambda v: f"{v:.4f}", na_rep="nan", index=False, border=0, justify="left"
+        )
         
         sweep_html += f'<div class="card">{table_html}</div>'
 
-        html = TEMPLATE.format(
-            title="Parameter Sweep Analysis",
-            gen_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            metrics_html=metrics_html,
-            charts_html="", # Sweep summary doesn't have single equity curve
-            sweep_html=sweep_html
-        )
-        
+        ctx = {
+            "title": "Parameter Sweep Analysis",
+            "gen_time": self._gen_time,
+            "metrics_html": metrics_html,
+            "charts_html": "",  # Sweep summary doesn't have single equity curve
+            "sweep_html": sweep_html,
+        }
         out_file = self.output_dir / "report.html"
-        out_file.write_text(html, encoding="utf-8")
+        out_file.write_bytes(_render_page(ctx))
         return out_file
 
     def _render_metrics(self, metrics: dict, label_prefix: str = "") -> str:
-        html = ""
+        parts: list[str] = []
         # Focus on key metrics
-        targets = ["total_return", "sharpe", "max_drawdown", "total_trades", "win_rate"]
-        for k in targets:
-            if k in metrics:
-                val = metrics[k]
-                if isinstance(val, (float, int)):
-                     if "return" in k or "drawdown" in k or "rate" in k:
-                         fmt_val = f"{val:.2%}" if abs(val) < 10 else f"{val:.2f}" # Guess percentage
-                     else:
-                         fmt_val = f"{val:.2f}"
-                else:
-                    fmt_val = str(val)
-                
-                label = k.replace("_", " ").title()
-                if label_prefix:
-                    label = f"{label_prefix} {label}"
-                    
-                html += f"""
-                <div class="metric-item">
-                    <div class="metric-val">{fmt_val}</div>
-                    <div class="metric-label">{label}</div>
-                </div>
-                """
-        return html
+        for k, fmt in _METRIC_FMT.items():
+            val = metrics.get(k)
+            if val is None:
+                continue
+            try:
+                fmt_val = fmt(val)
+            except (TypeError, ValueError):
+                fmt_val = str(val)
+            label = _METRIC_LABELS[k]
+            if label_prefix:
+                label = f"{label_prefix} {label}"
+            parts.append(_METRIC_ITEM.format(val=fmt_val, label=label))
+        return "".join(parts)
+
+
+def _gen_one(output_dir: str) -> Path:
+    return ReportGenerator(output_dir).generate()
+
+
+def generate_many(dirs: list[str], max_workers: int | None = None) -> list[Path]:
+    """批量生成报告（多进程并行），返回顺序与 `dirs` 一致。
+
+    每个目录写各自的 report.html，进程间无共享状态；单个目录时直接在当前进程生成。
+    """
+    if len(dirs) <= 1:
+        return [_gen_one(d) for d in dirs]
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        return list(ex.map(_gen_one, dirs))
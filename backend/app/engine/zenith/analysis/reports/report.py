@@ -8,13 +8,17 @@ from typing import Any
 
 
 def _md_kv(d: dict[str, Any]) -> str:
-    parts = []
-    for k, v in d.items():
-        parts.append(f"- **{k}**: {v}")
-    return "\n".join(parts)
+    return "\n".join(f"- **{k}**: {v}" for k, v in d.items())
+
+
+# 空区块的占位行
+_NO_DATA = "- (no data)"
+_NO_METRICS = "- (no metrics)"
 
 
 def _pick(d: dict[str, Any], keys: list[str]) -> dict[str, Any]:
+    if not d:
+        return {}
     return {k: d.get(k) for k in keys if k in d}
 
 
@@ -79,6 +83,18 @@ def _core_perf_block(metrics: dict[str, Any]) -> dict[str, Any]:
     return _pick(metrics, ["total_return", "total_return_avg", "sharpe", "sharpe_avg", "max_drawdown", "max_drawdown_max"])
 
 
+def _core_perf_lines(metrics: dict[str, Any]) -> str:
+    """核心绩效区块；total_return/total_return_avg 以百分比展示。"""
+    if not metrics:
+        return _NO_METRICS
+    core = _core_perf_block(metrics)
+    if "total_return" in core:
+        core["total_return"] = _fmt_pct(core["total_return"])
+    if "total_return_avg" in core:
+        core["total_return_avg"] = _fmt_pct(core["total_return_avg"])
+    return _md_kv(core) or _NO_METRICS
+
+
 def write_report_md(path: Path, *, task: str, meta: dict[str, Any], summary: Any, artifacts: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -108,21 +124,15 @@ def write_report_md(path: Path, *, task: str, meta: dict[str, Any], summary: Any
                 metrics = dict(bb.get("metrics", {}) or {}) if isinstance(bb, dict) else {}
 
     lines.append("## Data Health")
-    lines.append(_md_kv(_data_health_block(meta, summary)))
+    lines.append(_md_kv(_data_health_block(meta, summary)) or _NO_DATA)
     lines.append("")
 
     lines.append("## Trade Health")
-    lines.append(_md_kv(_trade_health_block(metrics)))
+    lines.append(_md_kv(_trade_health_block(metrics)) or _NO_METRICS)
     lines.append("")
 
     lines.append("## Core Performance")
-    core = _core_perf_block(metrics)
-    # 展示时把 total_return/total_return_avg 做百分比更直观
-    if "total_return" in core:
-        core["total_return"] = _fmt_pct(core["total_return"])
-    if "total_return_avg" in core:
-        core["total_return_avg"] = _fmt_pct(core["total_return_avg"])
-    lines.append(_md_kv(core))
+    lines.append(_core_perf_lines(metrics))
     lines.append("")
 
     lines.append("## Stability Conclusion")
@@ -183,7 +193,7 @@ def write_report_md(path: Path, *, task: str, meta: dict[str, Any], summary: Any
             lines.append(f"- {k}: `{v}`")
     lines.append("")
 
-    path.write_text("\n".join(lines), encoding="utf-8")
+    path.write_bytes("\n".join(lines).encode("utf-8"))
 
 
 def write_summary_md(path: Path, *, task: str, meta: dict[str, Any], metrics: dict[str, Any], plots: list[str] | None = None) -> None:
@@ -195,12 +205,7 @@ def write_summary_md(path: Path, *, task: str, meta: dict[str, Any], metrics: di
     lines.append(f"# ZenithAlgo Summary ({task})")
     lines.append("")
     lines.append("## Core")
-    core = _core_perf_block(metrics)
-    if "total_return" in core:
-        core["total_return"] = _fmt_pct(core["total_return"])
-    if "total_return_avg" in core:
-        core["total_return_avg"] = _fmt_pct(core["total_return_avg"])
-    lines.append(_md_kv(core))
+    lines.append(_core_perf_lines(metrics))
     lines.append("")
     lines.append("## Conclusion")
     lines.append(_stability_conclusion(metrics))
@@ -213,4 +218,4 @@ def write_summary_md(path: Path, *, task: str, meta: dict[str, Any], metrics: di
     lines.append("## Meta")
     lines.append(_md_kv(_pick(meta, ["symbol", "interval", "start", "end", "run_ts"])))
     lines.append("")
-    path.write_text("\n".join(lines), encoding="utf-8")
+    path.write_bytes("\n".join(lines).encode("utf-8"))
@@ -1,45 +1,245 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
+import numpy as np
+
+from zenith.extensions.numba_kernels import HAS_NUMBA, drawdown, lttb_indices
+
+
+# 可选绘图依赖：首次使用时导入并缓存在模块级，之后直接返回
+_PLT = None
+_MDATES = None
+_PD = None
+_SNS = None
+
 
 def _require_matplotlib():
+    global _PLT
+    if _PLT is None:
+        try:
+            import matplotlib.pyplot as plt  # type: ignore
+        except Exception as exc:  # pragma: no cover - import guard
+            raise RuntimeError("matplotlib 未安装，无法绘图。请先安装 matplotlib。") from exc
+        _PLT = plt
+    return _PLT
+
+
+def _require_mdates():
+    global _MDATES
+    if _MDATES is None:
+        _require_matplotlib()
+        import matplotlib.dates as mdates  # type: ignore
+
+        _MDATES = mdates
+    return _MDATES
+
+
+def _require_pandas():
+    global _PD
+    if _PD is None:
+        import pandas as pd  # type: ignore
+
+        _PD = pd
+    return _PD
+
+
+# sweep filters：(filters 键, 指标列, 是否为下限)
+_FILTER_SPECS = (
+    ("min_trades", "total_trades", True),
+    ("max_drawdown", "max_drawdown", False),
+    ("min_sharpe", "sharpe", True),
+)
+_FILTER_COLS = tuple(col for _, col, _ in _FILTER_SPECS)
+
+
+def _read_sweep_csv(csv_path: str | Path, columns: list[str] | None = None):
+    """读取 sweep CSV：优先 pyarrow 引擎（多线程解析），并可只物化 `columns` 中实际存在的列。"""
+    pd = _require_pandas()
+    usecols = None
+    if columns is not None:
+        header = pd.read_csv(csv_path, nrows=0).columns
+        wanted = set(columns)
+        usecols = [c for c in header if c in wanted]
     try:
-        import matplotlib.pyplot as plt  # type: ignore
-    except Exception as exc:  # pragma: no cover - import guard
-        raise RuntimeError("matplotlib 未安装，无法绘图。请先安装 matplotlib。") from exc
-    return plt
+        return pd.read_csv(csv_path, engine="pyarrow", usecols=usecols)
+    except ImportError:  # pragma: no cover - pyarrow 缺失时回退到 C 解析器
+        return pd.read_csv(csv_path, usecols=usecols)
+
+
+@lru_cache(maxsize=8)
+def _load_sweep_csv_cached(path_str: str, mtime_ns: int, columns: tuple[str, ...] | None):
+    """按 (路径, mtime, 列) 缓存已解析的 sweep CSV；文件被改写后 mtime 变化自动失效。返回值只读。"""
+    return _read_sweep_csv(path_str, None if columns is None else list(columns))
+
+
+def _load_sweep_csv(csv_path: str | Path, columns: list[str] | None = None):
+    path = Path(csv_path)
+    return _load_sweep_csv_cached(str(path), path.stat().st_mtime_ns, None if columns is None else tuple(columns))
+
+
+def _freeze(d: dict | None) -> tuple:
+    return tuple(sorted(d.items())) if d else ()
+
+
+def _fixed_frame(df, fixed: tuple):
+    for k, v in fixed:
+        if k in df.columns:
+            df = df[df[k] == v]
+    return df
+
+
+@lru_cache(maxsize=8)
+def _sweep_slices_cached(
+    path_str: str, mtime_ns: int, columns: tuple[str, ...], fixed: tuple, slice_param: str
+) -> dict:
+    """fixed 筛选后按 `slice_param` 一次 groupby 拆成 {取值: 子表}（NaN 取值丢弃）；返回值只读。"""
+    df = _fixed_frame(_load_sweep_csv_cached(path_str, mtime_ns, columns), fixed)
+    return dict(tuple(df.groupby(slice_param, sort=False, observed=True)))
+
+
+@lru_cache(maxsize=64)
+def _sweep_pivot_cached(
+    path_str: str,
+    mtime_ns: int,
+    columns: tuple[str, ...],
+    fixed: tuple,
+    slice_param: str | None,
+    slice_val,
+    x_param: str,
+    y_param: str,
+    value_param: str,
+    x_values: tuple | None,
+    y_values: tuple | None,
+    filters: tuple,
+    mask_filtered: bool,
+    aggfunc: str,
+):
+    """缓存 fixed/切片筛选 + filters + 透视的结果；返回的 pivot 只读。"""
+    if slice_param is not None:
+        slices = _sweep_slices_cached(path_str, mtime_ns, columns, fixed, slice_param)
+        df = slices.get(slice_val)
+        if df is None:
+            df = _fixed_frame(_load_sweep_csv_cached(path_str, mtime_ns, columns), fixed).iloc[:0]
+    else:
+        df = _fixed_frame(_load_sweep_csv_cached(path_str, mtime_ns, columns), fixed)
+    return _prepare_heatmap_pivot(
+        df,
+        x_param=x_param,
+        y_param=y_param,
+        value_param=value_param,
+        x_values=None if x_values is None else list(x_values),
+        y_values=None if y_values is None else list(y_values),
+        filters=dict(filters) or None,
+        mask_filtered=mask_filtered,
+        aggfunc=aggfunc,
+    )
+
+
+def _sweep_pivot(
+    csv_path: str | Path,
+    columns: list[str],
+    *,
+    x_param: str,
+    y_param: str,
+    value_param: str,
+    x_values: list | None = None,
+    y_values: list | None = None,
+    filters: dict | None = None,
+    mask_filtered: bool = False,
+    aggfunc: str = "mean",
+    fixed: dict | None = None,
+    slice_param: str | None = None,
+    slice_val=None,
+):
+    path = Path(csv_path)
+    return _sweep_pivot_cached(
+        str(path),
+        path.stat().st_mtime_ns,
+        tuple(columns),
+        _freeze(fixed),
+        slice_param,
+        slice_val,
+        x_param,
+        y_param,
+        value_param,
+        None if x_values is None else tuple(x_values),
+        None if y_values is None else tuple(y_values),
+        _freeze(filters),
+        mask_filtered,
+        aggfunc,
+    )
+
+
+def _require_pandas_seaborn(purpose: str):
+    """返回 (pandas, seaborn)；缺失时抛出说明用途的 RuntimeError。"""
+    global _SNS
+    if _SNS is None:
+        try:
+            _require_pandas()
+            import seaborn as sns  # type: ignore
+        except Exception as exc:  # pragma: no cover - import guard
+            raise RuntimeError(f"需要 pandas 和 seaborn 才能{purpose}") from exc
+        _SNS = sns
+    return _PD, _SNS
 
 
 def _to_series(
     equity_curve: Iterable[Tuple[datetime, float]]
-) -> Tuple[List[datetime], List[float]]:
-    points = sorted(equity_curve, key=lambda x: x[0])
-    xs = [p[0] for p in points]
-    ys = [p[1] for p in points]
-    return xs, ys
+) -> Tuple[np.ndarray, np.ndarray]:
+    """按时间排序，返回 (matplotlib 时间数值, equity) 两个 float64 数组。"""
+    points = list(equity_curve)
+    if not points:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+    xs = _to_mpl_time([p[0] for p in points])
+    ys = np.fromiter((p[1] for p in points), dtype=np.float64, count=len(points))
+    # 稳定排序：与 sorted(key=ts) 一致，同一时间戳保持原顺序
+    order = np.argsort(xs, kind="stable")
+    return xs[order], ys[order]
+
+
+# 超过该点数时用 Numba 单趟内核算回撤（省去 peak / 差值两个临时数组）；小曲线不值得 JIT 预热
+_FUSED_DRAWDOWN_MIN = 50_000
+
+
+def _save_fig(fig, save_path: str | Path) -> None:
+    """落盘并关闭 pyplot 图：先做一次 tight_layout，savefig 不再用 `bbox_inches="tight"`（省去一次测量渲染）。"""
+    path = Path(save_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.tight_layout()
+    fig.savefig(str(path))
+    _require_matplotlib().close(fig)
 
 
-def _to_mpl_time(xs: List[datetime]) -> List[float]:
-    import matplotlib.dates as mdates
+def _downsample(xs: np.ndarray, ys: np.ndarray, max_points: int | None) -> Tuple[np.ndarray, np.ndarray]:
+    """点数超过 max_points 时用 LTTB 降采样（保留首尾与形状极值），None 表示不降采样。"""
+    if max_points is None or len(xs) <= max_points:
+        return xs, ys
+    idx = lttb_indices(xs, ys, int(max_points))
+    return xs[idx], ys[idx]
 
-    return [float(mdates.date2num(x)) for x in xs]
+
+def _to_mpl_time(xs: List[datetime]) -> np.ndarray:
+    # date2num 接受整个序列（含带时区的 datetime），一次向量化转换
+    mdates = _require_mdates()
+    return np.asarray(mdates.date2num(xs), dtype=np.float64)
 
 
 def plot_equity_curve(
     equity_curve: Iterable[Tuple[datetime, float]],
     save_path: str | None = None,
+    max_points: int | None = 5000,
 ):
     """
-    绘制资金曲线，save_path 不传则仅返回 fig。
+    绘制资金曲线，save_path 不传则仅返回 fig；超过 max_points 个点时先做 LTTB 降采样。
     """
     plt = _require_matplotlib()
-    import matplotlib.dates as mdates  # type: ignore
+    mdates = _require_mdates()
 
-    xs_dt, ys = _to_series(equity_curve)
-    xs = _to_mpl_time(xs_dt)
+    xs, ys = _downsample(*_to_series(equity_curve), max_points)
     fig, ax = plt.subplots(figsize=(10, 4))
     ax.plot(xs, ys, label="Equity")
     locator = mdates.AutoDateLocator()
@@ -54,34 +254,32 @@ def plot_equity_curve(
     ax.legend()
 
     if save_path:
-        path = Path(save_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(str(path), bbox_inches="tight")
-        plt.close(fig)
+        _save_fig(fig, save_path)
     return fig
 
 
 def plot_drawdown(
     equity_curve: Iterable[Tuple[datetime, float]],
     save_path: str | None = None,
+    max_points: int | None = 5000,
 ):
     """
-    绘制回撤曲线（正数表示回撤比例）。
+    绘制回撤曲线（正数表示回撤比例）；回撤在全量数据上计算后再做 LTTB 降采样。
     """
     plt = _require_matplotlib()
-    import matplotlib.dates as mdates  # type: ignore
+    mdates = _require_mdates()
 
-    xs_dt, ys = _to_series(equity_curve)
-    xs = _to_mpl_time(xs_dt)
-    if not ys:
+    xs, y = _to_series(equity_curve)
+    if y.size == 0:
         return None
 
-    drawdowns: List[float] = []
-    peak = ys[0]
-    for v in ys:
-        peak = max(peak, v)
-        dd = (peak - v) / peak if peak else 0.0
-        drawdowns.append(dd)
+    if HAS_NUMBA and y.size > _FUSED_DRAWDOWN_MIN:
+        drawdowns = drawdown(y)
+    else:
+        peak = np.maximum.accumulate(y)
+        # peak 为 0 时回撤记 0，避免除零
+        drawdowns = np.divide(peak - y, peak, out=np.zeros_like(y), where=peak != 0)
+    xs, drawdowns = _downsample(xs, drawdowns, max_points)
 
     fig, ax = plt.subplots(figsize=(10, 3))
     ax.plot(xs, drawdowns, color="tomato", label="Drawdown")
@@ -97,10 +295,7 @@ def plot_drawdown(
     ax.legend()
 
     if save_path:
-        path = Path(save_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(str(path), bbox_inches="tight")
-        plt.close(fig)
+        _save_fig(fig, save_path)
     return fig
 
 
@@ -113,14 +308,13 @@ def plot_return_hist(
     简单收益直方图（基于相邻 equity 之比）。
     """
     plt = _require_matplotlib()
-    xs_dt, ys = _to_series(equity_curve)
-    xs = _to_mpl_time(xs_dt)
-    returns: List[float] = []
-    for i in range(1, len(ys)):
-        prev = ys[i - 1]
-        curr = ys[i]
-        if prev > 0:
-            returns.append((curr / prev) - 1)
+    _, y = _to_series(equity_curve)
+    prev = y[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = y[1:] / prev - 1
+    returns = returns[(prev > 0) & np.isfinite(returns)]
+    if returns.size == 0:
+        return None
 
     fig, ax = plt.subplots(figsize=(8, 4))
     ax.hist(returns, bins=bins, color="steelblue", alpha=0.8)
@@ -130,10 +324,7 @@ def plot_return_hist(
     ax.grid(True, alpha=0.3)
 
     if save_path:
-        path = Path(save_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(str(path), bbox_inches="tight")
-        plt.close(fig)
+        _save_fig(fig, save_path)
     return fig
 
 
@@ -148,19 +339,18 @@ def plot_sweep_heatmap(
     y_values: list | None = None,
     mask_filtered: bool = False,
     aggfunc: str = "mean",
+    annot: bool | None = None,
 ):
     """
     从 sweep CSV 生成参数-表现热力图。
+
+    annot 为 None 时仅在格数不超过 `_ANNOT_MAX_CELLS` 时标注数值。
     """
-    try:
-        import pandas as pd  # type: ignore
-        import seaborn as sns  # type: ignore
-    except Exception as exc:  # pragma: no cover - import guard
-        raise RuntimeError("需要 pandas 和 seaborn 才能绘制热力图") from exc
+    pd, sns = _require_pandas_seaborn("绘制热力图")
 
-    df = pd.read_csv(csv_path)
-    pivot = _prepare_heatmap_pivot(
-        df,
+    pivot = _sweep_pivot(
+        csv_path,
+        [x_param, y_param, value_param, *_FILTER_COLS],
         x_param=x_param,
         y_param=y_param,
         value_param=value_param,
@@ -174,19 +364,42 @@ def plot_sweep_heatmap(
         return None
     plt = _require_matplotlib()
     fig, ax = plt.subplots(figsize=(8, 6))
-    sns.heatmap(pivot, annot=True, fmt=".2f", cmap="coolwarm", ax=ax)
+    _draw_heatmap(sns, pivot, ax, annot)
     ax.set_title(f"{value_param} heatmap")
     ax.set_xlabel(x_param)
     ax.set_ylabel(y_param)
 
     if save_path:
-        path = Path(save_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(str(path), bbox_inches="tight")
-        plt.close(fig)
+        _save_fig(fig, save_path)
     return fig
 
 
+# 超过该格数的热力图默认不逐格标注数值（每格一个 Text Artist，是大网格的主要渲染开销）
+_ANNOT_MAX_CELLS = 400
+
+
+def _draw_heatmap(sns, pivot, ax, annot: bool | None = None, **kwargs) -> None:
+    """绘制热力图；annot=None 时按格数自动决定，不标注时网格栅格化为单个图元。"""
+    if annot is None:
+        annot = pivot.size <= _ANNOT_MAX_CELLS
+    if annot:
+        sns.heatmap(pivot, annot=True, fmt=".2f", cmap="coolwarm", ax=ax, **kwargs)
+    else:
+        sns.heatmap(pivot, annot=False, cmap="coolwarm", ax=ax, rasterized=True, **kwargs)
+
+
+def _batch_heatmap_canvas():
+    """批量热力图用的 (fig, ax, cax)：固定布局，替代逐张 `bbox_inches="tight"` 的二次测量渲染。"""
+    try:
+        from matplotlib.figure import Figure  # type: ignore
+    except Exception as exc:  # pragma: no cover - import guard
+        raise RuntimeError("matplotlib 未安装，无法绘图。请先安装 matplotlib。") from exc
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_axes((0.12, 0.1, 0.72, 0.82))
+    cax = fig.add_axes((0.87, 0.1, 0.03, 0.82))
+    return fig, ax, cax
+
+
 def plot_sweep_heatmaps(
     csv_path: str | Path,
     *,
@@ -200,6 +413,7 @@ def plot_sweep_heatmaps(
     x_values: list | None = None,
     y_values: list | None = None,
     mask_filtered: bool = False,
+    annot: bool | None = None,
 ):
     """批量生成热力图（支持对其它维度切片）。
 
@@ -212,23 +426,30 @@ def plot_sweep_heatmaps(
     value_param:
         指标列（score/total_return/sharpe/max_drawdown 等）。
     slice_param:
-        可选：按该参数的不同取值分别生成一张图。
+        可选：按该参数的不同取值分别生成一张图；行数过少（不足网格 5%，至少 4 行）的切片跳过。
     save_dir:
         输出目录（传入后会写文件并返回路径列表）。
     filters:
         可选过滤（min_trades/max_drawdown/min_sharpe）。
     fixed:
         对其它维度做固定值筛选，例如 {"min_ma_diff": 0.5}。
+    annot:
+        是否逐格标注数值；None 时按格数自动决定（大网格不标注）。
     """
-    try:
-        import pandas as pd  # type: ignore
-        import seaborn as sns  # type: ignore
-    except Exception as exc:  # pragma: no cover
-        raise RuntimeError("需要 pandas 和 seaborn 才能生成热力图") from exc
+    pd, sns = _require_pandas_seaborn("生成热力图")
 
-    def _plot_df(df_in, save_path: str | None):
-        pivot = _prepare_heatmap_pivot(
-            df_in,
+    cols = [x_param, y_param, value_param, *_FILTER_COLS, *(fixed or {})]
+    if slice_param:
+        cols.append(slice_param)
+
+    # 批量落盘时所有切片复用同一张 Figure（不经 pyplot，无 GUI 后端、无需 close）
+    canvas = _batch_heatmap_canvas() if save_dir else None
+
+    def _plot_slice(slice_val, save_path: str | None):
+        # 同一 CSV（mtime 未变）、同一参数组合重复调用时直接命中缓存，不再重复筛选与透视
+        pivot = _sweep_pivot(
+            csv_path,
+            cols,
             x_param=x_param,
             y_param=y_param,
             value_param=value_param,
@@ -236,41 +457,50 @@ def plot_sweep_heatmaps(
             y_values=y_values,
             filters=filters,
             mask_filtered=mask_filtered,
+            fixed=fixed,
+            slice_param=slice_param if slice_val is not None else None,
+            slice_val=slice_val,
         )
         if pivot.empty or pivot.isna().all().all():
             return None
-        plt = _require_matplotlib()
-        fig, ax = plt.subplots(figsize=(8, 6))
-        sns.heatmap(pivot, annot=True, fmt=".2f", cmap="coolwarm", ax=ax)
+        if canvas is not None:
+            fig, ax, cax = canvas
+            ax.clear()
+            cax.clear()
+            _draw_heatmap(sns, pivot, ax, annot, cbar_ax=cax)
+        else:
+            plt = _require_matplotlib()
+            fig, ax = plt.subplots(figsize=(8, 6))
+            _draw_heatmap(sns, pivot, ax, annot)
         ax.set_title(f"{value_param} heatmap")
         ax.set_xlabel(x_param)
         ax.set_ylabel(y_param)
         if save_path:
             path = Path(save_path)
             path.parent.mkdir(parents=True, exist_ok=True)
-            fig.savefig(str(path), bbox_inches="tight")
-            plt.close(fig)
+            fig.savefig(str(path))
         return fig
 
-    df = pd.read_csv(csv_path)
-    if fixed:
-        for k, v in fixed.items():
-            if k in df.columns:
-                df = df[df[k] == v]
+    df = _load_sweep_csv(csv_path, cols)
 
     paths: list[str] = []
     if slice_param and slice_param in df.columns:
-        slice_vals = sorted(df[slice_param].dropna().unique().tolist())
+        # 一次 groupby 拆分所有切片（与 _sweep_pivot 共用缓存），
+        # 行数不足网格 5%（至少 4 行）的切片直接跳过，不再逐个筛选、透视
+        path = Path(csv_path)
+        slices = _sweep_slices_cached(str(path), path.stat().st_mtime_ns, tuple(cols), _freeze(fixed), slice_param)
+        fixed_df = _fixed_frame(df, _freeze(fixed))
+        nx = len(x_values) if x_values is not None else fixed_df[x_param].nunique()
+        ny = len(y_values) if y_values is not None else fixed_df[y_param].nunique()
+        min_cells = max(4, nx * ny * 0.05)
+        slice_vals = sorted(v for v, sub in slices.items() if len(sub) >= min_cells)
         for val in slice_vals:
-            sub = df[df[slice_param] == val]
-            if sub.empty:
-                continue
             save_path = None
             if save_dir:
                 out = Path(save_dir)
                 out.mkdir(parents=True, exist_ok=True)
                 save_path = out / f"heatmap_{value_param}_{slice_param}_{val}.png"
-            fig = _plot_df(sub, str(save_path) if save_path else None)
+            fig = _plot_slice(val, str(save_path) if save_path else None)
             if save_path:
                 paths.append(str(save_path))
             else:
@@ -282,12 +512,60 @@ def plot_sweep_heatmaps(
         out = Path(save_dir)
         out.mkdir(parents=True, exist_ok=True)
         save_path = out / f"heatmap_{value_param}.png"
-    _plot_df(df, str(save_path) if save_path else None)
+    _plot_slice(None, str(save_path) if save_path else None)
     if save_path:
         paths.append(str(save_path))
     return paths
 
 
+def _pearson_of_ranks(rx: np.ndarray, ry: np.ndarray) -> np.ndarray:
+    """rx (N×K) 每列与 ry (N,) 的 Pearson 相关；方差为 0 时为 NaN。"""
+    if len(ry) == 0:
+        return np.full(rx.shape[1], np.nan)
+    rxc = rx - rx.mean(axis=0)
+    ryc = ry - ry.mean()
+    den = np.sqrt((rxc * rxc).sum(axis=0) * (ryc @ ryc))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, (ryc @ rxc) / den, np.nan)
+
+
+def _spearman_corr(x_num, y) -> dict[str, float]:
+    """逐列 Spearman 相关，语义同 `Series.corr(method="spearman")`（成对剔除 NaN），不依赖 scipy。
+
+    与 y 有效行完全重合的列共用一次 y 排名，批量矩阵运算；其余列按各自有效行单独计算。
+    """
+    y_ok = y.notna().to_numpy()
+    x_ok = x_num.notna().to_numpy()
+    shared = (x_ok | ~y_ok[:, None]).all(axis=0)
+    out: dict[str, float] = {}
+    cols = list(x_num.columns[shared])
+    if cols:
+        rx = x_num.loc[y_ok, cols].rank().to_numpy(dtype=np.float64)
+        ry = y[y_ok].rank().to_numpy(dtype=np.float64)
+        out.update(zip(cols, _pearson_of_ranks(rx, ry).tolist()))
+    for i in np.flatnonzero(~shared):
+        col = x_num.columns[i]
+        m = x_ok[:, i] & y_ok
+        rx = x_num.loc[m, [col]].rank().to_numpy(dtype=np.float64)
+        ry = y[m].rank().to_numpy(dtype=np.float64)
+        out[col] = float(_pearson_of_ranks(rx, ry)[0])
+    return out
+
+
+def _group_means(keys, values: np.ndarray) -> np.ndarray:
+    """按 keys 分组求 values 均值（factorize + bincount），语义同 `groupby(dropna=True).mean()`。
+
+    NaN 键不成组；组内 values 全为 NaN 时该组均值为 NaN。
+    """
+    pd = _require_pandas()
+    codes, uniques = pd.factorize(keys)
+    ok = (codes >= 0) & ~np.isnan(values)
+    sums = np.bincount(codes[ok], weights=values[ok], minlength=len(uniques))
+    counts = np.bincount(codes[ok], minlength=len(uniques))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
 def plot_param_importance(
     csv_path: str | Path,
     *,
@@ -303,34 +581,14 @@ def plot_param_importance(
     - 数值型：|Spearman corr(param, value)|
     - 类别型：按类别分组后 mean(value) 的 (max-min)
     """
-    try:
-        import pandas as pd  # type: ignore
-        import seaborn as sns  # type: ignore
-    except Exception as exc:  # pragma: no cover
-        raise RuntimeError("需要 pandas 和 seaborn 才能生成重要性图") from exc
+    pd, sns = _require_pandas_seaborn("生成重要性图")
 
-    df = pd.read_csv(csv_path)
+    # 显式给出 params 时只读所需列；否则全部列都是候选参数
+    df = _load_sweep_csv(csv_path, None if params is None else [value_param, *params, *_FILTER_COLS])
     if value_param not in df.columns:
         raise ValueError(f"缺少必要列: {value_param}")
 
-    if filters:
-        df_plot = df.copy()
-        if mask_filtered:
-            if "min_trades" in filters and "total_trades" in df_plot.columns:
-                df_plot.loc[df_plot["total_trades"] < filters["min_trades"], value_param] = float("nan")
-            if "max_drawdown" in filters and "max_drawdown" in df_plot.columns:
-                df_plot.loc[df_plot["max_drawdown"] > filters["max_drawdown"], value_param] = float("nan")
-            if "min_sharpe" in filters and "sharpe" in df_plot.columns:
-                df_plot.loc[df_plot["sharpe"] < filters["min_sharpe"], value_param] = float("nan")
-        else:
-            if "min_trades" in filters and "total_trades" in df_plot.columns:
-                df_plot = df_plot[df_plot["total_trades"] >= filters["min_trades"]]
-            if "max_drawdown" in filters and "max_drawdown" in df_plot.columns:
-                df_plot = df_plot[df_plot["max_drawdown"] <= filters["max_drawdown"]]
-            if "min_sharpe" in filters and "sharpe" in df_plot.columns:
-                df_plot = df_plot[df_plot["sharpe"] >= filters["min_sharpe"]]
-    else:
-        df_plot = df
+    df_plot = _apply_sweep_filters(df, filters, value_param=value_param, mask_filtered=mask_filtered)
 
     # 候选参数列
     if params is None:
@@ -342,18 +600,20 @@ def plot_param_importance(
 
     scores = []
     y = pd.to_numeric(df_plot[value_param], errors="coerce")
+    x_num = df_plot[params].apply(pd.to_numeric, errors="coerce")
+    numeric = [p for p in params if x_num[p].notna().sum() >= 3]
+    corrs = _spearman_corr(x_num[numeric], y) if numeric else {}
+    y_arr = y.to_numpy(dtype=np.float64, na_value=np.nan)
     for p in params:
-        x_raw = df_plot[p]
-        x_num = pd.to_numeric(x_raw, errors="coerce")
-        if x_num.notna().sum() >= 3:
-            corr = x_num.corr(y, method="spearman")
+        if p in corrs:
+            corr = corrs[p]
             imp = abs(float(corr)) if corr == corr else 0.0
             scores.append({"param": p, "importance": imp, "method": "spearman_abs"})
             continue
         # 类别：取各类别 mean 的范围作为重要性
-        grp = df_plot.groupby(p, dropna=True)[value_param].mean()
-        if len(grp) >= 2:
-            imp = float((grp.max() - grp.min())) if grp.notna().any() else 0.0
+        means = _group_means(df_plot[p], y_arr)
+        if len(means) >= 2:
+            imp = float(np.nanmax(means) - np.nanmin(means)) if not np.isnan(means).all() else 0.0
             scores.append({"param": p, "importance": abs(imp), "method": "range_mean"})
         else:
             scores.append({"param": p, "importance": 0.0, "method": "constant"})
@@ -370,10 +630,7 @@ def plot_param_importance(
     ax.grid(True, axis="x", alpha=0.3)
 
     if save_path:
-        path = Path(save_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(str(path), bbox_inches="tight")
-        plt.close(fig)
+        _save_fig(fig, save_path)
     return fig
 
 
@@ -387,32 +644,13 @@ def plot_param_1d(
     mask_filtered: bool = True,
 ):
     """1D 参数可视化：mean(value) 随 param 变化（param 近似数值/有序时更有意义）。"""
-    try:
-        import pandas as pd  # type: ignore
-        import seaborn as sns  # type: ignore
-    except Exception as exc:  # pragma: no cover
-        raise RuntimeError("需要 pandas 和 seaborn 才能生成 1D 图") from exc
+    pd, sns = _require_pandas_seaborn("生成 1D 图")
 
-    df = pd.read_csv(csv_path)
+    df = _load_sweep_csv(csv_path, [param, value_param, *_FILTER_COLS])
     if param not in df.columns or value_param not in df.columns:
         raise ValueError(f"缺少必要列: {param}, {value_param}")
 
-    df_plot = df.copy()
-    if filters:
-        if mask_filtered:
-            if "min_trades" in filters and "total_trades" in df_plot.columns:
-                df_plot.loc[df_plot["total_trades"] < filters["min_trades"], value_param] = float("nan")
-            if "max_drawdown" in filters and "max_drawdown" in df_plot.columns:
-                df_plot.loc[df_plot["max_drawdown"] > filters["max_drawdown"], value_param] = float("nan")
-            if "min_sharpe" in filters and "sharpe" in df_plot.columns:
-                df_plot.loc[df_plot["sharpe"] < filters["min_sharpe"], value_param] = float("nan")
-        else:
-            if "min_trades" in filters and "total_trades" in df_plot.columns:
-                df_plot = df_plot[df_plot["total_trades"] >= filters["min_trades"]]
-            if "max_drawdown" in filters and "max_drawdown" in df_plot.columns:
-                df_plot = df_plot[df_plot["max_drawdown"] <= filters["max_drawdown"]]
-            if "min_sharpe" in filters and "sharpe" in df_plot.columns:
-                df_plot = df_plot[df_plot["sharpe"] >= filters["min_sharpe"]]
+    df_plot = _apply_sweep_filters(df, filters, value_param=value_param, mask_filtered=mask_filtered)
 
     # 汇总为 mean 曲线
     curve = (
@@ -438,13 +676,78 @@ def plot_param_1d(
     ax.grid(True, alpha=0.3)
 
     if save_path:
-        path = Path(save_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        fig.savefig(str(path), bbox_inches="tight")
-        plt.close(fig)
+        _save_fig(fig, save_path)
     return fig
 
 
+def _filter_masks(df, filters: dict) -> tuple[np.ndarray, np.ndarray]:
+    """按 filters 一次性算出 (保留, 置空) 两个布尔掩码；每个指标列只取一次底层数组。
+
+    两者分开计算以保持 NaN 语义：NaN 既不满足保留条件，也不触发置空。
+    """
+    keep = np.ones(len(df), dtype=bool)
+    bad = np.zeros(len(df), dtype=bool)
+    for key, col, is_min in _FILTER_SPECS:
+        if key not in filters or col not in df.columns:
+            continue
+        vals = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        bound = filters[key]
+        if is_min:
+            keep &= vals >= bound
+            bad |= vals < bound
+        else:
+            keep &= vals <= bound
+            bad |= vals > bound
+    return keep, bad
+
+
+def _apply_sweep_filters(
+    df,
+    filters: dict | None,
+    *,
+    value_param: str,
+    mask_filtered: bool,
+    columns: list[str] | None = None,
+):
+    """应用 filters：mask_filtered 时把不达标行的 value_param 置 NaN（保留网格），否则直接剔除。
+
+    无 filters 时原样返回 df（不复制）；只有置空分支需要复制，且可用 `columns` 只复制所需列。
+    """
+    if not filters:
+        return df
+    keep, bad = _filter_masks(df, filters)
+    if not mask_filtered:
+        return df[keep]
+    df_plot = (df[columns] if columns is not None else df).copy()
+    if bad.any():
+        df_plot.loc[bad, value_param] = float("nan")
+    return df_plot
+
+
+def _align_labels(values: list, dtype):
+    """把 x_values/y_values 转成与透视轴同 dtype 的 Index；仅在无损时转换，否则原样返回。
+
+    通过显式 dtype 判断代替 try/astype/except（如 [60.0, 90.0] 对齐 int64 轴，"60" 对齐数值轴）。
+    """
+    pd = _require_pandas()
+    idx = pd.Index(list(values))
+    if idx.dtype == dtype or not isinstance(dtype, np.dtype) or not np.issubdtype(dtype, np.number):
+        return idx
+    if idx.dtype == object:
+        conv = pd.to_numeric(pd.Series(idx), errors="coerce")
+        if conv.isna().any():
+            return idx
+        idx = pd.Index(conv)
+    if not isinstance(idx.dtype, np.dtype) or not np.issubdtype(idx.dtype, np.number):
+        return idx
+    if np.can_cast(idx.dtype, dtype, casting="safe"):
+        return idx.astype(dtype)
+    raw = idx.to_numpy()
+    with np.errstate(invalid="ignore"):
+        cast = raw.astype(dtype)
+    return pd.Index(cast) if np.array_equal(cast, raw) else idx
+
+
 def _prepare_heatmap_pivot(
     df,
     *,
@@ -460,43 +763,32 @@ def _prepare_heatmap_pivot(
     if x_param not in df.columns or y_param not in df.columns or value_param not in df.columns:
         raise ValueError(f"缺少必要列: {x_param}, {y_param}, {value_param}")
 
-    df_plot = df.copy()
-    if filters and mask_filtered:
-        if "min_trades" in filters and "total_trades" in df_plot.columns:
-            df_plot.loc[df_plot["total_trades"] < filters["min_trades"], value_param] = float("nan")
-        if "max_drawdown" in filters and "max_drawdown" in df_plot.columns:
-            df_plot.loc[df_plot["max_drawdown"] > filters["max_drawdown"], value_param] = float("nan")
-        if "min_sharpe" in filters and "sharpe" in df_plot.columns:
-            df_plot.loc[df_plot["sharpe"] < filters["min_sharpe"], value_param] = float("nan")
-    elif filters:
-        if "min_trades" in filters and "total_trades" in df_plot.columns:
-            df_plot = df_plot[df_plot["total_trades"] >= filters["min_trades"]]
-        if "max_drawdown" in filters and "max_drawdown" in df_plot.columns:
-            df_plot = df_plot[df_plot["max_drawdown"] <= filters["max_drawdown"]]
-        if "min_sharpe" in filters and "sharpe" in df_plot.columns:
-            df_plot = df_plot[df_plot["sharpe"] >= filters["min_sharpe"]]
-
-    pivot = df_plot.pivot_table(index=y_param, columns=x_param, values=value_param, aggfunc=aggfunc)
+    df_plot = _apply_sweep_filters(
+        df,
+        filters,
+        value_param=value_param,
+        mask_filtered=mask_filtered,
+        columns=[y_param, x_param, value_param],
+    )
 
-    try:
-        import pandas as pd  # type: ignore
+    keys = df_plot[[y_param, x_param]]
+    if aggfunc == "mean" and len(df_plot) and not keys.isna().any().any() and not keys.duplicated().any():
+        # 每个 (y, x) 仅一行时 mean 即原值：直接 unstack，跳过 groupby 聚合；
+        # 转 float 并剔除全 NaN 行/列，与 pivot_table 输出一致
+        pivot = (
+            df_plot.set_index([y_param, x_param])[value_param]
+            .unstack(x_param)
+            .astype(np.float64)
+            .dropna(how="all")
+            .dropna(axis=1, how="all")
+        )
+    else:
+        pivot = df_plot.pivot_table(index=y_param, columns=x_param, values=value_param, aggfunc=aggfunc)
 
-        if x_values is not None:
-            cols = pd.Index(list(x_values))
-            try:
-                cols = cols.astype(pivot.columns.dtype)
-            except Exception:
-                pass
-            pivot = pivot.reindex(columns=cols)
-        if y_values is not None:
-            idx = pd.Index(list(y_values))
-            try:
-                idx = idx.astype(pivot.index.dtype)
-            except Exception:
-                pass
-            pivot = pivot.reindex(index=idx)
-    except Exception:
-        pass
+    if x_values is not None:
+        pivot = pivot.reindex(columns=_align_labels(x_values, pivot.columns.dtype))
+    if y_values is not None:
+        pivot = pivot.reindex(index=_align_labels(y_values, pivot.index.dtype))
 
     if x_values is not None and len(pivot.columns) != len(x_values):
         raise ValueError("heatmap x_values reindex failed")
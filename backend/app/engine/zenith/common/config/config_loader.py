@@ -102,6 +102,15 @@ def load_config(
     with cfg_path.open("r", encoding="utf-8") as f:
         raw_cfg = yaml.safe_load(f) or {}
 
+    return build_config(raw_cfg, expand_env=expand_env)
+
+
+def build_config(raw_cfg: dict[str, Any], *, expand_env: bool = True) -> MainConfig:
+    """从已解析的配置 dict 构建并验证配置（与 `load_config` 读文件后的处理一致，不修改入参）。
+
+    Returns:
+        MainConfig: 强类型的配置对象。
+    """
     # 3. 展开环境变量 (保持原来的 strict 检查)
     expanded_cfg = _expand_env_vars(raw_cfg, expand=expand_env)
 
@@ -161,6 +170,7 @@ def load_config(
 # 兼容旧导入：历史代码/测试可能从 config_loader 导入这些名字
 __all__ = [
     "load_config",
+    "build_config",
     "AppConfig",
     "MainConfig",
     "ExchangeConfig",
@@ -23,7 +23,7 @@ class Candle:
     start_ts: datetime
     end_ts: datetime
 
-@dataclass
+@dataclass(slots=True)
 class OrderSignal:
     """策略输出的订单信号。"""
     symbol: str
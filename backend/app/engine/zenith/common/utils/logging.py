@@ -3,12 +3,29 @@
 
 Notes
 -----
-`setup_logger` 会避免重复添加 handler，否则多次调用会出现重复日志。
+`setup_logger` 会避免重复添加 handler，否则多次调用会出现重复日志；
+每个名称的 handler 配置只在首次调用时进行，之后按名称缓存。
 """
 
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _configure(name: str) -> logging.Logger:
+    """每个名称只配置一次（关闭向上传播、补齐 StreamHandler），之后直接返回缓存的 logger。"""
+    logger = logging.getLogger(name)
+    logger.propagate = False
+
+    has_stream = any(isinstance(h, logging.StreamHandler) for h in logger.handlers)
+    if not has_stream:
+        ch = logging.StreamHandler()
+        fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+        ch.setFormatter(fmt)
+        logger.addHandler(ch)
+    return logger
 
 
 def setup_logger(name: str = "trading", level: int = logging.INFO) -> logging.Logger:
@@ -27,15 +44,8 @@ def setup_logger(name: str = "trading", level: int = logging.INFO) -> logging.Lo
     logging.Logger
         已配置的 logger。
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    logger.propagate = False
-
-    has_stream = any(isinstance(h, logging.StreamHandler) for h in logger.handlers)
-    if not has_stream:
-        ch = logging.StreamHandler()
-        fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s")
-        ch.setFormatter(fmt)
-        logger.addHandler(ch)
-
+    logger = _configure(name)
+    # 级别不变时跳过 setLevel（它会清空 logging 全局的级别缓存）
+    if logger.level != level:
+        logger.setLevel(level)
     return logger
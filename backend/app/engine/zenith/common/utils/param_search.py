@@ -12,8 +12,15 @@ from pathlib import Path
 from typing import Any, Dict, Iterable, List
 
 from zenith.core.backtest_engine import BacktestEngine
-from zenith.core.vector_backtest import run_ma_crossover_vectorized, run_trend_filtered_vectorized, run_volatility_vectorized, _build_price_frame
+from zenith.core.vector_backtest import (
+    run_bars_vectorized,
+    run_ma_crossover_vectorized,
+    run_trend_filtered_vectorized,
+    run_volatility_vectorized,
+    _build_price_frame,
+)
 from zenith.common.config.config_loader import BacktestConfig, StrategyConfig, load_config
+from zenith.strategies.registry import get_strategy_cls
 
 
 @dataclass
@@ -104,6 +111,13 @@ def _prepare_output_path(backtest_cfg: BacktestConfig | dict, output_csv: str |
     return Path("results") / "research" / filename
 
 
+def _supports_vector(strategy_type: str) -> bool:
+    try:
+        return bool(getattr(get_strategy_cls(strategy_type), "supports_vector", False))
+    except ValueError:
+        return False
+
+
 def _run_single_combo(
     cfg_base,
     combo: dict,
@@ -136,6 +150,9 @@ def _run_single_combo(
         elif strategy_type == "volatility_breakout":
             vec = run_volatility_vectorized(cfg, price_df=price_df)
             metrics = vec.metrics
+        elif _supports_vector(strategy_type):
+            vec = run_bars_vectorized(cfg, price_df=price_df)
+            metrics = vec.metrics
         else:
             summary = BacktestEngine(cfg_obj=cfg).run().summary
             metrics = summary.metrics.model_dump() if hasattr(summary, "metrics") else {}
@@ -157,6 +174,7 @@ def grid_search(
     cfg_obj=None,
     filters: dict | None = None,
     low_trades_penalty: float = 0.0,
+    price_df: pd.DataFrame | None = None,
 ) -> List[SweepResult]:
     """网格搜索。
 
@@ -176,6 +194,8 @@ def grid_search(
         过滤条件（min_trades/max_drawdown/min_sharpe）。
     low_trades_penalty:
         交易数过少的惩罚系数。
+    price_df:
+        可选：调用方已加载好的行情（覆盖回测区间）；传入后不再自行读盘。
 
     Returns
     -------
@@ -192,10 +212,9 @@ def grid_search(
     filter_stats: dict[str, int] = {"min_trades": 0, "max_drawdown": 0, "min_sharpe": 0, "passed": 0}
 
     # Preload data for vectorization
-    price_df = None
     bt_cfg = getattr(cfg, "backtest", None)
     use_vectorized = bool(getattr(bt_cfg.sweep, "vectorized", True)) if bt_cfg and bt_cfg.sweep else True
-    if use_vectorized:
+    if price_df is None and use_vectorized:
         try:
             price_df = _build_price_frame(cfg)
         except Exception:
@@ -243,8 +262,9 @@ def random_search(
     cfg_obj=None,
     filters: dict | None = None,
     low_trades_penalty: float = 0.0,
+    price_df: pd.DataFrame | None = None,
 ) -> List[SweepResult]:
-    """随机搜索（从网格中抽样 n_samples 组）。"""
+    """随机搜索（从网格中抽样 n_samples 组）；`price_df` 含义同 `grid_search`。"""
     cfg = cfg_obj or load_config(cfg_path, load_env=False, expand_env=False)
     if not isinstance(getattr(cfg, "backtest", None), BacktestConfig):
         raise ValueError("backtest config not found")
@@ -258,10 +278,9 @@ def random_search(
     filter_stats: dict[str, int] = {"min_trades": 0, "max_drawdown": 0, "min_sharpe": 0, "passed": 0}
 
     # Preload data for vectorization
-    price_df = None
     bt_cfg = getattr(cfg, "backtest", None)
     use_vectorized = bool(getattr(bt_cfg.sweep, "vectorized", True)) if bt_cfg and bt_cfg.sweep else True
-    if use_vectorized:
+    if price_df is None and use_vectorized:
         try:
             price_df = _build_price_frame(cfg)
         except Exception:
@@ -15,7 +15,7 @@ import pandas as pd
 from zenith.execution.backtest_broker import BacktestBroker
 from zenith.core.base_engine import BaseEngine, EngineResult
 from zenith.core.sources.event_source import PandasFrameEventSource
-from zenith.core.signal_pipeline import SignalTrace, prepare_signals
+from zenith.core.signal_pipeline import SignalTrace, execute_signals, prepare_signals
 from zenith.common.models.models import OrderSignal, Tick
 from zenith.strategies.factors.registry import apply_factors, build_factors
 from zenith.strategies.risk.manager import RiskManager
@@ -115,6 +115,29 @@ def _export_trades_csv(trades: list[dict], path: Path) -> None:
     df.to_csv(path, index=False)
 
 
+def _factor_out_cols(factors_cfg: list[dict[str, Any]]) -> set[str]:
+    out: set[str] = set()
+    for item in factors_cfg:
+        params = item.get("params") if isinstance(item.get("params"), dict) else item
+        col = params.get("out_col")
+        if col:
+            out.add(str(col))
+    return out
+
+
+def _with_ma_features(
+    factors_cfg: list[dict[str, Any]], ma_specs: tuple[tuple[int, str], ...]
+) -> list[dict[str, Any]]:
+    """在因子配置前补上缺失的 MA 特征列（window<=0 或已声明同名输出列时跳过）。"""
+    declared = _factor_out_cols(factors_cfg)
+    ma_cfg = [
+        {"name": "ma", "params": {"window": window, "price_col": "close", "out_col": col}}
+        for window, col in ma_specs
+        if window > 0 and col not in declared
+    ]
+    return ma_cfg + factors_cfg
+
+
 def _resolve_strategy_param(bt_cfg: BacktestConfig, cfg, key: str, default: Any = None) -> Any:
     if bt_cfg.strategy and isinstance(bt_cfg.strategy.params, dict):
         v = bt_cfg.strategy.params.get(key)
@@ -175,6 +198,12 @@ class BacktestEngine(BaseEngine):
         self.cfg = None
         self.broker: BacktestBroker | None = None
         self.last_prices: dict[str, float] = {}
+        # (数据范围 key, 原始 K 线)；见 `_cached_candles`
+        self._candles_cache: tuple[tuple, pd.DataFrame] | None = None
+
+    def update_config(self, cfg_obj) -> None:
+        """替换配置以复用引擎（如只改策略参数）；数据范围不变时沿用已加载的 K 线。"""
+        self._cfg_obj = cfg_obj
 
     def run(self, progress_callback=None) -> EngineResult:
         cfg = self._load_cfg()
@@ -188,7 +217,9 @@ class BacktestEngine(BaseEngine):
             equity_base = 10000.0
 
         # 加载数据与特征 (Data Loading)
-        candles_df, feature_cols, data_health_raw = self._load_candles_and_features(cfg, backtest_config)
+        candles_df, feature_cols, data_health_raw = self._load_candles_and_features(
+            cfg, backtest_config, candles_df=self._cached_candles(backtest_config)
+        )
         data_health = DataHealth.model_validate(data_health_raw)
         total_bars = len(candles_df)
 
@@ -272,13 +303,15 @@ class BacktestEngine(BaseEngine):
 
             # 4. 信号执行 (Execution)
             if filtered:
-                for sig in filtered:
-                    broker.execute(
-                        sig,
-                        tick_price=tick.price,
-                        ts=tick.ts,
-                        record_equity=(not record_equity_each_bar),
-                    )
+                execute_signals(
+                    signals=filtered,
+                    broker=broker,
+                    execute_kwargs={
+                        "tick_price": tick.price,
+                        "ts": tick.ts,
+                        "record_equity": not record_equity_each_bar,
+                    },
+                )
 
             # 5. 权益曲线记录 (Equity Recording)
             if record_equity_each_bar:
@@ -387,7 +420,7 @@ class BacktestEngine(BaseEngine):
         )
 
     @staticmethod
-    def _load_candles_and_features(cfg, bt_cfg: BacktestConfig) -> tuple[pd.DataFrame, list[str], dict[str, Any]]:
+    def _load_candles(bt_cfg: BacktestConfig) -> pd.DataFrame:
         loader = HistoricalDataLoader(bt_cfg.data_dir)
         candles = loader.load_klines_for_backtest(
             symbol=bt_cfg.symbol,
@@ -396,7 +429,24 @@ class BacktestEngine(BaseEngine):
             end=parse_iso(bt_cfg.end),
             auto_download=bool(bt_cfg.auto_download),
         )
-        candles_df = _candles_to_frame(candles)
+        return _candles_to_frame(candles)
+
+    def _cached_candles(self, bt_cfg: BacktestConfig) -> pd.DataFrame:
+        """按数据范围缓存原始 K 线：同一引擎换参数重跑时不再读盘。"""
+        key = (bt_cfg.data_dir, bt_cfg.symbol, bt_cfg.interval, bt_cfg.start, bt_cfg.end)
+        if self._candles_cache is None or self._candles_cache[0] != key:
+            self._candles_cache = (key, self._load_candles(bt_cfg))
+        return self._candles_cache[1]
+
+    @staticmethod
+    def _load_candles_and_features(
+        cfg, bt_cfg: BacktestConfig, *, candles_df: pd.DataFrame | None = None
+    ) -> tuple[pd.DataFrame, list[str], dict[str, Any]]:
+        if candles_df is None:
+            candles_df = BacktestEngine._load_candles(bt_cfg)
+        else:
+            # 传入的可能是缓存帧：浅拷贝后再加因子列，不污染缓存
+            candles_df = candles_df.copy(deep=False)
 
         strategy_obj = getattr(cfg, "strategy", None)
         base_type = str(getattr(strategy_obj, "type", None) or "simple_ma")
@@ -407,31 +457,29 @@ class BacktestEngine(BaseEngine):
         short_feature = str(bt_params.get("short_feature", "ma_short"))
         long_feature = str(bt_params.get("long_feature", "ma_long"))
 
-        factors_cfg = bt_cfg.factors
-        if not factors_cfg:
-            short_w = int(_resolve_strategy_param(bt_cfg, cfg, "short_window", 0) or 0)
-            long_w = int(_resolve_strategy_param(bt_cfg, cfg, "long_window", 0) or 0)
-            factors_cfg = []
-            if short_w > 0:
-                factors_cfg.append({"name": "ma", "params": {"window": short_w, "price_col": "close", "out_col": short_feature}})
-            if long_w > 0:
-                factors_cfg.append({"name": "ma", "params": {"window": long_w, "price_col": "close", "out_col": long_feature}})
-            
-            if bt_type == "trend_filtered":
-                atr_period = int(_resolve_strategy_param(bt_cfg, cfg, "atr_period", 14) or 14)
-                atr_feature = str(bt_params.get("atr_feature", "atr_14"))
-                factors_cfg.append(
-                    {
-                        "name": "atr",
-                        "params": {
-                            "period": atr_period,
-                            "high_col": "high",
-                            "low_col": "low",
-                            "close_col": "close",
-                            "out_col": atr_feature,
-                        },
-                    }
-                )
+        # 策略以 require_features=True 构建：均线必须由因子管线一次性向量化算出，
+        # 即使用户自定义了 factors，也补上缺失的 MA 特征列，避免 on_tick 拿不到特征
+        short_w = int(_resolve_strategy_param(bt_cfg, cfg, "short_window", 0) or 0)
+        long_w = int(_resolve_strategy_param(bt_cfg, cfg, "long_window", 0) or 0)
+        factors_cfg = _with_ma_features(
+            list(bt_cfg.factors or []),
+            ((short_w, short_feature), (long_w, long_feature)),
+        )
+        if not bt_cfg.factors and bt_type == "trend_filtered":
+            atr_period = int(_resolve_strategy_param(bt_cfg, cfg, "atr_period", 14) or 14)
+            atr_feature = str(bt_params.get("atr_feature", "atr_14"))
+            factors_cfg.append(
+                {
+                    "name": "atr",
+                    "params": {
+                        "period": atr_period,
+                        "high_col": "high",
+                        "low_col": "low",
+                        "close_col": "close",
+                        "out_col": atr_feature,
+                    },
+                }
+            )
 
         factors = build_factors(factors_cfg)
         candles_df = apply_factors(candles_df, factors) if not candles_df.empty else candles_df
@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 
+import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Callable
@@ -38,19 +39,23 @@ class BaseEngine(ABC):
         logger=None,
     ) -> None:
         """统一事件循环：对所有模式（回测/实盘/模拟）复用。"""
-        if logger:
+        # 日志级别在循环前判定一次；max_events 分支也提到循环外，逐 tick 只剩 on_tick 调用
+        log_info = logger is not None and logger.isEnabledFor(logging.INFO)
+        if log_info:
             logger.info("Engine loop start: source=%s", source.__class__.__name__)
         source.setup()
         try:
-            n = 0
-            for tick in source.events():
-                on_tick(tick)
-                n += 1
-                if max_events is not None and n >= max_events:
-                    if logger:
-                        logger.info("Engine loop reached max_events=%s, stop.", max_events)
-                    break
+            if max_events is None:
+                for tick in source.events():
+                    on_tick(tick)
+            else:
+                for n, tick in enumerate(source.events(), 1):
+                    on_tick(tick)
+                    if n >= max_events:
+                        if log_info:
+                            logger.info("Engine loop reached max_events=%s, stop.", max_events)
+                        break
         finally:
             source.teardown()
-            if logger:
+            if log_info:
                 logger.info("Engine loop end.")
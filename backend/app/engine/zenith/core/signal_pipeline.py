@@ -17,6 +17,10 @@ from zenith.common.utils.client_order_id import make_client_order_id
 from zenith.common.utils.sizer import size_signals
 
 
+# last_prices 缺省时共享的只读空表，避免每个 tick 分配
+_EMPTY_PRICES: dict[str, float] = {}
+
+
 @dataclass
 class SignalTrace:
     """信号“尸检”统计（只计数，不改变接口行为）。"""
@@ -50,9 +54,12 @@ def prepare_signals(
     if not raw_signals:
         return []
 
+    # 缺价信号补价：优先最新价，缺失时用当前 tick 价（合法的 0.0 价格不会被覆盖）
+    lp = last_prices or _EMPTY_PRICES
+    tick_price = tick.price
     for sig in raw_signals:
         if sig.price is None:
-            sig.price = (last_prices or {}).get(sig.symbol) or tick.price
+            sig.price = lp.get(sig.symbol, tick_price)
 
     sized_signals = size_signals(raw_signals, broker, sizing_cfg, equity_base, logger=logger)
     if trace is not None:
@@ -89,11 +96,7 @@ def execute_signals(
     broker: Broker,
     execute_kwargs: dict[str, Any] | None = None,
 ) -> list[dict]:
-    """执行信号列表并返回执行结果。"""
+    """执行信号列表并返回执行结果（交给 `broker.execute_many` 整批处理）。"""
     if not signals:
         return []
-    kwargs = execute_kwargs or {}
-    results: list[dict] = []
-    for sig in signals:
-        results.append(broker.execute(sig, **kwargs))
-    return results
+    return broker.execute_many(signals, **(execute_kwargs or {}))
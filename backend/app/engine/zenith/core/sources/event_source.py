@@ -43,26 +43,28 @@ class PandasFrameEventSource(EventSource):
         if self._df.empty:
             return
             yield  # pragma: no cover
-        feature_cols = [c for c in self._feature_cols if c in self._df.columns]
-        for _, row in self._df.iterrows():
-            ts = row["ts"]
-            symbol = str(row["symbol"])
-            price = float(row["close"])
+        df = self._df
+        # 按列一次性取出 Python 标量列表再 zip 逐行组装，避免 iterrows 为每行构造 Series
+        feature_cols = [
+            (c, df[c].to_numpy(dtype=float).tolist()) for c in self._feature_cols if c in df.columns
+        ]
+        # Auto-include OHLCV if present (Essential for strategy usage)
+        ohlcv_cols = [
+            (c, df[c].to_numpy(dtype=float).tolist()) for c in ("open", "high", "low", "volume") if c in df.columns
+        ]
+        ts_vals = df["ts"].tolist()
+        symbols = df["symbol"].astype(str).tolist()
+        closes = df["close"].to_numpy(dtype=float).tolist()
+        for i, (ts, symbol, price) in enumerate(zip(ts_vals, symbols, closes)):
             features = {}
-            if feature_cols:
-                for c in feature_cols:
-                    v = row[c]
-                    if pd.notna(v):
-                        features[c] = float(v)
-            
-            # Auto-include OHLCV if present (Essential for strategy usage)
-            for f in ["open", "high", "low", "volume"]:
-                if f in self._df.columns:
-                    features[f] = float(row[f])
-
-            if not features:
-                features = None
-            yield Tick(symbol=symbol, price=price, ts=ts, features=features)
+            for c, vals in feature_cols:
+                v = vals[i]
+                if v == v:  # 跳过 NaN
+                    features[c] = v
+            for c, vals in ohlcv_cols:
+                features[c] = vals[i]
+
+            yield Tick(symbol=symbol, price=price, ts=ts, features=features or None)
 
 
 class IteratorEventSource(EventSource):
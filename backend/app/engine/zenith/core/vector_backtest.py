@@ -53,7 +53,6 @@ def _build_price_frame(cfg_obj) -> pd.DataFrame:
     return df
 
 
-import numpy as np
 from zenith.extensions.rust_wrapper import RustSimulator
 
 @dataclass
@@ -151,7 +150,7 @@ def run_ma_crossover_vectorized(cfg_obj, price_df: pd.DataFrame | None = None) -
     if df.empty:
         return VectorBacktestResult(equity_curve=[], metrics={}, trades=[])
 
-    close = df["close"].astype(float)
+    close = df["close"].astype("float64", copy=False)
     short_ma = close.rolling(short_w, min_periods=short_w).mean()
     long_ma = close.rolling(long_w, min_periods=long_w).mean()
 
@@ -215,122 +214,40 @@ def run_trend_filtered_vectorized(cfg_obj) -> VectorBacktestResult:
     return run_signal_vectorized(cfg_obj, price_df=price_df, signals=signals)
 
 
-def run_volatility_vectorized(cfg_obj, price_df: pd.DataFrame | None = None) -> VectorBacktestResult:
-    """向量化回测：波动率突破 (Bollinger Breakout)。"""
+def run_bars_vectorized(cfg_obj, price_df: pd.DataFrame | None = None) -> VectorBacktestResult:
+    """向量化回测：通过策略注册表构建策略，调用其 `on_bars` 一次性生成信号。
+
+    仅适用于 `supports_vector=True` 的策略；出场依赖模拟器的 SL/TP。
+    """
+    from zenith.strategies.registry import build_strategy
+
     bt_cfg = getattr(cfg_obj, "backtest", None)
     if not isinstance(bt_cfg, BacktestConfig):
         raise ValueError("backtest config not found")
-    strategy = getattr(bt_cfg, "strategy", None) or getattr(cfg_obj, "strategy", None)
-    params = dict(getattr(strategy, "params", {}) or {})
-    
-    window = int(params.get("window") or 20)
-    k = float(params.get("k") or 2.0)
-    
-    if window <= 0:
-        raise ValueError("vectorized volatility requires window > 0")
-
-    if price_df is None:
-        df = _build_price_frame(cfg_obj)
-    else:
-        df = price_df
+    strategy_cfg = getattr(bt_cfg, "strategy", None) or getattr(cfg_obj, "strategy", None)
+    strat = build_strategy(strategy_cfg)
+    if not getattr(strat, "supports_vector", False):
+        raise ValueError(f"strategy {type(strat).__name__} does not support vectorized backtest")
 
+    df = _build_price_frame(cfg_obj) if price_df is None else price_df
     if df.empty:
         return VectorBacktestResult(equity_curve=[], metrics={}, trades=[])
 
-    # 转换为列表供 Rust 调用
-    closes = df["close"].astype(float).values.tolist()
-    
-    # Rust 计算指标
-    sim = RustSimulator()
-    try:
-        ma_vals = sim.calculate_indicators(closes, "ma", window)
-        std_vals = sim.calculate_indicators(closes, "stddev", window)
-    except Exception as e:
-        print(f"Rust indicator calc failed: {e}")
-        return VectorBacktestResult(equity_curve=[], metrics={}, trades=[])
-
-    # 转换回 Series 以便进行向量化逻辑处理
-    ma_series = pd.Series(ma_vals, index=df.index)
-    std_series = pd.Series(std_vals, index=df.index)
-    
-    upper = ma_series + k * std_series
-    lower = ma_series - k * std_series
-    close_series = df["close"].astype(float)
-    
-    # 逻辑:
-    # 收盘价 > 上轨 -> Long (1)
-    # 收盘价 < 下轨 -> Short (-1) (如果在允许做空的情况下，否则为平仓或观望?)
-    # 目前假设是对称的：跌破下轨 = 做空。
-    # Rust 模拟器的 "allow_short" 标志控制实际是否执行做空。
-    # 但此处的生成逻辑决定了意图。
-    
-    # 我们希望实现类似状态机的行为：
-    # 空仓 -> 向上突破 -> 做多
-    # 持多 -> 向下突破? 或者有特定的退出条件?
-    # Python 事件驱动策略逻辑:
-    #   入场: > 上轨 (做多), < 下轨 (做空)
-    #   出场: < MA (多头离场), > MA (空头离场)
-    
-    # 在没有循环或自定义 Rust 模拟逻辑的情况下，开发向量化状态机比较复杂。
-    # 简化版向量化逻辑:
-    # 仅在突破发生时产生 "Signal"。
-    # 我们将突破直接映射为信号。
-    
-    # 突破信号
-    long_signal = (close_series > upper)
-    short_signal = (close_series < lower)
-    
-    # 出场信号 (均值回归)
-    # exit_long = (close_series < ma_series)
-    # exit_short = (close_series > ma_series)
-    
-    # 是否构建稠密信号数组?
-    # 或者只生成入场信号，让 Rust 处理 "反转"?
-    # ZenithAlgo Rust 模拟器处理如下:
-    # Sig=1: 若空仓 -> 做多。若持空 -> 反手做多。
-    # Sig=-1: 若空仓 -> 做空。若持多 -> 反手做空。
-    # 它原本并不原生支持 "仅出场" (Sig=0 表示无动作)。
-    
-    # 所以如果我们想在 MA 交叉时出场，我们需要传递特定的 "Close" 意图?
-    # 目前 Rust 模拟器逻辑:
-    # if sig == 1: Long
-    # if sig == -1: Short
-    # 
-    # 为了支持 "Exit"，我们暗示:
-    # Long -> 想要变 Flat? 
-    # Rust 模拟器除了通过 SL/TP 外，并不显式支持 "Go Flat" 指令。
-    # 这是当前 `simulate_trades_v2` 的一个限制。
-    # 
-    # 权宜之计:
-    # 为了与 Event Engine (具有 MA 出场) 的策略对齐，最理想是后续升级 Rust Sim。
-    # 目前，我们为向量化优化实现纯 "反转" 逻辑，或者简单的 Stop/TP 逻辑。
-    # 或者，我们只发出入场信号，依赖 SL/TP 出场?
-    # 
-    # 让我们与我编写的 Python Event 策略对齐:
-    # Python Event: 多头跌破下轨 (反转)? 不，多头在 MA 交叉时出场。
-    # 
-    # 决策:
-    # 对于本次向量化优化的迭代，我们简化处理:
-    # 仅传递入场信号。出场通过 SL/TP。
-    # 仅在突破发生瞬间生成信号。
-    
-    signals = []
-    end_ts_list = [pd.Timestamp(ts).to_pydatetime() for ts in df["end_ts"]]
-    
-    # 为了减少噪音，仅在交叉 (Crossover) 时发信号?
-    # 上穿上轨
-    long_entry = (close_series > upper) & (close_series.shift(1) <= upper.shift(1))
-    short_entry = (close_series < lower) & (close_series.shift(1) >= lower.shift(1))
-    
-    # 迭代并构建高效列表
-    # 使用 numpy 加速
-    long_idxs = np.where(long_entry)[0]
-    short_idxs = np.where(short_entry)[0]
-    
-    for idx in long_idxs:
-        signals.append({"ts": end_ts_list[idx], "side": "buy"})
-    
-    for idx in short_idxs:
-        signals.append({"ts": end_ts_list[idx], "side": "sell"})
-        
+    signals = strat.on_bars(df)
     return run_signal_vectorized(cfg_obj, price_df=df, signals=signals)
+
+
+def run_volatility_vectorized(cfg_obj, price_df: pd.DataFrame | None = None) -> VectorBacktestResult:
+    """向量化回测：波动率突破 (Bollinger Breakout)。
+
+    布林带由 `VolatilityBreakoutStrategy.on_bars` 经 pandas rolling 一次算出，
+    仅在突破上/下轨的瞬间发入场信号，出场通过 SL/TP。
+    """
+    bt_cfg = getattr(cfg_obj, "backtest", None)
+    if not isinstance(bt_cfg, BacktestConfig):
+        raise ValueError("backtest config not found")
+    strategy = getattr(bt_cfg, "strategy", None) or getattr(cfg_obj, "strategy", None)
+    params = dict(getattr(strategy, "params", {}) or {})
+    if int(params.get("window") or 20) <= 0:
+        raise ValueError("vectorized volatility requires window > 0")
+    return run_bars_vectorized(cfg_obj, price_df=price_df)
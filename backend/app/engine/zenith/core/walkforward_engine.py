@@ -10,7 +10,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, List, Tuple
 
+import pandas as pd
+
 from zenith.core.backtest_engine import BacktestEngine, parse_iso
+from zenith.core.vector_backtest import _build_price_frame
 from zenith.core.base_engine import BaseEngine, EngineResult
 from zenith.common.utils.best_params import pick_best_params
 from zenith.common.config.config_loader import BacktestConfig, load_config
@@ -37,6 +40,11 @@ def _split_segments(
     return segments
 
 
+def _slice_price_frame(df: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+    """按 end_ts 闭区间 [start, end] 截取（与 `_build_price_frame` 的区间语义一致）。"""
+    return df[(df["end_ts"] >= start) & (df["end_ts"] <= end)]
+
+
 class WalkforwardEngine(BaseEngine):
     def __init__(
         self,
@@ -91,6 +99,14 @@ class WalkforwardEngine(BaseEngine):
             }
         low_trades_penalty = float(getattr(sweep_cfg, "low_trades_penalty", 0.0)) if sweep_cfg is not None else 0.0
 
+        # 整个区间的行情只加载一次，各段训练 sweep 按时间切片复用（不再每段重新读盘、排序）
+        full_df = None
+        if bool(getattr(sweep_cfg, "vectorized", True)) if sweep_cfg is not None else True:
+            try:
+                full_df = _build_price_frame(cfg)
+            except Exception:
+                full_df = None
+
         for idx, ((train_start, train_end), (test_start, test_end)) in enumerate(segments, 1):
             logger.info(
                 "Segment %s/%s: train=%s~%s test=%s~%s",
@@ -109,6 +125,7 @@ class WalkforwardEngine(BaseEngine):
             cfg_train.backtest = bt_train  # type: ignore[assignment]
 
             sweep_csv = out_dir / f"{symbol}_{interval}_wf_train{idx}.csv"
+            train_df = None if full_df is None else _slice_price_frame(full_df, train_start, train_end)
             if mode == "random":
                 n_samples = int(getattr(sweep_cfg, "n_random", 20)) if sweep_cfg is not None else 20
                 random_search(
@@ -120,6 +137,7 @@ class WalkforwardEngine(BaseEngine):
                     cfg_obj=cfg_train,
                     filters=filters,
                     low_trades_penalty=low_trades_penalty,
+                    price_df=train_df,
                 )
             else:
                 grid_search(
@@ -130,6 +148,7 @@ class WalkforwardEngine(BaseEngine):
                     cfg_obj=cfg_train,
                     filters=filters,
                     low_trades_penalty=low_trades_penalty,
+                    price_df=train_df,
                 )
             best_params = pick_best_params(sweep_csv, min_trades=self._min_trades)
             logger.info("Segment %s best params: %s", idx, best_params)
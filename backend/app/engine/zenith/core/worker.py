@@ -1,68 +1,265 @@
+import hashlib
 import json
 import logging
+import os
 import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
 from typing import Optional, Dict, Any
 import redis
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+try:  # msgpack 为可选依赖（`pip install -e .[accel]`）：未安装时只接受 JSON 任务
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
 
 from zenith.core.backtest_engine import BacktestEngine
 from zenith.common.config.config_loader import MainConfig
 
 logger = logging.getLogger(__name__)
 
+# 进度消息合批：最多攒 32 条或 50ms 发一次
+_PROGRESS_BATCH = 32
+_PROGRESS_FLUSH_INTERVAL = 0.05
+# 任务负载首字节为该版本标记时按 msgpack 解码，否则按 JSON 文本
+_MSGPACK_TAG = b"\x01"
+# 可靠队列：每个 worker 一个 processing 列表，并以带 TTL 的心跳 key 声明存活
+_PROCESSING_PREFIX = "zenith:jobs:processing:"
+_HEARTBEAT_PREFIX = "zenith:workers:heartbeat:"
+_HEARTBEAT_TTL = 30
+_HEARTBEAT_INTERVAL = 10
+# 同一负载在进程池中失败的次数上限，超过后移入死信列表；计数一天无新失败即过期
+_MAX_ATTEMPTS = 3
+_ATTEMPTS_TTL = 86400
+# 复用的回测引擎个数上限（LRU）
+_ENGINE_CACHE_SIZE = 4
+
+
 class BacktestJob(BaseModel):
-    """任务负载结构。"""
+    """任务负载结构（config 随负载一次性校验为 MainConfig）。"""
     job_id: str
-    config: Dict[str, Any]  # 原始 config 字典
-    
+    config: MainConfig
+
+
+class _JobEnvelope(BaseModel):
+    """宽松负载结构：config 校验失败时仅用来取出 job_id 上报错误。"""
+    job_id: str
+    config: Dict[str, Any]
+
+
+# 模块级构建一次，逐条消息直接复用 pydantic-core 校验器
+_JOB_ADAPTER = TypeAdapter(BacktestJob)
+_ENVELOPE_ADAPTER = TypeAdapter(_JobEnvelope)
+
+
+def _decode_job(payload: bytes | str, adapter: TypeAdapter = _JOB_ADAPTER):
+    """解析任务负载：`_MSGPACK_TAG` + msgpack，或 JSON 文本（pydantic-core 直接从 bytes 解析）。"""
+    if isinstance(payload, bytes) and payload[:1] == _MSGPACK_TAG:
+        if msgpack is None:
+            raise RuntimeError("msgpack job payload received but msgpack is not installed")
+        return adapter.validate_python(msgpack.unpackb(payload[1:], raw=False))
+    return adapter.validate_json(payload)
+
+
+def _engine_cache_key(cfg: MainConfig) -> str:
+    """去掉策略配置后的配置摘要：只差策略参数的任务共用一个引擎（及其已加载的行情）。"""
+    base = cfg.model_dump(mode="json", exclude={"strategy": True, "backtest": {"strategy"}})
+    raw = json.dumps(base, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
 class JobConsumer:
     """RaaS Worker: 负责从 Redis 消费任务并在本地执行回测。"""
     
-    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
-        self.redis = redis.from_url(redis_url, decode_responses=True)
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        max_inflight: int = 1,
+        worker_id: str | None = None,
+    ):
+        self.redis_url = redis_url
+        # 同时处理的任务数：1 为进程内串行；>1 时回测放到进程池，主进程只负责取任务/确认
+        self.max_inflight = max(1, int(max_inflight))
+        # 共享连接池；消费 (BLMOVE) 与发布走各自的客户端，发布不排在阻塞读之后
+        # 不解码响应：msgpack 任务是二进制，JSON 任务由 pydantic 直接从 bytes 解析
+        self.pool = redis.ConnectionPool.from_url(redis_url, max_connections=16, decode_responses=False)
+        self.consume_redis = redis.Redis(connection_pool=self.pool)
+        self.publish_redis = redis.Redis(connection_pool=self.pool)
+        self.redis = self.consume_redis
         self.queue_key = "zenith:jobs:queue"
         self.updates_channel = "zenith:jobs:updates"
+        self.attempts_key = "zenith:jobs:attempts"
+        self.dead_key = "zenith:jobs:dead"
+        # 可靠队列：取出的任务先移入本 worker 的 processing 列表，处理完再删除。
+        # worker_id 可用参数或 ZENITH_WORKER_ID 固定；重启后无论 id 是否变化，
+        # 心跳过期的 processing 列表都会在启动时被收回（见 `_recover_processing`）
+        self.worker_id = worker_id or os.getenv("ZENITH_WORKER_ID") or uuid.uuid4().hex
+        self.processing_key = f"{_PROCESSING_PREFIX}{self.worker_id}"
+        self.heartbeat_key = f"{_HEARTBEAT_PREFIX}{self.worker_id}"
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread: threading.Thread | None = None
+        self.last_wait_s = 0.0  # 最近一次 BLMOVE 等待耗时（秒）
+        # 进度消息先攒进 pipeline，满 N 条或距上次 flush 超过间隔时一次发出
+        self._progress_pipe = self.publish_redis.pipeline(transaction=False)
+        self._progress_pending = 0
+        self._progress_flushed_at = time.monotonic()
+        self._engine_cache: "OrderedDict[str, BacktestEngine]" = OrderedDict()
         
     def run_forever(self):
-        """阻塞运行 Worker 主循环。"""
+        """阻塞运行 Worker 主循环；异常退出后收回未完成任务并原地重启。"""
         logger.info(f"Worker started. Listening on {self.queue_key}...")
+        self._start_heartbeat()
         try:
             while True:
-                # 阻塞式右侧弹出 (BRPOP)
-                # result is tuple: (key, value)
-                result = self.redis.brpop(self.queue_key, timeout=5)
-                if result:
-                    _, payload_str = result
-                    self._process_job(payload_str)
-        except KeyboardInterrupt:
-            logger.info("Worker stopped by user.")
-        except Exception as e:
-            logger.exception(f"Worker crashed: {e}")
-            time.sleep(5)  # 避免死循环快速重启
-            self.run_forever()
+                pool = None
+                try:
+                    self._recover_processing()
+                    if self.max_inflight > 1:
+                        pool = ProcessPoolExecutor(
+                            max_workers=self.max_inflight, initializer=_init_child, initargs=(self.redis_url,)
+                        )
+                        self._run_pooled(pool)
+                    else:
+                        self._run_serial()
+                except KeyboardInterrupt:
+                    logger.info("Worker stopped by user.")
+                    if pool is not None:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                    return
+                except Exception as e:
+                    logger.exception(f"Worker crashed: {e}")
+                    if pool is not None:
+                        # 等在途子进程结束、回调完成确认/计数后再收回 processing 列表，避免同一任务跑两次
+                        pool.shutdown(wait=True, cancel_futures=True)
+                    time.sleep(5)  # 避免死循环快速重启
+        finally:
+            self._stop_heartbeat()
 
-    def _process_job(self, payload_str: str):
+    def _run_serial(self):
+        """进程内逐个处理任务。"""
+        while True:
+            payload = self._next_payload()
+            if payload:
+                self._process_job(payload)
+                self.consume_redis.lrem(self.processing_key, 1, payload)
+
+    def _next_payload(self) -> bytes | None:
+        """阻塞式右取左放 (BLMOVE, Redis >= 6.2)，崩溃时任务留在 processing 列表。"""
+        start = time.monotonic()
+        payload = self.consume_redis.blmove(
+            self.queue_key, self.processing_key, timeout=1, src="RIGHT", dest="LEFT"
+        )
+        self.last_wait_s = time.monotonic() - start
+        if payload:
+            logger.debug("Job dequeued after %.3fs", self.last_wait_s)
+        return payload
+
+    def _run_pooled(self, pool: ProcessPoolExecutor):
+        """进程池并发处理：有空闲槽位才取下一个任务，回测期间主进程继续取任务。"""
+        slots = threading.BoundedSemaphore(self.max_inflight)
+        while True:
+            slots.acquire()
+            payload = self._next_payload()
+            if not payload:
+                slots.release()
+                continue
+            future = pool.submit(_run_in_child, payload)
+            future.add_done_callback(partial(self._on_child_done, payload, slots))
+
+    def _on_child_done(self, payload: bytes, slots: threading.BoundedSemaphore, future: Future):
+        """子进程结束后确认任务；进程池异常时保留在 processing 列表，重启时重新入队。"""
+        try:
+            if not future.cancelled() and future.exception() is None:
+                self.consume_redis.lrem(self.processing_key, 1, payload)
+            else:
+                logger.error("Job execution aborted: %s", None if future.cancelled() else future.exception())
+                if not future.cancelled():
+                    self._record_failure(payload)
+        finally:
+            slots.release()
+
+    def _record_failure(self, payload: bytes):
+        """累计负载的失败次数；达到上限（多为反复击垮进程池的任务）移入死信列表，不再重新入队。"""
+        field = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        pipe = self.consume_redis.pipeline(transaction=False)
+        pipe.hincrby(self.attempts_key, field, 1)
+        pipe.expire(self.attempts_key, _ATTEMPTS_TTL)
+        attempts = pipe.execute()[0]
+        if attempts < _MAX_ATTEMPTS:
+            return
+        logger.error("Job failed %d times, moved to %s", attempts, self.dead_key)
+        pipe = self.consume_redis.pipeline()
+        pipe.lrem(self.processing_key, 1, payload)
+        pipe.lpush(self.dead_key, payload)
+        pipe.hdel(self.attempts_key, field)
+        pipe.execute()
+        try:
+            job_id = _decode_job(payload, _ENVELOPE_ADAPTER).job_id
+        except Exception:
+            return
+        self._report_error(job_id, f"Job aborted after {attempts} failed attempts")
+
+    def _start_heartbeat(self):
+        """写入心跳并启动后台线程续期（独立于主循环，槽位占满阻塞时也不过期）。"""
+        if self._heartbeat_thread is not None and self._heartbeat_thread.is_alive():
+            return
+        self.consume_redis.set(self.heartbeat_key, b"1", ex=_HEARTBEAT_TTL)
+        self._heartbeat_stop.clear()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="worker-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self):
+        while not self._heartbeat_stop.wait(_HEARTBEAT_INTERVAL):
+            try:
+                self.consume_redis.set(self.heartbeat_key, b"1", ex=_HEARTBEAT_TTL)
+            except Exception:
+                logger.warning("Worker heartbeat refresh failed", exc_info=True)
+
+    def _stop_heartbeat(self):
+        """停止续期并删除心跳：未完成的任务随即可被其它 worker 收回。"""
+        self._heartbeat_stop.set()
+        try:
+            self.consume_redis.delete(self.heartbeat_key)
+        except Exception:
+            logger.warning("Worker heartbeat cleanup failed", exc_info=True)
+
+    def _recover_processing(self):
+        """收回自己的 processing 列表，以及所有心跳已过期 worker 遗留的列表。"""
+        self._requeue(self.processing_key)
+        for key in self.consume_redis.scan_iter(match=f"{_PROCESSING_PREFIX}*"):
+            key = key.decode() if isinstance(key, bytes) else key
+            owner = key[len(_PROCESSING_PREFIX):]
+            if key != self.processing_key and not self.consume_redis.exists(f"{_HEARTBEAT_PREFIX}{owner}"):
+                logger.warning("Recovering jobs from dead worker %s", owner)
+                self._requeue(key)
+
+    def _requeue(self, processing_key: str):
+        """把 processing 列表中未完成的任务放回队列消费端（保持原先的出队顺序）；LMOVE 逐条原子移动。"""
+        while self.consume_redis.lmove(processing_key, self.queue_key, "LEFT", "RIGHT") is not None:
+            pass
+
+    def _process_job(self, payload: bytes | str):
         try:
-            job_dict = json.loads(payload_str)
-            job = BacktestJob(**job_dict)
-            logger.info(f"Processing Job {job.job_id}...")
-            
-            # TODO: 将字典转换为 MainConfig 对象
-            # 注意: config_loader 通常从文件加载，这里需要支持从 dict 加载
-            # 暂时假设 MainConfig 可以直接 parse_obj，或者我们需要扩展 config_loader
             try:
-                # 尝试构建配置对象 (此处简化，实际可能需要更稳健的构建逻辑)
-                cfg = MainConfig.model_validate(job.config)
-            except Exception as e:
-                self._report_error(job.job_id, f"Invalid Config: {str(e)}")
+                job = _decode_job(payload)
+            except ValidationError as e:
+                # 负载结构合法、仅 config 非法时，仍按 job_id 上报错误
+                job_id = _decode_job(payload, _ENVELOPE_ADAPTER).job_id
+                self._report_error(job_id, f"Invalid Config: {str(e)}")
                 return
+            logger.info(f"Processing Job {job.job_id}...")
+            cfg = job.config
 
             # 定义进度回调
             def on_progress(progress: float, state: Dict[str, Any]):
                 self._report_progress(job.job_id, progress, state)
 
             # 运行回测
-            engine = BacktestEngine(cfg_obj=cfg, artifacts_dir=None) 
+            engine = self._get_engine(cfg)
             result = engine.run(progress_callback=on_progress)
             
             # 上报最终结果
@@ -74,6 +271,20 @@ class JobConsumer:
             if 'job' in locals():
                 self._report_error(job.job_id, str(e))
 
+    def _get_engine(self, cfg: MainConfig) -> BacktestEngine:
+        """按 `_engine_cache_key` 取可复用的引擎（LRU），命中时只替换配置。"""
+        key = _engine_cache_key(cfg)
+        engine = self._engine_cache.get(key)
+        if engine is None:
+            engine = BacktestEngine(cfg_obj=cfg, artifacts_dir=None)
+            self._engine_cache[key] = engine
+            if len(self._engine_cache) > _ENGINE_CACHE_SIZE:
+                self._engine_cache.popitem(last=False)
+        else:
+            engine.update_config(cfg)
+            self._engine_cache.move_to_end(key)
+        return engine
+
     def _report_progress(self, job_id: str, progress: float, state: Dict[str, Any]):
         msg = {
             "type": "progress",
@@ -81,7 +292,20 @@ class JobConsumer:
             "progress": progress,
             "state": state
         }
-        self.redis.publish(self.updates_channel, json.dumps(msg))
+        self._progress_pipe.publish(self.updates_channel, json.dumps(msg))
+        self._progress_pending += 1
+        if (
+            self._progress_pending >= _PROGRESS_BATCH
+            or time.monotonic() - self._progress_flushed_at >= _PROGRESS_FLUSH_INTERVAL
+        ):
+            self._flush_progress()
+
+    def _flush_progress(self):
+        """发出缓冲中的进度消息。"""
+        if self._progress_pending:
+            self._progress_pipe.execute()
+            self._progress_pending = 0
+        self._progress_flushed_at = time.monotonic()
 
     def _report_success(self, job_id: str, summary: Dict[str, Any]):
         msg = {
@@ -89,7 +313,9 @@ class JobConsumer:
             "job_id": job_id,
             "summary": summary
         }
-        self.redis.publish(self.updates_channel, json.dumps(msg))
+        # 先发完积压的进度，保证终态消息最后到达
+        self._flush_progress()
+        self.publish_redis.publish(self.updates_channel, json.dumps(msg))
         logger.info(f"Job {job_id} completed.")
 
     def _report_error(self, job_id: str, error: str):
@@ -98,5 +324,19 @@ class JobConsumer:
             "job_id": job_id,
             "error": error
         }
-        self.redis.publish(self.updates_channel, json.dumps(msg))
+        self._flush_progress()
+        self.publish_redis.publish(self.updates_channel, json.dumps(msg))
         logger.error(f"Job {job_id} failed: {error}")
+
+
+# 进程池子进程内的消费者：各自持有 Redis 连接、进度 pipeline 与引擎缓存，进度直接由子进程发布
+_CHILD: JobConsumer | None = None
+
+
+def _init_child(redis_url: str) -> None:
+    global _CHILD
+    _CHILD = JobConsumer(redis_url=redis_url)
+
+
+def _run_in_child(payload: bytes) -> None:
+    _CHILD._process_job(payload)
@@ -1,11 +1,20 @@
 """Helper utilities for saving experiment results to PostgreSQL database."""
 
+import json
 import os
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from zenith.database import BacktestDatabase
 
+# Sweep CSV columns that are metrics, not strategy parameters
+METRIC_COLS = frozenset({
+    'total_return', 'sharpe', 'max_drawdown', 'win_rate',
+    'total_trades', 'score', 'passed', 'filter_reason',
+    'avg_win', 'avg_loss', 'profit_factor', 'expectancy',
+    'avg_trade_return', 'std_trade_return', 'exposure', 'turnover',
+})
+
 def save_sweep_results_to_db(
     sweep_csv_path: str,
     symbol: str,
@@ -40,68 +49,50 @@ def save_sweep_results_to_db(
         print("   Results saved to CSV only (database skipped)")
         return 0
     
-    saved_count = 0
     run_ts = Path(sweep_csv_path).parent.name  # Extract timestamp from path
+    n = len(df)
+    
+    # Parameter columns = everything that is not a metric (computed once for the whole frame)
+    # Project rows positionally: object matrix (native Python scalars) with NaN -> None,
+    # serialized with json.dumps so floats keep full precision
+    param_cols = [c for c in df.columns if c not in METRIC_COLS]
+    param_values = df[param_cols].to_numpy(dtype=object)
+    param_values[df[param_cols].isna().to_numpy()] = None
+    params_json = [json.dumps(dict(zip(param_cols, row)), default=str) for row in param_values.tolist()]
+    
+    def col(name, default=None):
+        return df[name] if name in df.columns else pd.Series(default, index=df.index, dtype=object)
     
-    for idx, row in df.iterrows():
-        try:
-            # Extract run ID from file path structure
-            # Example: results/sweep/SOLUSDT/1h/2021-01-01_2024-01-01/20251219205516/SOLUSDT/sweep.csv
-            run_id = f"{symbol}_{timeframe}_{run_ts}_{idx}"
-            
-            # Build params dict
-            params = {}
-            for col in df.columns:
-                if col not in ['total_return', 'sharpe', 'max_drawdown', 'win_rate', 
-                               'total_trades', 'score', 'passed', 'filter_reason',
-                               'avg_win', 'avg_loss', 'profit_factor', 'expectancy',
-                               'avg_trade_return', 'std_trade_return', 'exposure', 'turnover']:
-                    params[col] = row[col] if pd.notna(row[col]) else None
-            
-            # Build metrics dict
-            metrics = {
-                'total_return': row.get('total_return'),
-                'sharpe': row.get('sharpe'),
-                'max_drawdown': row.get('max_drawdown'),
-                'win_rate': row.get('win_rate'),
-                'total_trades': int(row['total_trades']) if pd.notna(row.get('total_trades')) else 0,
-                'avg_win': row.get('avg_win'),
-                'avg_loss': row.get('avg_loss'),
-                'profit_factor': row.get('profit_factor'),
-                'expectancy': row.get('expectancy'),
-                'avg_trade_return': row.get('avg_trade_return'),
-                'std_trade_return': row.get('std_trade_return'),
-                'exposure': row.get('exposure'),
-                'turnover': row.get('turnover'),
-                'score': row.get('score', 0.0),
-            }
-            
-            # Save to database (no equity/trades for sweep results)
-            db.save_backtest(
-                run_id=run_id,
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date,
-                strategy_name=strategy_name,
-                params=params,
-                metrics=metrics,
-                equity_curve=None,  # Don't save equity for sweep (storage optimization)
-                trades=None,         # Don't save trades for sweep
-                score=metrics['score'],
-                passed=bool(row.get('passed', True)),
-            )
-            
-            saved_count += 1
-            
-        except Exception as e:
-            if verbose:
-                print(f"⚠️  Failed to save row {idx}: {e}")
-            continue
+    # One backtests row per sweep row
+    # Run ID example: results/sweep/SOLUSDT/1h/2021-01-01_2024-01-01/20251219205516/SOLUSDT/sweep.csv
+    rows = pd.DataFrame({
+        'run_id': [f"{symbol}_{timeframe}_{run_ts}_{idx}" for idx in df.index],
+        'symbol': symbol,
+        'timeframe': timeframe,
+        'start_date': start_date,
+        'end_date': end_date,
+        'strategy_name': strategy_name,
+        'params': params_json,
+        'total_return': col('total_return'),
+        'sharpe_ratio': col('sharpe'),
+        'max_drawdown': col('max_drawdown'),
+        'win_rate': col('win_rate'),
+        'total_trades': pd.to_numeric(col('total_trades', 0), errors='coerce').fillna(0).astype(int),
+        'score': col('score', 0.0),
+        'passed': col('passed', True).fillna(True).astype(bool),
+    }, index=df.index)
     
-    db.close()
+    # Single COPY + upsert in one transaction (no equity/trades for sweep results)
+    try:
+        saved_count = db.save_backtests_bulk(rows)
+    except Exception as e:
+        saved_count = 0
+        if verbose:
+            print(f"⚠️  Failed to save sweep results: {e}")
+    finally:
+        db.close()
     
     if verbose:
-        print(f"✅ Saved {saved_count}/{len(df)} sweep results to PostgreSQL")
+        print(f"✅ Saved {saved_count}/{n} sweep results to PostgreSQL")
     
     return saved_count
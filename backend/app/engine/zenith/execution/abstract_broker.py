@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from enum import Enum
+from typing import Sequence
 
 from zenith.common.models.models import OrderSignal, Position
 
@@ -37,3 +38,6 @@ class Broker(ABC):
     def execute(self, signal: OrderSignal, **kwargs) -> dict:
         """执行策略信号（允许实现接受额外参数）。"""
 
+    def execute_many(self, signals: Sequence[OrderSignal], **kwargs) -> list[dict]:
+        """按顺序批量执行信号；默认逐个调用 `execute`，子类可覆盖以摊销每笔的公共开销。"""
+        return [self.execute(sig, **kwargs) for sig in signals]
@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Sequence
 
 from zenith.execution.abstract_broker import Broker
 from zenith.execution.execution.simulator import BacktestFillSimulator
@@ -59,6 +60,33 @@ class BacktestBroker(Broker):
         record_equity: bool = True,
         **kwargs,
     ) -> dict:
+        res = self._execute_one(signal, tick_price, ts, record_equity)
+        if res["status"] == "filled":
+            self.unrealized_pnl = self._compute_unrealized_pnl()
+        return res
+
+    def execute_many(
+        self,
+        signals: Sequence[OrderSignal],
+        tick_price: float | None = None,
+        ts: datetime | None = None,
+        record_equity: bool = True,
+        **kwargs,
+    ) -> list[dict]:
+        """批量执行同一 tick 的信号：逐笔撮合，未实现 PnL 在整批结束后只重算一次。"""
+        results = [self._execute_one(sig, tick_price, ts, record_equity) for sig in signals]
+        if any(r["status"] == "filled" for r in results):
+            self.unrealized_pnl = self._compute_unrealized_pnl()
+        return results
+
+    def _execute_one(
+        self,
+        signal: OrderSignal,
+        tick_price: float | None,
+        ts: datetime | None,
+        record_equity: bool,
+    ) -> dict:
+        """撮合单笔信号并更新现金/持仓/成交记录（不刷新 `unrealized_pnl`）。"""
         cid = getattr(signal, "client_order_id", None)
         if cid:
             if cid in self._seen_client_order_ids:
@@ -107,7 +135,6 @@ class BacktestBroker(Broker):
         self.realized_pnl_today += fill.realized_delta
         self.last_prices[signal.symbol] = fill.exec_price
 
-        self.unrealized_pnl = self._compute_unrealized_pnl()
         equity = self.cash + sum(
             p.qty * self.last_prices.get(sym, p.avg_price) for sym, p in self.positions.items()
         )
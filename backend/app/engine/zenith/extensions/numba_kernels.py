@@ -0,0 +1,206 @@
+"""Numba 加速内核。
+
+numba 为可选依赖（`pip install -e .[accel]`）：未安装时 `HAS_NUMBA=False`，
+内核退化为普通 Python 函数（仍可调用，用于测试），调用方应优先回退到 pandas 实现。
+
+约定：
+- 输入为 float64 一维连续数组；
+- 输出与输入等长，预热期为 NaN，NaN 语义与 pandas `rolling(min_periods=period)` 对齐。
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit as _njit
+except ImportError:  # pragma: no cover - 取决于运行环境
+    _njit = None
+
+HAS_NUMBA = _njit is not None
+
+
+def _kernel(fn):
+    """numba 可用时以 `njit(cache=True)` 编译，否则原样返回。"""
+    if _njit is None:
+        return fn
+    return _njit(cache=True)(fn)
+
+
+@_kernel
+def atr_sma(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """ATR（SMA 版本）单趟内核：TR 计算与滚动均值融合在一次遍历中。"""
+    n = min(high.shape[0], low.shape[0], close.shape[0])
+    out = np.full(n, np.nan)
+    ring = np.full(period, np.nan)
+    total = 0.0
+    count = 0
+    for i in range(n):
+        h = high[i]
+        lo = low[i]
+        # 与 pandas `concat(...).max(axis=1)` 一致：跳过 NaN 取最大
+        tr = h - lo
+        if i > 0:
+            pc = close[i - 1]
+            tr2 = abs(h - pc)
+            tr3 = abs(lo - pc)
+            if math.isnan(tr) or tr2 > tr:
+                tr = tr2
+            if math.isnan(tr) or tr3 > tr:
+                tr = tr3
+
+        slot = i % period
+        old = ring[slot]
+        if not math.isnan(old):
+            total -= old
+            count -= 1
+        ring[slot] = tr
+        if not math.isnan(tr):
+            total += tr
+            count += 1
+        if count >= period:
+            out[i] = total / period
+    return out
+
+
+@_kernel
+def ema_adjust_false(values: np.ndarray, period: int) -> np.ndarray:
+    """EMA 递推内核，与 pandas `ewm(span=period, adjust=False, min_periods=period)` 对齐。
+
+    `s_i = alpha * x_i + (1 - alpha) * s_{i-1}`，以首个有效值作为初值；
+    NaN 处理沿用 pandas 的 `ignore_na=False` 语义（缺失期间旧权重继续衰减）。
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+    alpha = 2.0 / (period + 1.0)
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    nobs = 0 if math.isnan(weighted) else 1
+    if nobs >= period:
+        out[0] = weighted
+    old_wt = 1.0
+    for i in range(1, n):
+        cur = values[i]
+        is_obs = not math.isnan(cur)
+        if is_obs:
+            nobs += 1
+        if not math.isnan(weighted):
+            old_wt *= old_wt_factor
+            if is_obs:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = cur
+        if nobs >= period:
+            out[i] = weighted
+    return out
+
+
+@_kernel
+def rsi_sma(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI（SMA 版本）单趟内核：差分、涨跌拆分与两路滚动和融合在一次遍历中。
+
+    与 pandas `diff -> clip -> rolling(period).mean()` 对齐（含 0/0 -> NaN）。
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    gains = np.full(period, np.nan)
+    losses = np.full(period, np.nan)
+    sum_gain = 0.0
+    sum_loss = 0.0
+    count = 0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        slot = i % period
+        old = gains[slot]
+        if not math.isnan(old):
+            sum_gain -= old
+            sum_loss -= losses[slot]
+            count -= 1
+        if math.isnan(delta):
+            gains[slot] = np.nan
+            losses[slot] = np.nan
+        else:
+            g = delta if delta > 0.0 else 0.0
+            lo = -delta if delta < 0.0 else 0.0
+            gains[slot] = g
+            losses[slot] = lo
+            sum_gain += g
+            sum_loss += lo
+            count += 1
+        if count >= period:
+            if sum_loss == 0.0:
+                if sum_gain > 0.0:
+                    out[i] = 100.0
+            else:
+                rs = sum_gain / sum_loss
+                out[i] = 100.0 - 100.0 / (1.0 + rs)
+    return out
+
+
+@_kernel
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """LTTB（Largest-Triangle-Three-Buckets）降采样，返回保留点的下标（升序，含首尾）。
+
+    与上面的滚动内核不同，输出长度为 `min(n_out, n)`，用于绘图前压缩长曲线。
+    """
+    n = x.shape[0]
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # 下一个桶的均值点
+        avg_start = int(math.floor((i + 1) * every)) + 1
+        avg_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(avg_start, avg_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        cnt = avg_end - avg_start
+        avg_x /= cnt
+        avg_y /= cnt
+
+        # 当前桶内选与 (上一个选中点, 下一桶均值点) 构成三角形面积最大的点
+        start = int(math.floor(i * every)) + 1
+        end = int(math.floor((i + 1) * every)) + 1
+        ax = x[a]
+        ay = y[a]
+        best = start
+        max_area = -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                best = j
+        idx[i + 1] = best
+        a = best
+    return idx
+
+
+@_kernel
+def drawdown(y: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """回撤比例单趟内核：滚动峰值与 (peak - y) / peak 融合在一次遍历中（peak 为 0 时记 0）。
+
+    NaN 语义与 `np.maximum.accumulate` 一致：出现 NaN 后峰值及其后回撤均为 NaN。
+    """
+    n = y.shape[0]
+    if out is None:
+        out = np.empty(n)
+    out = out[:n]
+    peak = -np.inf
+    for i in range(n):
+        v = y[i]
+        if math.isnan(v) or v > peak:
+            peak = v
+        out[i] = (peak - v) / peak if peak != 0.0 else 0.0
+    return out
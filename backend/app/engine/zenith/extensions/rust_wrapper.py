@@ -14,27 +14,38 @@ class RustSimulator:
     def __init__(self):
         pass
 
-    def calculate_indicators(self, closes: List[float], name: str, period: int) -> List[float]:
+    def calculate_indicators(self, closes: np.ndarray | List[float], name: str, period: int) -> np.ndarray:
         """调用 Rust 计算通用指标。"""
         try:
             if name == "ma":
-                return zenithalgo_rust.ma(closes, period)
+                return zenithalgo_rust.ma(np.ascontiguousarray(closes, dtype=np.float64), period)
             elif name == "stddev":
-                return zenithalgo_rust.stddev(closes, period)
+                return zenithalgo_rust.stddev(np.ascontiguousarray(closes, dtype=np.float64), period)
             elif name == "ema":
-                return zenithalgo_rust.ema(closes, period)
+                return zenithalgo_rust.ema(np.ascontiguousarray(closes, dtype=np.float64), period)
             elif name == "rsi":
-                return zenithalgo_rust.rsi(closes, period)
+                return zenithalgo_rust.rsi(np.ascontiguousarray(closes, dtype=np.float64), period)
             else:
                 raise ValueError(f"Unknown indicator: {name}")
         except Exception as e:
             # Re-raise with context
             raise RuntimeError(f"Rust indicator calculation failed for {name}: {e}") from e
 
-    def calculate_atr(self, highs: List[float], lows: List[float], closes: List[float], period: int) -> List[float]:
+    def calculate_atr(
+        self,
+        highs: np.ndarray | List[float],
+        lows: np.ndarray | List[float],
+        closes: np.ndarray | List[float],
+        period: int,
+    ) -> np.ndarray:
         """可能直接调用 Rust ATR。"""
         try:
-            return zenithalgo_rust.atr(highs, lows, closes, period)
+            return zenithalgo_rust.atr(
+                np.ascontiguousarray(highs, dtype=np.float64),
+                np.ascontiguousarray(lows, dtype=np.float64),
+                np.ascontiguousarray(closes, dtype=np.float64),
+                period,
+            )
         except Exception as e:
             raise RuntimeError(f"Rust ATR calculation failed: {e}") from e
 
@@ -70,11 +81,12 @@ class RustSimulator:
 
         # 3. 准备基础数据数组
         data_len = len(df)
-        timestamps = df["end_ts"].astype("int64") // 10**9  # seconds
-        opens = df["open"].astype(float).values
-        highs = df["high"].astype(float).values
-        lows = df["low"].astype(float).values
-        closes = df["close"].astype(float).values
+        timestamps = df["end_ts"].astype("int64").to_numpy() // 10**9  # seconds
+        # 列已是 float64 时不复制（astype(float) 总会拷贝一份）
+        opens = df["open"].to_numpy(dtype=np.float64, copy=False)
+        highs = df["high"].to_numpy(dtype=np.float64, copy=False)
+        lows = df["low"].to_numpy(dtype=np.float64, copy=False)
+        closes = df["close"].to_numpy(dtype=np.float64, copy=False)
 
         # 4. 解析参数 / ATR预计算
         sl_val, tp_val, use_atr, atr_values = self._prepare_risk_params(
@@ -83,18 +95,19 @@ class RustSimulator:
         
         # 5. 调用 Rust 核心
         try:
+            # 直接传 ndarray（Rust 侧零拷贝读取），不再经 tolist() 装箱成 Python 对象
             return zenithalgo_rust.simulate_trades(
-                timestamps.tolist(),
-                opens.tolist(),
-                highs.tolist(),
-                lows.tolist(),
-                closes.tolist(),
-                signal_array.tolist(),
+                np.ascontiguousarray(timestamps, dtype=np.int64),
+                np.ascontiguousarray(opens),
+                np.ascontiguousarray(highs),
+                np.ascontiguousarray(lows),
+                np.ascontiguousarray(closes),
+                np.ascontiguousarray(signal_array, dtype=np.int32),
                 sl_val,
                 tp_val,
                 False, # allow_short (Default False for now, or extract from config if passed)
                 use_atr,
-                atr_values
+                np.ascontiguousarray(atr_values, dtype=np.float64),
             )
         except Exception as e:
             raise RuntimeError(f"Rust simulation failed: {e}") from e
@@ -102,29 +115,31 @@ class RustSimulator:
     def _prepare_signals(self, price_df: pd.DataFrame, signals: Iterable[Dict[str, Any]] | pd.DataFrame) -> np.ndarray:
         """将稀疏信号转换为对齐的稠密数组。"""
         if isinstance(signals, pd.DataFrame):
-            sig_df = signals.copy()
+            sig_df = signals
         else:
             sig_df = pd.DataFrame(list(signals))
         
-        if sig_df.empty:
-            return np.zeros(len(price_df), dtype=np.int32)
+        n = len(price_df)
+        dense = np.zeros(n, dtype=np.int32)
+        if sig_df.empty or n == 0:
+            return dense
         
-        if "ts" in sig_df.columns:
-            if not pd.api.types.is_datetime64_any_dtype(sig_df["ts"]):
-                sig_df["ts"] = pd.to_datetime(sig_df["ts"], utc=True)
+        sig_ts = sig_df["ts"]
+        if not pd.api.types.is_datetime64_any_dtype(sig_ts):
+            sig_ts = pd.to_datetime(sig_ts, utc=True)
         
-        # Map side to int
-        val_map = {"buy": 1, "sell": -1}
-        sig_df["val"] = sig_df["side"].map(val_map).fillna(0).astype(int)
+        # Map side to int: buy=1, sell=-1, 其它=0
+        side = sig_df["side"].to_numpy()
+        val = np.where(side == "buy", 1, np.where(side == "sell", -1, 0)).astype(np.int32)
         
-        # Merge to align with price index
-        merged = price_df[["end_ts"]].merge(
-            sig_df[["ts", "val"]], 
-            left_on="end_ts", 
-            right_on="ts", 
-            how="left"
-        )
-        return merged["val"].fillna(0).astype(np.int32).values
+        # price_df 已按 end_ts 升序：二分定位信号所在 bar，只保留时间戳精确命中的信号
+        price_ts = price_df["end_ts"].to_numpy(dtype="datetime64[ns]")
+        sig_ts = sig_ts.to_numpy(dtype="datetime64[ns]")
+        idx = np.searchsorted(price_ts, sig_ts)
+        hit = idx < n
+        hit[hit] = price_ts[idx[hit]] == sig_ts[hit]
+        dense[idx[hit]] = val[hit]
+        return dense
 
     def _prepare_risk_params(
         self, 
@@ -133,7 +148,7 @@ class RustSimulator:
         closes: np.ndarray, 
         params: Dict[str, Any],
         data_len: int
-    ) -> Tuple[float, float, bool, List[float]]:
+    ) -> Tuple[float, float, bool, np.ndarray]:
         """根据参数决定风控模式并计算 ATR。"""
         
         fixed_sl = float(params.get("stop_loss", 0.0))
@@ -145,7 +160,7 @@ class RustSimulator:
         use_atr = False
         sl_val = fixed_sl
         tp_val = fixed_tp
-        atr_values = [] # Empty if not used
+        atr_values = np.empty(0) # Empty if not used
 
         if atr_sl_mult > 0:
             use_atr = True
@@ -156,14 +171,15 @@ class RustSimulator:
             atr_period = int(params.get("atr_period", 14))
             try:
                 raw_atr = zenithalgo_rust.atr(
-                    highs.tolist(), 
-                    lows.tolist(), 
-                    closes.tolist(), 
+                    np.ascontiguousarray(highs, dtype=np.float64),
+                    np.ascontiguousarray(lows, dtype=np.float64),
+                    np.ascontiguousarray(closes, dtype=np.float64),
                     atr_period
                 )
                 # Handle NaNs: Rust returns NaN for warming up periods.
-                # Replace NaNs with 0.0
-                atr_values = [0.0 if np.isnan(x) else x for x in raw_atr]
+                # Replace NaNs with 0.0（Rust 返回的是新分配的 ndarray，原地替换）
+                atr_values = np.asarray(raw_atr, dtype=np.float64)
+                atr_values[np.isnan(atr_values)] = 0.0
             except Exception as e:
                 # Log or re-raise? Ideally re-raise to detect config errors
                 raise RuntimeError(f"Rust ATR calculation failed: {e}") from e
@@ -174,6 +190,6 @@ class RustSimulator:
             # Ideally passing empty vec is fine if use_atr is false, 
             # but let's check Rust implementation or safe side pass zeros.
             # Looking at previous code, we passed [0.0] * len.
-             atr_values = [0.0] * data_len
+             atr_values = np.zeros(data_len, dtype=np.float64)
 
         return sl_val, tp_val, use_atr, atr_values
@@ -1,14 +1,43 @@
 """策略抽象接口定义。"""
 
 from abc import ABC, abstractmethod
+from typing import Sequence
+
+import pandas as pd
 
 from zenith.common.models.models import Tick, OrderSignal
 
+# 无信号时共享返回的空序列（不可变），避免每个 tick 分配空 list
+NO_SIGNALS: tuple[OrderSignal, ...] = ()
+
 class Strategy(ABC):
-    """策略抽象基类。"""
+    """策略抽象基类。
+
+    `supports_vector=True` 的策略额外实现 `on_bars`，向量化回测据此
+    一次性对整段 K 线生成信号，而不是逐 tick 调用 `on_tick`。
+    """
+
+    supports_vector: bool = False
+    # 可由配置传入的构造参数名；注册表优先用它过滤参数，未声明（None）时回退到 inspect
+    PARAMS: frozenset[str] | None = None
+
+    def on_bars(self, df: pd.DataFrame) -> pd.DataFrame:
+        """向量化生成信号。
+
+        Parameters
+        ----------
+        df:
+            按时间排序的 K 线，至少包含 `end_ts` 与 `close`。
+
+        Returns
+        -------
+        pd.DataFrame
+            信号表，列为 `ts` / `side`（"buy" / "sell"）。
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support vectorized backtest")
 
     @abstractmethod
-    def on_tick(self, tick: Tick) -> list[OrderSignal]:
+    def on_tick(self, tick: Tick) -> Sequence[OrderSignal]:
         """处理单个 Tick 并输出交易信号。
 
         Parameters
@@ -18,7 +47,7 @@ class Strategy(ABC):
 
         Returns
         -------
-        list[OrderSignal]
-            0~N 个订单信号。
+        Sequence[OrderSignal]
+            0~N 个订单信号；无信号时可返回 `NO_SIGNALS`，调用方不应原地修改返回值。
         """
         ...
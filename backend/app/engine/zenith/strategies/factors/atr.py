@@ -3,21 +3,34 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, ClassVar
 
+import numpy as np
 import pandas as pd
 
 from zenith.common.utils.logging import setup_logger
+from zenith.strategies.factors.base import float_column, has_column
+from zenith.extensions.numba_kernels import HAS_NUMBA, atr_sma
+
+try:
+    import zenithalgo_rust as _RUST
+except ImportError:
+    _RUST = None
+_HAS_RUST = _RUST is not None
 
 _LOGGER = setup_logger("factor-atr")
 _RUST_LOGGED = False
+_NUMBA_LOGGED = False
 _FALLBACK_LOGGED = False
 
 
-@dataclass(frozen=True)
+@dataclass
 class ATRFactor:
     """平均真实波幅（ATR，SMA 版本）。"""
 
+    # 可由配置传入的构造参数（注册表据此过滤，无需 inspect）
+    PARAMS: ClassVar[frozenset[str]] = frozenset({"period", "high_col", "low_col", "close_col", "out_col"})
+
     period: int = 14
     high_col: str = "high"
     low_col: str = "low"
@@ -29,48 +42,52 @@ class ATRFactor:
     def __post_init__(self):
         if self.period <= 0:
             raise ValueError("ATR period must be > 0")
-        object.__setattr__(
-            self,
-            "params",
-            {
-                "period": self.period,
-                "high_col": self.high_col,
-                "low_col": self.low_col,
-                "close_col": self.close_col,
-                "out_col": self.out_col,
-            },
-        )
+        self.params = {
+            "period": self.period,
+            "high_col": self.high_col,
+            "low_col": self.low_col,
+            "close_col": self.close_col,
+            "out_col": self.out_col,
+        }
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(**self.compute_array(df))
+
+    def compute_array(
+        self, df: pd.DataFrame, col_cache: dict[str, np.ndarray] | None = None
+    ) -> dict[str, np.ndarray]:
+        """计算因子并以 `{列名: ndarray}` 返回，不修改 df。"""
         for col in (self.high_col, self.low_col, self.close_col):
-            if col not in df.columns:
+            if not has_column(df, col, col_cache):
                 raise ValueError(f"ATRFactor requires column: {col}")
         out = self.out_col or f"atr_{self.period}"
+        # float64 连续缓冲区：Rust 侧零拷贝读取，且同一列在多个因子间只转换一次
+        high = float_column(df, self.high_col, col_cache)
+        low = float_column(df, self.low_col, col_cache)
+        close = float_column(df, self.close_col, col_cache)
 
-        try:
-            import zenithalgo_rust
-        except Exception:
-            zenithalgo_rust = None
-        if zenithalgo_rust is not None:
+        if _HAS_RUST:
             global _RUST_LOGGED
             if not _RUST_LOGGED:
                 _LOGGER.info("ATRFactor 使用 Rust 算子加速。")
                 _RUST_LOGGED = True
-            high = df[self.high_col].astype(float).to_list()
-            low = df[self.low_col].astype(float).to_list()
-            close = df[self.close_col].astype(float).to_list()
-            df[out] = zenithalgo_rust.atr(high, low, close, int(self.period))  # type: ignore
-            return df
+            return {out: np.asarray(_RUST.atr(high, low, close, int(self.period)))}  # type: ignore
+        if HAS_NUMBA:
+            global _NUMBA_LOGGED
+            if not _NUMBA_LOGGED:
+                _LOGGER.info("ATRFactor Rust 算子不可用，使用 Numba 内核。")
+                _NUMBA_LOGGED = True
+            # 每次返回新数组：结果交给调用方持有，不能指向跨调用复用的缓冲区
+            return {out: atr_sma(high, low, close, int(self.period))}
         global _FALLBACK_LOGGED
         if not _FALLBACK_LOGGED:
             _LOGGER.warning("ATRFactor Rust 算子不可用，回退到 pandas。")
             _FALLBACK_LOGGED = True
 
-        prev_close = df[self.close_col].shift(1)
-        tr1 = df[self.high_col] - df[self.low_col]
-        tr2 = (df[self.high_col] - prev_close).abs()
-        tr3 = (df[self.low_col] - prev_close).abs()
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        prev_close = np.empty_like(close)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
+        # fmax 跳过 NaN，与 pandas 行向 max(axis=1) 语义一致，且无需拼出 N×3 的 DataFrame
+        tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
 
-        df[out] = tr.rolling(self.period, min_periods=self.period).mean()
-        return df
+        return {out: pd.Series(tr).rolling(self.period, min_periods=self.period).mean().to_numpy(dtype=np.float64)}
@@ -2,17 +2,44 @@
 
 from __future__ import annotations
 
-from typing import Any, Mapping, Protocol
+from typing import Any, Mapping, MutableMapping, Protocol
 
+import numpy as np
 import pandas as pd
 
 
 class Factor(Protocol):
-    """因子协议：`compute(df) -> df`。"""
+    """因子协议：`compute(df) -> df`。
+
+    约定 `compute` 返回带新增因子列的 df，调用方必须使用返回值；
+    内置因子通过 `df.assign` 返回新 df，不原地修改输入。
+
+    内置因子另外提供 `compute_array(df, col_cache=None) -> {列名: ndarray}`（不修改 df），
+    `apply_factors` 优先使用它收集所有输出列后一次性拼接。
+    """
 
     name: str
     params: Mapping[str, Any]
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
-        """对输入 df 添加/更新因子列并返回 df。"""
+        """返回添加/更新了因子列的 df。"""
         ...
+
+
+def has_column(df: pd.DataFrame, name: str, cache: Mapping[str, np.ndarray] | None = None) -> bool:
+    """列是否存在于 df 或列缓存（含前序因子尚未拼接的输出）。"""
+    return name in df.columns or (cache is not None and name in cache)
+
+
+def float_column(
+    df: pd.DataFrame, name: str, cache: MutableMapping[str, np.ndarray] | None = None
+) -> np.ndarray:
+    """以 float64 连续数组读取列；传入 cache 时同一列只转换一次，供多个因子共享。"""
+    if cache is not None:
+        arr = cache.get(name)
+        if arr is not None:
+            return arr
+    arr = np.ascontiguousarray(df[name].to_numpy(dtype=np.float64, copy=False))
+    if cache is not None:
+        cache[name] = arr
+    return arr
@@ -3,21 +3,32 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, ClassVar
 
+import numpy as np
 import pandas as pd
 
 from zenith.common.utils.logging import setup_logger
+from zenith.strategies.factors.base import float_column, has_column
+
+try:
+    import zenithalgo_rust as _RUST
+except ImportError:
+    _RUST = None
+_HAS_RUST = _RUST is not None
 
 _LOGGER = setup_logger("factor-ma")
 _RUST_LOGGED = False
 _FALLBACK_LOGGED = False
 
 
-@dataclass(frozen=True)
+@dataclass
 class MAFactor:
     """简单移动平均（SMA）。"""
 
+    # 可由配置传入的构造参数（注册表据此过滤，无需 inspect）
+    PARAMS: ClassVar[frozenset[str]] = frozenset({"window", "price_col", "out_col"})
+
     window: int
     price_col: str = "close"
     out_col: str | None = None
@@ -27,36 +38,33 @@ class MAFactor:
     def __post_init__(self):
         if self.window <= 0:
             raise ValueError("MA window must be > 0")
-        object.__setattr__(
-            self,
-            "params",
-            {
-                "window": self.window,
-                "price_col": self.price_col,
-                "out_col": self.out_col,
-            },
-        )
+        self.params = {
+            "window": self.window,
+            "price_col": self.price_col,
+            "out_col": self.out_col,
+        }
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
-        if self.price_col not in df.columns:
+        return df.assign(**self.compute_array(df))
+
+    def compute_array(
+        self, df: pd.DataFrame, col_cache: dict[str, np.ndarray] | None = None
+    ) -> dict[str, np.ndarray]:
+        """计算因子并以 `{列名: ndarray}` 返回，不修改 df。"""
+        if not has_column(df, self.price_col, col_cache):
             raise ValueError(f"MAFactor requires column: {self.price_col}")
         out = self.out_col or f"ma_{self.window}"
-        try:
-            import zenithalgo_rust
-        except Exception:
-            zenithalgo_rust = None
-        if zenithalgo_rust is not None:
+        values = float_column(df, self.price_col, col_cache)
+        if _HAS_RUST:
             global _RUST_LOGGED
             if not _RUST_LOGGED:
                 _LOGGER.info("MAFactor 使用 Rust 算子加速。")
                 _RUST_LOGGED = True
             # Rust 版本：输入数组，输出与原长度一致的均线序列
-            values = df[self.price_col].astype(float).to_list()
-            df[out] = zenithalgo_rust.ma(values, int(self.window))  # type: ignore
-            return df
+            return {out: np.asarray(_RUST.ma(values, int(self.window)), dtype=np.float64)}  # type: ignore
         global _FALLBACK_LOGGED
         if not _FALLBACK_LOGGED:
             _LOGGER.warning("MAFactor Rust 算子不可用，回退到 pandas。")
             _FALLBACK_LOGGED = True
-        df[out] = df[self.price_col].rolling(self.window, min_periods=self.window).mean()
-        return df
+        ma = pd.Series(values).rolling(self.window, min_periods=self.window).mean()
+        return {out: ma.to_numpy(dtype=np.float64)}
@@ -5,6 +5,7 @@ from __future__ import annotations
 import inspect
 from typing import Any, Mapping
 
+import numpy as np
 import pandas as pd
 
 from zenith.strategies.factors.atr import ATRFactor
@@ -14,6 +15,8 @@ from zenith.strategies.factors.rsi import RSIFactor
 from zenith.strategies.factors.ema import EMAFactor
 
 _REGISTRY: dict[str, type] = {}
+# 未声明 PARAMS 的类 -> __init__ 可接受参数名；inspect.signature 较慢，网格搜索中会被反复调用
+_ALLOWED_KWARGS_CACHE: dict[type, frozenset[str] | None] = {}
 
 
 def register_factor(name: str, cls: type) -> None:
@@ -25,17 +28,37 @@ def get_factor_cls(name: str) -> type:
         raise ValueError(f"Unknown factor: {name}")
     return _REGISTRY[name]
 
-def _filter_init_kwargs(cls: type, params: Mapping[str, Any]) -> dict[str, Any]:
-    """过滤出 __init__ 支持的参数，避免配置里多字段导致报错。"""
+def _allowed_init_kwargs(cls: type) -> frozenset[str] | None:
+    """返回 __init__ 可接受的参数名；None 表示不过滤。
+
+    优先使用类自身声明的 `PARAMS`（不继承，避免子类新增参数被误过滤），
+    未声明时才用 inspect 解析签名并按类缓存。
+    """
+    declared = cls.__dict__.get("PARAMS")
+    if declared is not None:
+        return declared
+    if cls in _ALLOWED_KWARGS_CACHE:
+        return _ALLOWED_KWARGS_CACHE[cls]
+
+    allowed: frozenset[str] | None
     try:
         sig = inspect.signature(cls.__init__)
     except Exception:
-        return dict(params)
+        allowed = None
+    else:
+        if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()):
+            allowed = None
+        else:
+            allowed = frozenset(sig.parameters) - {"self"}
+    _ALLOWED_KWARGS_CACHE[cls] = allowed
+    return allowed
 
-    if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()):
-        return dict(params)
 
-    allowed = {name for name in sig.parameters.keys() if name != "self"}
+def _filter_init_kwargs(cls: type, params: Mapping[str, Any]) -> dict[str, Any]:
+    """过滤出 __init__ 支持的参数，避免配置里多字段导致报错。"""
+    allowed = _allowed_init_kwargs(cls)
+    if allowed is None:
+        return dict(params)
     return {k: v for k, v in params.items() if k in allowed}
 
 
@@ -85,10 +108,38 @@ def build_factors(cfg: Any) -> list[Factor]:
     return factors
 
 
+def _attach_columns(df: pd.DataFrame, cols: dict[str, np.ndarray]) -> pd.DataFrame:
+    """把收集到的因子列一次性拼到 df 上（同名列覆盖）。"""
+    if not cols:
+        return df
+    overlap = [c for c in cols if c in df.columns]
+    if overlap:
+        df = df.drop(columns=overlap)
+    return pd.concat([df, pd.DataFrame(cols, index=df.index)], axis=1)
+
+
 def apply_factors(df: pd.DataFrame, factors: list[Factor]) -> pd.DataFrame:
+    """依次计算因子，返回带因子列的新 df。
+
+    支持 `compute_array` 的因子只返回 ndarray，最后统一拼接一次，
+    避免每个因子各自 `df[col] = ...` 触发的 BlockManager 反复扩列/合并。
+    """
+    pending: dict[str, np.ndarray] = {}
+    # 列缓存：float64 输入列只转换一次；前序因子输出也放入其中，后续因子可直接链式读取
+    col_cache: dict[str, np.ndarray] = {}
     for f in factors:
-        df = f.compute(df)
-    return df
+        compute_array = getattr(f, "compute_array", None)
+        if compute_array is None:
+            # 仅实现 compute 的因子需要看到完整 df：先落盘已收集的列
+            df = _attach_columns(df, pending)
+            pending = {}
+            df = f.compute(df)
+            col_cache.clear()
+            continue
+        arrays = compute_array(df, col_cache=col_cache)
+        pending.update(arrays)
+        col_cache.update(arrays)
+    return _attach_columns(df, pending)
 
 
 # 默认注册
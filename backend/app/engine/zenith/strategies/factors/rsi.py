@@ -3,21 +3,34 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, ClassVar
 
+import numpy as np
 import pandas as pd
 
 from zenith.common.utils.logging import setup_logger
+from zenith.strategies.factors.base import float_column, has_column
+from zenith.extensions.numba_kernels import HAS_NUMBA, rsi_sma
+
+try:
+    import zenithalgo_rust as _RUST
+except ImportError:
+    _RUST = None
+_HAS_RUST = _RUST is not None
 
 _LOGGER = setup_logger("factor-rsi")
 _RUST_LOGGED = False
+_NUMBA_LOGGED = False
 _FALLBACK_LOGGED = False
 
 
-@dataclass(frozen=True)
+@dataclass
 class RSIFactor:
     """相对强弱指数（RSI，SMA 版本）。"""
 
+    # 可由配置传入的构造参数（注册表据此过滤，无需 inspect）
+    PARAMS: ClassVar[frozenset[str]] = frozenset({"period", "price_col", "out_col"})
+
     period: int = 14
     price_col: str = "close"
     out_col: str | None = None
@@ -27,39 +40,44 @@ class RSIFactor:
     def __post_init__(self):
         if self.period <= 0:
             raise ValueError("RSI period must be > 0")
-        object.__setattr__(
-            self,
-            "params",
-            {
-                "period": self.period,
-                "price_col": self.price_col,
-                "out_col": self.out_col,
-            },
-        )
+        self.params = {
+            "period": self.period,
+            "price_col": self.price_col,
+            "out_col": self.out_col,
+        }
 
     def compute(self, df: pd.DataFrame) -> pd.DataFrame:
-        if self.price_col not in df.columns:
+        return df.assign(**self.compute_array(df))
+
+    def compute_array(
+        self, df: pd.DataFrame, col_cache: dict[str, np.ndarray] | None = None
+    ) -> dict[str, np.ndarray]:
+        """计算因子并以 `{列名: ndarray}` 返回，不修改 df。"""
+        if not has_column(df, self.price_col, col_cache):
             raise ValueError(f"RSIFactor requires column: {self.price_col}")
         out = self.out_col or f"rsi_{self.period}"
+        # float64 连续缓冲区：Rust 侧零拷贝读取，且同一列在多个因子间只转换一次
+        values = float_column(df, self.price_col, col_cache)
 
-        try:
-            import zenithalgo_rust
-        except Exception:
-            zenithalgo_rust = None
-        if zenithalgo_rust is not None:
+        if _HAS_RUST:
             global _RUST_LOGGED
             if not _RUST_LOGGED:
                 _LOGGER.info("RSIFactor 使用 Rust 算子加速。")
                 _RUST_LOGGED = True
-            values = df[self.price_col].astype(float).to_list()
-            df[out] = zenithalgo_rust.rsi(values, int(self.period))  # type: ignore
-            return df
+            return {out: np.asarray(_RUST.rsi(values, int(self.period)))}  # type: ignore
+        if HAS_NUMBA:
+            global _NUMBA_LOGGED
+            if not _NUMBA_LOGGED:
+                _LOGGER.info("RSIFactor Rust 算子不可用，使用 Numba 内核。")
+                _NUMBA_LOGGED = True
+            # 每次返回新数组：结果交给调用方持有，不能指向跨调用复用的缓冲区
+            return {out: rsi_sma(values, int(self.period))}
         global _FALLBACK_LOGGED
         if not _FALLBACK_LOGGED:
             _LOGGER.warning("RSIFactor Rust 算子不可用，回退到 pandas。")
             _FALLBACK_LOGGED = True
 
-        delta = df[self.price_col].diff()
+        delta = pd.Series(values).diff()
         gain = delta.clip(lower=0.0)
         loss = (-delta).clip(lower=0.0)
 
@@ -67,5 +85,4 @@ class RSIFactor:
         avg_loss = loss.rolling(self.period, min_periods=self.period).mean()
 
         rs = avg_gain / avg_loss
-        df[out] = 100.0 - (100.0 / (1.0 + rs))
-        return df
+        return {out: (100.0 - (100.0 / (1.0 + rs))).to_numpy(dtype=np.float64)}
@@ -14,6 +14,8 @@ from zenith.strategies.volatility import VolatilityBreakoutStrategy
 from zenith.common.config.config_loader import StrategyConfig
 
 _REGISTRY: dict[str, type[Strategy]] = {}
+# 未声明 PARAMS 的类 -> __init__ 可接受参数名；inspect.signature 较慢，网格搜索中会被反复调用
+_ALLOWED_KWARGS_CACHE: dict[type, frozenset[str] | None] = {}
 
 
 def register_strategy(name: str, cls: type[Strategy]) -> None:
@@ -26,17 +28,37 @@ def get_strategy_cls(name: str) -> type[Strategy]:
     return _REGISTRY[name]
 
 
-def _filter_init_kwargs(cls: type, params: Mapping[str, Any]) -> dict[str, Any]:
-    """过滤出 __init__ 支持的参数，避免配置里多字段导致报错。"""
+def _allowed_init_kwargs(cls: type) -> frozenset[str] | None:
+    """返回 __init__ 可接受的参数名；None 表示不过滤。
+
+    优先使用类自身声明的 `PARAMS`（不继承，避免子类新增参数被误过滤），
+    未声明时才用 inspect 解析签名并按类缓存。
+    """
+    declared = cls.__dict__.get("PARAMS")
+    if declared is not None:
+        return declared
+    if cls in _ALLOWED_KWARGS_CACHE:
+        return _ALLOWED_KWARGS_CACHE[cls]
+
+    allowed: frozenset[str] | None
     try:
         sig = inspect.signature(cls.__init__)
     except Exception:
-        return dict(params)
+        allowed = None
+    else:
+        if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()):
+            allowed = None
+        else:
+            allowed = frozenset(sig.parameters) - {"self"}
+    _ALLOWED_KWARGS_CACHE[cls] = allowed
+    return allowed
 
-    if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()):
-        return dict(params)
 
-    allowed = {name for name in sig.parameters.keys() if name != "self"}
+def _filter_init_kwargs(cls: type, params: Mapping[str, Any]) -> dict[str, Any]:
+    """过滤出 __init__ 支持的参数，避免配置里多字段导致报错。"""
+    allowed = _allowed_init_kwargs(cls)
+    if allowed is None:
+        return dict(params)
     return {k: v for k, v in params.items() if k in allowed}
 
 
@@ -6,10 +6,10 @@
 from collections import deque
 from datetime import datetime
 import math
-from typing import Deque
+from typing import Deque, Sequence
 
 from zenith.common.models.models import Tick, OrderSignal
-from .base import Strategy
+from .base import NO_SIGNALS, Strategy
 
 
 class SimpleMAStrategy(Strategy):
@@ -27,6 +27,18 @@ class SimpleMAStrategy(Strategy):
         信号冷却时间（秒）。
     """
 
+    PARAMS = frozenset(
+        {
+            "short_window",
+            "long_window",
+            "min_ma_diff",
+            "cooldown_secs",
+            "short_feature",
+            "long_feature",
+            "require_features",
+        }
+    )
+
     def __init__(
         self,
         short_window: int = 5,
@@ -46,9 +58,14 @@ class SimpleMAStrategy(Strategy):
         self.require_features = require_features
         self.last_trade_ts: datetime | None = None
         self.prices: Deque[float] = deque(maxlen=long_window)
+        # 增量维护两条均线的窗口和，避免每个 tick 重新复制/求和整个队列
+        self._short_prices: Deque[float] = deque(maxlen=short_window)
+        self._short_sum = 0.0
+        self._long_sum = 0.0
+        self._since_resync = 0
         self.last_signal: str | None = None  # "long" / "short" / None
 
-    def on_tick(self, tick: Tick) -> list[OrderSignal]:
+    def on_tick(self, tick: Tick) -> Sequence[OrderSignal]:
         """输入 Tick 输出 MA 交叉信号。"""
         short_ma: float | None = None
         long_ma: float | None = None
@@ -59,26 +76,41 @@ class SimpleMAStrategy(Strategy):
             short_ma = float(tick.features[self.short_feature])
             long_ma = float(tick.features[self.long_feature])
             if math.isnan(short_ma) or math.isnan(long_ma):
-                return []
+                return NO_SIGNALS
         else:
             if self.require_features:
-                return []
+                return NO_SIGNALS
             
             # 2. 如果没有特征，则在内存中维护价格队列实时计算 (Streaming 计算)
-            self.prices.append(tick.price)
+            # 窗口和按“加新值、减被挤出的旧值”增量更新，每个 tick O(1)。
+            price = tick.price
+            if len(self.prices) == self.long_window:
+                self._long_sum -= self.prices[0]
+            self.prices.append(price)
+            self._long_sum += price
+            if len(self._short_prices) == self.short_window:
+                self._short_sum -= self._short_prices[0]
+            self._short_prices.append(price)
+            self._short_sum += price
+            # 每滚动一个长窗口重算一次，限制浮点累积误差（摊还仍为 O(1)）
+            self._since_resync += 1
+            if self._since_resync >= self.long_window:
+                self._long_sum = sum(self.prices)
+                self._short_sum = sum(self._short_prices)
+                self._since_resync = 0
             if len(self.prices) < self.long_window:
-                return []
+                return NO_SIGNALS
 
-            short_ma = sum(list(self.prices)[-self.short_window:]) / self.short_window
-            long_ma = sum(self.prices) / len(self.prices)
+            short_ma = self._short_sum / self.short_window
+            long_ma = self._long_sum / len(self.prices)
 
         # 信号强度过滤 (Noise Filter)：
         # 如果两条均线过于接近（粘合），往往意味着震荡行情，此时交叉信号不可靠，容易反复止损（Whipsaw）。
         # 通过引入 min_ma_diff 阈值，只有当趋势明显（开口扩大）时才允许触发信号。
         if short_ma is None or long_ma is None:
-            return []
+            return NO_SIGNALS
         if abs(short_ma - long_ma) < self.min_ma_diff:
-            return []
+            return NO_SIGNALS
 
         now = tick.ts
         # 冷却过滤 (Cool-down)：
@@ -87,24 +119,22 @@ class SimpleMAStrategy(Strategy):
         if now and self.last_trade_ts is not None:
             delta = (now - self.last_trade_ts).total_seconds()
             if delta < self.cooldown_secs:
-                return []
-
-        signals: list[OrderSignal] = []
+                return NO_SIGNALS
 
         # 状态机逻辑 (State Machine)：
         # 仅当信号发生翻转（Signal Flip）时才产生动作。
         # 如果当前持有 Long 仓位 (last_signal="long") 且均线仍多头排列，则保持不动。
         if short_ma > long_ma and self.last_signal != "long":
             # 金叉：短周期上穿长周期 -> 买入做多
-            signals.append(OrderSignal(symbol=tick.symbol, side="buy", qty=0.0, reason="ma_cross_up"))
             self.last_signal = "long"
             self.last_trade_ts = now
-        elif short_ma < long_ma and self.last_signal != "short":
+            return [OrderSignal(symbol=tick.symbol, side="buy", qty=0.0, reason="ma_cross_up")]
+        if short_ma < long_ma and self.last_signal != "short":
             # 死叉：短周期下穿长周期 -> 卖出做空 (或平多反手)
             # 注意：具体是平仓还是反手开空，取决于 Execution 层和 Config 的 mode (LongOnly vs LS)。
             # 策略层只负责发出 "看空" 信号。
-            signals.append(OrderSignal(symbol=tick.symbol, side="sell", qty=0.0, reason="ma_cross_down"))
             self.last_signal = "short"
             self.last_trade_ts = now
+            return [OrderSignal(symbol=tick.symbol, side="sell", qty=0.0, reason="ma_cross_down")]
 
-        return signals
+        return NO_SIGNALS
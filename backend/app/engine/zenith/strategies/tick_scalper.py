@@ -8,6 +8,8 @@ from zenith.strategies.base import Strategy
 from zenith.common.models.models import Tick, OrderSignal
 
 class TickScalper(Strategy):
+    PARAMS = frozenset({"window", "threshold"})
+
     def __init__(self, window: int = 20, threshold: float = 0.0001):
         """
         Args:
@@ -36,6 +36,24 @@ class TrendFilteredStrategy(Strategy):
     策略只输出方向信号（qty=0），真实下单量由 sizing 统一决定。
     """
 
+    PARAMS = frozenset(
+        {
+            "short_window",
+            "long_window",
+            "slope_threshold",
+            "slope_lookback",
+            "atr_period",
+            "atr_stop_multiplier",
+            "short_feature",
+            "long_feature",
+            "atr_feature",
+            "require_features",
+            "fallback_to_local",
+            "stop_on_death_cross",
+            "stop_on_atr",
+        }
+    )
+
     def __init__(
         self,
         short_window: int = 10,
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import collections
-from typing import Any, Deque
+import math
+from typing import Any, Deque, Sequence
 
-from zenith.strategies.base import Strategy
+import pandas as pd
+
+from zenith.strategies.base import NO_SIGNALS, Strategy
 from zenith.common.models.models import OrderSignal, Tick
 
 class VolatilityBreakoutStrategy(Strategy):
@@ -21,6 +24,12 @@ class VolatilityBreakoutStrategy(Strategy):
     - k: 标准差倍数 (default 2.0)
     """
 
+    supports_vector = True
+
+    PARAMS = frozenset(
+        {"window", "k", "stop_loss", "take_profit", "atr_period", "atr_stop_multiplier", "use_ma_exit"}
+    )
+
     def __init__(
         self,
         window: int = 20,
@@ -48,13 +57,61 @@ class VolatilityBreakoutStrategy(Strategy):
         self._closes: Deque[float] = collections.deque(maxlen=maxlen)
         self._highs: Deque[float] = collections.deque(maxlen=maxlen)
         self._lows: Deque[float] = collections.deque(maxlen=maxlen)
+
+        # 布林带窗口的增量统计：保存 (close - shift)，维护和与平方和。
+        # 以首个 close 作为平移基准，避免大价格下 E[X^2]-E[X]^2 的数值抵消。
+        self._win: Deque[float] = collections.deque(maxlen=self.window)
+        self._shift: float | None = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._since_resync = 0
         
         # State
         self._position = 0.0 # 1=Long, -1=Short, 0=Flat
         self._sl_price = 0.0 # Stopped out price
         self._tp_price = 0.0 # Take profit price (if using fixed/ATR TP)
 
-    def on_tick(self, tick: Tick) -> list[OrderSignal]:
+    def on_bars(self, df: pd.DataFrame) -> pd.DataFrame:
+        """向量化路径：一次 rolling 计算布林带，仅在突破上/下轨的那根 bar 发信号。
+
+        出场交由模拟器的 SL/TP 处理（与逐 tick 路径的状态机不同）。
+        """
+        close = df["close"].astype("float64", copy=False)
+        mid = close.rolling(self.window, min_periods=self.window).mean()
+        std = close.rolling(self.window, min_periods=self.window).std()
+        upper = mid + self.k * std
+        lower = mid - self.k * std
+
+        long_entry = (close > upper) & (close.shift(1) <= upper.shift(1))
+        short_entry = (close < lower) & (close.shift(1) >= lower.shift(1))
+        entry = long_entry | short_entry
+        return pd.DataFrame(
+            {
+                "ts": df["end_ts"][entry].to_numpy(),
+                "side": long_entry[entry].map({True: "buy", False: "sell"}).to_numpy(),
+            }
+        )
+
+    def _push_close(self, close: float) -> None:
+        """把 close 推入布林带窗口，O(1) 更新和/平方和。"""
+        if self._shift is None:
+            self._shift = close
+        x = close - self._shift
+        if len(self._win) == self.window:
+            old = self._win[0]
+            self._sum -= old
+            self._sum_sq -= old * old
+        self._win.append(x)
+        self._sum += x
+        self._sum_sq += x * x
+        # 每滚动一个窗口重算一次，限制浮点累积误差（摊还仍为 O(1)）
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._sum = sum(self._win)
+            self._sum_sq = sum(v * v for v in self._win)
+            self._since_resync = 0
+
+    def on_tick(self, tick: Tick) -> Sequence[OrderSignal]:
         # 从 features 提取 OHLC (由 EventSource 填充)
         # 如果缺失，回退到使用 tick.price
         high = tick.price
@@ -70,17 +127,17 @@ class VolatilityBreakoutStrategy(Strategy):
         self._closes.append(close)
         self._highs.append(high) 
         self._lows.append(low)
+        self._push_close(close)
         
         if len(self._closes) < max(self.window, self.atr_period):
-            return []
+            return NO_SIGNALS
             
-        # 1. 计算指标
-        closes = list(self._closes)
-        avg = sum(closes[-self.window:]) / self.window
-        
-        # StdDev
-        variance = sum((x - avg) ** 2 for x in closes[-self.window:]) / (self.window - 1)
-        std_dev = variance ** 0.5
+        # 1. 计算指标（样本标准差，ddof=1）
+        n = self.window
+        mean_shifted = self._sum / n
+        avg = mean_shifted + self._shift
+        variance = (self._sum_sq - n * mean_shifted * mean_shifted) / (n - 1)
+        std_dev = math.sqrt(max(variance, 0.0))
         
         upper = avg + self.k * std_dev
         lower = avg - self.k * std_dev
@@ -88,6 +145,7 @@ class VolatilityBreakoutStrategy(Strategy):
         # ATR 计算 (简化的 TR 移动平均)
         current_atr = 0.0
         if self.atr_stop_multiplier > 0:
+            closes = list(self._closes)
             highs = list(self._highs)
             lows = list(self._lows)
 
@@ -219,4 +277,4 @@ class VolatilityBreakoutStrategy(Strategy):
                 self._position = -1
                 self._sl_price = sl_price
 
-        return [signal] if signal else []
+        return [signal] if signal else NO_SIGNALS
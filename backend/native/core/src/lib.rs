@@ -1,3 +1,4 @@
+use numpy::{IntoPyArray, PyArray1, PyReadonlyArray1};
 use pyo3::prelude::*;
 
 fn is_nan(val: f64) -> bool {
@@ -55,46 +56,28 @@ fn ema_series(values: &[f64], period: usize) -> Vec<f64> {
 }
 
 /// 计算简单移动平均（SMA）。
-/// - values: 输入序列
+/// - values: 输入序列（float64 ndarray，零拷贝读取）
 /// - window: 窗口长度（必须 > 0）
-/// 返回与输入等长的序列，前 window-1 个位置为 NaN。
+/// 返回与输入等长的 ndarray，窗口内不足 window 个有效值（含前 window-1 个位置、
+/// 窗口内有 NaN）时为 NaN，与 pandas `rolling(window, min_periods=window).mean()` 一致。
+/// 计算期间释放 GIL（约束同 `rsi`）。
 #[pyfunction]
-fn ma(values: Vec<f64>, window: usize) -> PyResult<Vec<f64>> {
+fn ma<'py>(
+    py: Python<'py>,
+    values: PyReadonlyArray1<'py, f64>,
+    window: usize,
+) -> PyResult<Bound<'py, PyArray1<f64>>> {
     if window == 0 {
         return Err(pyo3::exceptions::PyValueError::new_err(
             "window 必须大于 0",
         ));
     }
-    let n = values.len();
-    let mut out = vec![f64::NAN; n];
-    if n == 0 {
-        return Ok(out);
-    }
-
-    let mut sum = 0.0;
-    for i in 0..n {
-        sum += values[i];
-        if i >= window {
-            sum -= values[i - window];
-        }
-        if i + 1 >= window {
-            out[i] = sum / window as f64;
-        }
-    }
-    Ok(out)
+    let values = values.as_slice()?;
+    let out = py.allow_threads(|| rolling_mean(values, window));
+    Ok(out.into_pyarray_bound(py))
 }
 
-/// 计算 RSI（SMA 版本）。
-/// - values: 输入序列
-/// - period: 周期长度（必须 > 0）
-/// 返回与输入等长的序列，前 period 个位置为 NaN。
-#[pyfunction]
-fn rsi(values: Vec<f64>, period: usize) -> PyResult<Vec<f64>> {
-    if period == 0 {
-        return Err(pyo3::exceptions::PyValueError::new_err(
-            "period 必须大于 0",
-        ));
-    }
+fn rsi_series(values: &[f64], period: usize) -> Vec<f64> {
     let n = values.len();
     let mut gains = vec![f64::NAN; n];
     let mut losses = vec![f64::NAN; n];
@@ -128,21 +111,10 @@ fn rsi(values: Vec<f64>, period: usize) -> PyResult<Vec<f64>> {
             out[i] = 100.0 - (100.0 / (1.0 + rs));
         }
     }
-    Ok(out)
+    out
 }
 
-/// 计算 ATR（SMA 版本）。
-/// - high: 最高价序列
-/// - low: 最低价序列
-/// - close: 收盘价序列
-/// - period: 周期长度（必须 > 0）
-#[pyfunction]
-fn atr(high: Vec<f64>, low: Vec<f64>, close: Vec<f64>, period: usize) -> PyResult<Vec<f64>> {
-    if period == 0 {
-        return Err(pyo3::exceptions::PyValueError::new_err(
-            "period 必须大于 0",
-        ));
-    }
+fn atr_series(high: &[f64], low: &[f64], close: &[f64], period: usize) -> Vec<f64> {
     let n = high.len().min(low.len()).min(close.len());
     let mut tr = vec![f64::NAN; n];
     for i in 0..n {
@@ -166,23 +138,60 @@ fn atr(high: Vec<f64>, low: Vec<f64>, close: Vec<f64>, period: usize) -> PyResul
         tr[i] = max_val;
     }
 
-    Ok(rolling_mean(&tr, period))
+    rolling_mean(&tr, period)
 }
 
-/// 计算滚动标准差。
-/// - values: 输入序列
+/// 计算 RSI（SMA 版本）。
+/// - values: 输入序列（float64 ndarray，零拷贝读取）
+/// - period: 周期长度（必须 > 0）
+/// 返回与输入等长的 ndarray，前 period 个位置为 NaN。
+/// 计算期间释放 GIL，可在线程池中并行调用；调用方不应在计算时从其他线程写入输入数组。
+#[pyfunction]
+fn rsi<'py>(
+    py: Python<'py>,
+    values: PyReadonlyArray1<'py, f64>,
+    period: usize,
+) -> PyResult<Bound<'py, PyArray1<f64>>> {
+    if period == 0 {
+        return Err(pyo3::exceptions::PyValueError::new_err(
+            "period 必须大于 0",
+        ));
+    }
+    let values = values.as_slice()?;
+    // 计算期间释放 GIL：闭包只读借用的切片，不触碰任何 Python 对象
+    let out = py.allow_threads(|| rsi_series(values, period));
+    Ok(out.into_pyarray_bound(py))
+}
+
+/// 计算 ATR（SMA 版本）。
+/// - high: 最高价序列（float64 ndarray，零拷贝读取）
+/// - low: 最低价序列
+/// - close: 收盘价序列
 /// - period: 周期长度（必须 > 0）
+/// 计算期间释放 GIL（约束同 `rsi`）。
 #[pyfunction]
-fn stddev(values: Vec<f64>, period: usize) -> PyResult<Vec<f64>> {
+fn atr<'py>(
+    py: Python<'py>,
+    high: PyReadonlyArray1<'py, f64>,
+    low: PyReadonlyArray1<'py, f64>,
+    close: PyReadonlyArray1<'py, f64>,
+    period: usize,
+) -> PyResult<Bound<'py, PyArray1<f64>>> {
     if period == 0 {
         return Err(pyo3::exceptions::PyValueError::new_err(
             "period 必须大于 0",
         ));
     }
+    let (high, low, close) = (high.as_slice()?, low.as_slice()?, close.as_slice()?);
+    let out = py.allow_threads(|| atr_series(high, low, close, period));
+    Ok(out.into_pyarray_bound(py))
+}
+
+fn stddev_series(values: &[f64], period: usize) -> Vec<f64> {
     let n = values.len();
     let mut out = vec![f64::NAN; n];
     if n == 0 {
-        return Ok(out);
+        return out;
     }
     
     // Welford's algorithm or Naive two-pass? 
@@ -220,66 +229,67 @@ fn stddev(values: Vec<f64>, period: usize) -> PyResult<Vec<f64>> {
             }
         }
     }
-    Ok(out)
+    out
 }
 
-/// 计算 EMA（指数移动平均）。
-/// - values: 输入序列
+/// 计算滚动标准差。
+/// - values: 输入序列（float64 ndarray，零拷贝读取）
 /// - period: 周期长度（必须 > 0）
+/// 计算期间释放 GIL（约束同 `rsi`）。
 #[pyfunction]
-fn ema(values: Vec<f64>, period: usize) -> PyResult<Vec<f64>> {
+fn stddev<'py>(
+    py: Python<'py>,
+    values: PyReadonlyArray1<'py, f64>,
+    period: usize,
+) -> PyResult<Bound<'py, PyArray1<f64>>> {
     if period == 0 {
         return Err(pyo3::exceptions::PyValueError::new_err(
             "period 必须大于 0",
         ));
     }
-    Ok(ema_series(&values, period))
+    let values = values.as_slice()?;
+    let out = py.allow_threads(|| stddev_series(values, period));
+    Ok(out.into_pyarray_bound(py))
 }
 
-/// 模拟交易执行 (支持 SL/TP 和 path-dependence)。
-///
-/// Parameters
-/// ----------
-/// timestamps: 时间戳 (i64, ms or s)
-/// opens: 开盘价序列
-/// highs: 最高价序列
-/// lows: 最低价序列
-/// closes: 收盘价序列
-/// signals: 信号序列 (1=Buy, -1=Sell, 0=None)
-/// sl_pct: 止损百分比 (e.g., 0.05 for 5%)
-/// tp_pct: 止盈百分比 (e.g., 0.10 for 10%)
-///
-/// Returns
-/// -------
-/// (equity_curve, trades_list)
-/// equity_curve: Vec<(ts, equity)>
-/// trades_list: Vec<(entry_ts, exit_ts, entry_price, exit_price, pnl, reason)>
+/// 计算 EMA（指数移动平均）。
+/// - values: 输入序列（float64 ndarray，零拷贝读取）
+/// - period: 周期长度（必须 > 0）
+/// 计算期间释放 GIL（约束同 `rsi`）。
 #[pyfunction]
-fn simulate_trades(
-    timestamps: Vec<i64>,
-    opens: Vec<f64>,
-    highs: Vec<f64>,
-    lows: Vec<f64>,
-    closes: Vec<f64>,
-    signals: Vec<i32>,
-    sl_val: f64,    // Fixed Pct (e.g. 0.05) OR Multiplier (e.g. 2.0)
-    tp_val: f64,
-    allow_short: bool,
-    use_atr: bool,
-    atr: Vec<f64>,
-) -> PyResult<(Vec<(i64, f64)>, Vec<(i64, i64, f64, f64, f64, String)>)> {
-    let n = timestamps.len();
-    if opens.len() != n || highs.len() != n || lows.len() != n || closes.len() != n || signals.len() != n {
+fn ema<'py>(
+    py: Python<'py>,
+    values: PyReadonlyArray1<'py, f64>,
+    period: usize,
+) -> PyResult<Bound<'py, PyArray1<f64>>> {
+    if period == 0 {
         return Err(pyo3::exceptions::PyValueError::new_err(
-            "All input arrays must have the same length",
-        ));
-    }
-    if use_atr && atr.len() != n {
-         return Err(pyo3::exceptions::PyValueError::new_err(
-            "ATR array length must match other arrays",
+            "period 必须大于 0",
         ));
     }
+    let values = values.as_slice()?;
+    let out = py.allow_threads(|| ema_series(values, period));
+    Ok(out.into_pyarray_bound(py))
+}
 
+type EquityCurve = Vec<(i64, f64)>;
+type TradeList = Vec<(i64, i64, f64, f64, f64, String)>;
+
+#[allow(clippy::too_many_arguments)]
+fn simulate_series(
+    timestamps: &[i64],
+    opens: &[f64],
+    highs: &[f64],
+    lows: &[f64],
+    closes: &[f64],
+    signals: &[i32],
+    sl_val: f64,
+    tp_val: f64,
+    allow_short: bool,
+    use_atr: bool,
+    atr: &[f64],
+) -> (EquityCurve, TradeList) {
+    let n = timestamps.len();
     let mut equity_curve = Vec::with_capacity(n);
     let mut trades = Vec::new();
     
@@ -404,7 +414,61 @@ fn simulate_trades(
         equity_curve.push((ts, cash + unrealized_pnl));
     }
 
-    Ok((equity_curve, trades))
+    (equity_curve, trades)
+}
+
+/// 模拟交易执行 (支持 SL/TP 和 path-dependence)。
+///
+/// Parameters
+/// ----------
+/// timestamps: 时间戳 (int64 ndarray, ms or s)；各序列均为 ndarray，零拷贝读取
+/// opens: 开盘价序列
+/// highs: 最高价序列
+/// lows: 最低价序列
+/// closes: 收盘价序列
+/// signals: 信号序列 (1=Buy, -1=Sell, 0=None)
+/// sl_pct: 止损百分比 (e.g., 0.05 for 5%)
+/// tp_pct: 止盈百分比 (e.g., 0.10 for 10%)
+///
+/// Returns
+/// -------
+/// (equity_curve, trades_list)
+/// equity_curve: Vec<(ts, equity)>
+/// trades_list: Vec<(entry_ts, exit_ts, entry_price, exit_price, pnl, reason)>
+/// 计算期间释放 GIL（约束同 `rsi`）。
+#[pyfunction]
+#[allow(clippy::too_many_arguments)]
+fn simulate_trades<'py>(
+    py: Python<'py>,
+    timestamps: PyReadonlyArray1<'py, i64>,
+    opens: PyReadonlyArray1<'py, f64>,
+    highs: PyReadonlyArray1<'py, f64>,
+    lows: PyReadonlyArray1<'py, f64>,
+    closes: PyReadonlyArray1<'py, f64>,
+    signals: PyReadonlyArray1<'py, i32>,
+    sl_val: f64,    // Fixed Pct (e.g. 0.05) OR Multiplier (e.g. 2.0)
+    tp_val: f64,
+    allow_short: bool,
+    use_atr: bool,
+    atr: PyReadonlyArray1<'py, f64>,
+) -> PyResult<(EquityCurve, TradeList)> {
+    let timestamps = timestamps.as_slice()?;
+    let (opens, highs, lows, closes) = (opens.as_slice()?, highs.as_slice()?, lows.as_slice()?, closes.as_slice()?);
+    let (signals, atr) = (signals.as_slice()?, atr.as_slice()?);
+    let n = timestamps.len();
+    if opens.len() != n || highs.len() != n || lows.len() != n || closes.len() != n || signals.len() != n {
+        return Err(pyo3::exceptions::PyValueError::new_err(
+            "All input arrays must have the same length",
+        ));
+    }
+    if use_atr && atr.len() != n {
+         return Err(pyo3::exceptions::PyValueError::new_err(
+            "ATR array length must match other arrays",
+        ));
+    }
+    Ok(py.allow_threads(|| {
+        simulate_series(timestamps, opens, highs, lows, closes, signals, sl_val, tp_val, allow_short, use_atr, atr)
+    }))
 }
 
 /// Python 模块入口。